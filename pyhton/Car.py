@@ -1,10 +1,22 @@
 from natsort import natsort_keygen
 import os
-import librosa
+import hashlib
 import json
+import threading
+import contextlib
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 import soundfile as sf
 import numpy as np
-from scipy.signal import bilinear, lfilter
+from scipy.signal import bilinear_zpk, zpk2sos, sosfilt, fftconvolve, oaconvolve, resample_poly, get_window
+from scipy.fft import rfft, irfft, next_fast_len
+from cache import _LRUCache
+from signals import CalibratedComponent, PreparedSignal
+from profiler import Profiler
+
+# stage returned while no profiler is enabled
+_NO_STAGE = contextlib.nullcontext()
+
 
 class Car:
     """
@@ -16,17 +28,112 @@ class Car:
     fs (int): The sampling frequency of the recordings. Default is 16000 Hz.
     json_info (bool): A boolean indicating whether the car information is stored in a json file inside path. Defaults to True.
     info_dict (dict): A dictionary containing the car information. Defaults to None. Is *json_info* is True, *info_dict* is ignored.
+    cache_size (int): The memory budget in bytes of the cache of decoded (and resampled) recordings. Defaults to 0, which disables caching.
+    use_manifest (bool): A boolean indicating whether to read the car from the manifest of the dataset folder, if it is up to date. Defaults to True.
+    component_cache_size (int): The memory budget in bytes of the cache of calibrated speech and radio components. Defaults to 0, which disables caching.
+    resampler (str): The backend that resamples recordings that are not stored at Car.fs: 'librosa', 'soxr', 'polyphase' (scipy.signal.resample_poly)
+        or 'none', which raises an error instead of resampling. Materialized copies and the noise bank are read whatever the backend. Defaults to 'librosa'.
+    dtype (str): The sample format of the loaded recordings and of the returned components, 'float64' or 'float32', which halves the memory and
+        memory traffic of loading, resampling, convolution, gains and match_duration. Levels are computed in float64 in both cases, and the
+        components agree to within about -100 dB. Methods that return signals can override it per call. Defaults to 'float64'.
+    prefetch_workers (int): The number of threads that decode (and resample) recordings ahead of their use (see prefetch), so that reads overlap
+        the convolutions of get_components and get_components_batch. Defaults to 0, which disables prefetching.
+    compact_irs (bool): A boolean indicating whether speech and radio audio are convolved with the compacted IRs of the IR store (see build_ir_store),
+        without the samples before the common onset of the channels and after the end of their decay, when the store holds an up-to-date entry.
+        Levels are averaged over the duration of the full convolution, so that calibrated components agree with those of the full IRs to within the
+        energy of the dropped samples; they are shorter and start earlier by the onset of the IR. Defaults to False.
     """
-    def __init__(self, path, fs=16000, json_info=True, info_dict =None):
+    # length ratio above which overlap-add is preferred over a single full-length FFT convolution
+    __OA_RATIO = 8
+    # conversion of the radio level at the reference microphone from dB FS(A) to dB(A)
+    __DB_FSA_TO_DB_A = {
+        0: 124.8755,
+        1: 124.8381,
+        2: 124.7017,
+        3: 124.9197,
+        4: 124.3212,
+        5: 126.4183,
+        6: 125.8413,
+        7: 124.9133,
+        }
+    # folders of a microphone setup that hold recordings
+    __RECORDING_FOLDERS = ('IRs', 'noise', 'radio_IRs', 'ventilation')
+    # folders of the IRs compacted by build_ir_store
+    __IR_FOLDERS = ('IRs', 'radio_IRs')
+    # duration in seconds of the crossfade used to loop short components
+    __CROSSFADE_SECONDS = 1
+    # crossfade masks per sampling frequency
+    __crossfade_masks_cache = {}
+    # A-weighting filters in second-order sections, per sampling frequency
+    __A_weighting_cache = {}
+    # duration in seconds of the tail of the A-weighting filter kept by the spectral calibration
+    __A_WEIGHTING_TAIL = 0.5
+    # methods that compute the A-weighted level of convolved speech and radio audio
+    __CALIBRATIONS = ('time', 'spectral')
+    # resampling backends, imported on first use
+    __RESAMPLERS = ('librosa', 'soxr', 'polyphase', 'none')
+    # sample formats of the recordings and components; levels are computed in float64 for both
+    __DTYPES = ('float64', 'float32')
+    # context in seconds read around a window of a recording that has to be resampled
+    __RESAMPLING_MARGIN = 0.05
+    # hidden folder inside the car folder that holds preprocessed copies of the recordings
+    __CACHE_FOLDER = '.cache'
+    # recording folder of each kind of condition of query_conditions
+    __CONDITION_KINDS = {'speech': 'IRs', 'noise': 'noise', 'radio': 'radio_IRs', 'ventilation': 'ventilation'}
+    # file in the dataset folder that indexes the conditions and recordings of every car
+    __MANIFEST_FILE = 'manifest.json'
+    # folder of the references and correction gains shipped with this module
+    __SOURCE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'source')
+    # parsed manifests, per manifest file
+    __manifests = {}
+    # angles in radians of microphones 0 to 7 of the circular array; 0 points towards the rear middle passenger
+    __ARRAY_MIC_ANGLES = np.array([np.pi, 3*np.pi/4, np.pi/2, np.pi/4, 0, -np.pi/4, -np.pi/2, -3*np.pi/4])
+    # speed of sound in m/s of the steering vectors
+    __SPEED_OF_SOUND = 343
+    # duration in seconds of the blocks of the A-weighted level envelopes of the noise statistics ('fast' time weighting of sound level meters)
+    __LEVEL_BLOCK_SECONDS = 0.125
+    # number of level blocks of a recording processed at once when computing its noise statistics
+    __STATISTICS_CHUNK_BLOCKS = 64
+    # profiler of all cars of the process, None while profiling is disabled
+    __profiler = None
+    # steering manifolds, per sampling frequency, FFT size, radius and angles
+    __steering_cache = _LRUCache(64 * 2**20)
+
+    def __init__(self, path, fs=16000, json_info=True, info_dict =None, cache_size=0, use_manifest=True, component_cache_size=0, resampler='librosa', dtype='float64',
+                 prefetch_workers=0, compact_irs=False):
+        if resampler not in Car.__RESAMPLERS:
+            raise ValueError(f"resampler must be one of {Car.__RESAMPLERS}.")
+        if dtype not in Car.__DTYPES:
+            raise ValueError(f"dtype must be one of {Car.__DTYPES}.")
+        if not isinstance(prefetch_workers, int) or prefetch_workers < 0:
+            raise ValueError(f"prefetch_workers must be a non-negative integer.")
         self.__path = path
+        self.__resampler = resampler
+        self.__dtype = np.dtype(dtype)
+        self.__compact_irs = bool(compact_irs)
         self.__json_info = json_info
         self.__fs = fs
-        # if json_info, ignore info_dict
-        if self.__json_info:
-            info_file = os.path.join(self.__path, 'info.json')
-            with open(info_file, 'r') as f:
-                info_dict = json.load(f)          
-        # else:
+        self.__cache = _LRUCache(cache_size)
+        self.__component_cache = _LRUCache(component_cache_size)
+        self.__stores = {}
+        self.__weighted_ir_autocorrelations = {}
+        self.__statistics = {}
+        # prefetch threads, started on first use, and the loads of recordings that no call has taken yet
+        self.__prefetch_workers = prefetch_workers
+        self.__prefetch_executor = None
+        self.__prefetch_pid = None
+        self.__prefetched = {}
+        self.__prefetch_lock = threading.Lock()
+        # the manifest of the dataset folder replaces the scan of the car folder when it is up to date
+        entry = Car.__manifest_entry(path) if json_info and use_manifest else None
+        if entry is None:
+            # if json_info, ignore info_dict
+            if self.__json_info:
+                info_file = os.path.join(self.__path, 'info.json')
+                with open(info_file, 'r') as f:
+                    info_dict = json.load(f)
+            entry = Car.__scan_car(path, info_dict)
+        info_dict = entry['info']
         self.__in_dict = info_dict
         self.__make = info_dict['make']
         self.__model = info_dict['model']
@@ -36,90 +143,48 @@ class Car:
         else:
             self.__version = None
         
-        self.__mic_setups = self.__find_folders()
+        self.__mic_setups = list(entry['recordings'])
+        self.__recordings = entry['recordings']
         self.__irs = {}
         self.__noises = {}
         self.__radio_irs = {}
         self.__references = {}
         self.__ventilation = {}
-        natsort_key = natsort_keygen(key=lambda y: y.lower()) 
 
-        for mic_setup in self.__mic_setups:
-            irs_list = os.listdir(os.path.join(self.__path, mic_setup, 'IRs'))
-            noise_list = os.listdir(os.path.join(self.__path, mic_setup, 'noise'))
-            try:
-                radio_irs_list = os.listdir(os.path.join(self.__path, mic_setup, 'radio_IRs'))
-            except :
-                pass
-            ventilation_list = os.listdir(os.path.join(self.__path, mic_setup, 'ventilation'))
-
-            if mic_setup == 'hybrid': #  and len(self.__mic_setups == 1
-                # IRs
-                self.__irs[mic_setup] = sorted([wav[:-4] for wav in irs_list], key=natsort_key)
-                self.__irs['array'] = sorted([wav[:-4] for wav in irs_list], key=natsort_key)
-                self.__irs['distributed'] = sorted([wav[:-4] for wav in irs_list], key=natsort_key)
-
-                # Noise
-                self.__noises[mic_setup] = sorted([wav[:-4] for wav in noise_list], key=natsort_key)
-                self.__noises['array'] = sorted([wav[:-4] for wav in noise_list], key=natsort_key)
-                self.__noises['distributed'] = sorted([wav[:-4] for wav in noise_list], key=natsort_key)
-
-                # Radio IRs
-                try:
-                    self.__radio_irs[mic_setup] = sorted([wav[:-4] for wav in radio_irs_list], key=natsort_key)
-                    self.__radio_irs['array'] = sorted([wav[:-4] for wav in radio_irs_list], key=natsort_key)
-                    self.__radio_irs['distributed'] = sorted([wav[:-4] for wav in radio_irs_list], key=natsort_key)
-
-                except :
-                    self.__radio_irs[mic_setup] = None
-                    self.__radio_irs['array'] = None
-                    self.__radio_irs['distributed'] = None
-
-                # Ventilation
-                wav_list = os.listdir(os.path.join(self.__path, mic_setup, 'ventilation'))
-                self.__ventilation[mic_setup] = sorted([wav[:-4] for wav in ventilation_list], key=natsort_key)
-                self.__ventilation['array'] = sorted([wav[:-4] for wav in ventilation_list], key=natsort_key)
-                self.__ventilation['distributed'] = sorted([wav[:-4] for wav in ventilation_list], key=natsort_key)
-
-                # References
-                ref_file = os.path.join('pyhton', 'source', 'references_16kHz', self.__make + '_' + self.__model, mic_setup, 'reference.json')
-                with open(ref_file, 'r') as f:
-                    self.__references[mic_setup] = json.load(f)
-                self.__references['array'] = self.__references[mic_setup].copy()
-                self.__references['distributed'] = self.__references[mic_setup].copy()
+        for mic_setup, folders in entry['recordings'].items():
+            # the conditions of a 'hybrid' car are shared by the 'array' and 'distributed' setups
+            targets = [mic_setup, 'array', 'distributed'] if mic_setup == 'hybrid' else [mic_setup]
+            for target in targets:
+                self.__irs[target] = list(folders['IRs'])
+                self.__noises[target] = list(folders['noise'])
+                self.__radio_irs[target] = list(folders['radio_IRs']) if folders['radio_IRs'] is not None else None
+                self.__ventilation[target] = list(folders['ventilation'])
+                self.__references[target] = entry['references'][mic_setup].copy()
 
-            else:
-                # IRs
-                self.__irs[mic_setup] = sorted([wav[:-4] for wav in irs_list], key=natsort_key)
-
-                # Noise
-                self.__noises[mic_setup] = sorted([wav[:-4] for wav in noise_list], key=natsort_key)
-                
-                # Radio IRs
-                try:
-                    self.__radio_irs[mic_setup] = sorted([wav[:-4] for wav in radio_irs_list], key=natsort_key)
-                except :
-                    self.__radio_irs[mic_setup] = None
-
-                # Ventilation
-                self.__ventilation[mic_setup] = sorted([wav[:-4] for wav in ventilation_list], key=natsort_key)
-
-                # References
-                ref_file = os.path.join('pyhton', 'source', 'references_16kHz', self.__make + '_' + self.__model, mic_setup, 'reference.json')
-                with open(ref_file, 'r') as f:
-                    self.__references[mic_setup] = json.load(f)
-
-            # Correction gains
-            gains_file = os.path.join('pyhton', 'source', 'correction_gains', 'gains.json')
-            with open(gains_file, 'r') as f:
-                self.__correction_gains = json.load(f)
+        # Correction gains
+        self.__correction_gains = entry['gains']
 
         if len(self.__mic_setups) == 1 and self.__mic_setups[0] == 'hybrid':
             self.__mic_setups = ['array', 'distributed', 'hybrid']
+        self.__index_conditions()
         
 
     def __repr__(self):
         return f'Car(path={self.__path!r}, json_info=False, info_dict={self.__in_dict!r})'
+
+    def __getstate__(self):
+        # threads and pending loads are not copied; the prefetch threads of a copy start on its first prefetch
+        state = self.__dict__.copy()
+        for name in ('_Car__prefetch_executor', '_Car__prefetch_pid', '_Car__prefetched', '_Car__prefetch_lock'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__prefetch_executor = None
+        self.__prefetch_pid = None
+        self.__prefetched = {}
+        self.__prefetch_lock = threading.Lock()
         
         
     def __str__(self):
@@ -177,6 +242,56 @@ class Car:
     def fs(self, value):
         """Sets the sampling frequency."""
         self.__fs = value
+
+    @property
+    def resampler(self):
+        """Returns the backend that resamples recordings that are not stored at Car.fs."""
+        return self.__resampler
+
+    @resampler.setter
+    def resampler(self, value):
+        """Sets the backend that resamples recordings that are not stored at Car.fs ('librosa', 'soxr', 'polyphase' or 'none')."""
+        if value not in Car.__RESAMPLERS:
+            raise ValueError(f"resampler must be one of {Car.__RESAMPLERS}.")
+        self.__resampler = value
+
+    @property
+    def dtype(self):
+        """Returns the sample format of the loaded recordings and of the returned components."""
+        return self.__dtype.name
+
+    @dtype.setter
+    def dtype(self, value):
+        """Sets the sample format of the loaded recordings and of the returned components ('float64' or 'float32')."""
+        if value not in Car.__DTYPES:
+            raise ValueError(f"dtype must be one of {Car.__DTYPES}.")
+        self.__dtype = np.dtype(value)
+
+    @property
+    def compact_irs(self):
+        """Returns a boolean indicating whether speech and radio audio are convolved with the compacted IRs of the IR store."""
+        return self.__compact_irs
+
+    @compact_irs.setter
+    def compact_irs(self, value):
+        """Sets whether speech and radio audio are convolved with the compacted IRs of the IR store."""
+        self.__compact_irs = bool(value)
+
+    @property
+    def prefetch_workers(self):
+        """Returns the number of threads that load recordings ahead of their use."""
+        return self.__prefetch_workers
+
+    @prefetch_workers.setter
+    def prefetch_workers(self, value):
+        """Sets the number of threads that load recordings ahead of their use, waiting for the running loads. 0 disables prefetching."""
+        if not isinstance(value, int) or value < 0:
+            raise ValueError(f"prefetch_workers must be a non-negative integer.")
+        with self.__prefetch_lock:
+            executor, self.__prefetch_executor = self.__prefetch_executor, None
+        if executor is not None and self.__prefetch_pid == os.getpid():
+            executor.shutdown(wait=True)
+        self.__prefetch_workers = value
     
     @property
     def mic_setups(self):
@@ -251,11 +366,7 @@ class Car:
     @property
     def speaker_locations(self):
         """Returns a dictionary of available speaker locations per microphone configuration."""
-        natsort_key = natsort_keygen(key=lambda y: y.lower())
-        locations = {}
-        for mic_setup in self.mic_setups:
-            locations[mic_setup] = sorted(list(set([s.split('w')[0][:-1] for s in self.irs[mic_setup]])), key=natsort_key)
-        return locations
+        return {mic_setup: list(locations) for mic_setup, locations in self.__speaker_locations.items()}
     
     @speaker_locations.setter
     def speaker_locations(self, value):
@@ -271,56 +382,885 @@ class Car:
     def correction_gains(self, value):
         """Prevents setting the correction gains."""
         raise AttributeError('Cannot set correction_gains.')
+
+    @property
+    def cache_size(self):
+        """Returns the memory budget in bytes of the recordings cache."""
+        return self.__cache.max_bytes
+
+    @cache_size.setter
+    def cache_size(self, value):
+        """Sets the memory budget in bytes of the recordings cache. Least recently used entries exceeding the new budget are evicted."""
+        self.__cache.max_bytes = value
+
+    @property
+    def cache_info(self):
+        """Returns a dictionary with the hits, misses, number of entries and memory usage of the recordings cache."""
+        return self.__cache.info()
+
+    @cache_info.setter
+    def cache_info(self, value):
+        """Prevents setting the cache information."""
+        raise AttributeError('Cannot set cache_info.')
+
+    @property
+    def component_cache_size(self):
+        """Returns the memory budget in bytes of the calibrated components cache."""
+        return self.__component_cache.max_bytes
+
+    @component_cache_size.setter
+    def component_cache_size(self, value):
+        """Sets the memory budget in bytes of the calibrated components cache. Least recently used entries exceeding the new budget are evicted."""
+        self.__component_cache.max_bytes = value
+
+    @property
+    def component_cache_info(self):
+        """Returns a dictionary with the hits, misses, number of entries and memory usage of the calibrated components cache."""
+        return self.__component_cache.info()
+
+    @component_cache_info.setter
+    def component_cache_info(self, value):
+        """Prevents setting the component cache information."""
+        raise AttributeError('Cannot set component_cache_info.')
         
     
     # private methods
-    def __find_folders(self, condition=None):
+    @classmethod
+    def __scan_car(cls, path, info_dict, details=False):
+        """
+        Lists the conditions of every microphone setup of a car folder and reads its references and the correction gains.
+
+        Args:
+            path (str): The path to the car folder.
+            info_dict (dict): The information of the car (make, model, year and optionally version).
+            details (bool, optional): Whether to read the number of frames, sampling frequency, number of channels, modification time
+                and size of every recording. Defaults to False, in which case the conditions map to None.
+
+        Returns:
+            dict: The manifest entry of the car, with the keys 'info', 'recordings' (conditions per microphone setup and folder, in
+                natural order; None for a missing 'radio_IRs' folder), 'references', 'gains', 'entries' (the files and folders of the
+                car folder), 'mtimes' (modification times of the folders of the microphone setups and of info.json, relative to `path`) and 'source_mtimes' (modification times of the references and gains files, relative to
+                the source folder of the module).
+        """
+        natsort_key = natsort_keygen(key=lambda y: y.lower())
+        # the hidden store folder is ignored, since writing to it must not invalidate the entry
+        entries = sorted(f for f in os.listdir(path) if not f.startswith('.'))
+        mtimes = {}
+        if os.path.exists(os.path.join(path, 'info.json')):
+            mtimes['info.json'] = os.stat(os.path.join(path, 'info.json')).st_mtime_ns
+        gains_file = os.path.join('correction_gains', 'gains.json')
+        source_mtimes = {gains_file: os.stat(os.path.join(Car.__SOURCE_FOLDER, gains_file)).st_mtime_ns}
+        recordings = {}
+        references = {}
+        for mic_setup in [f for f in entries if os.path.isdir(os.path.join(path, f))]:
+            mtimes[mic_setup] = os.stat(os.path.join(path, mic_setup)).st_mtime_ns
+            recordings[mic_setup] = {}
+            for folder in Car.__RECORDING_FOLDERS:
+                folder_path = os.path.join(path, mic_setup, folder)
+                if not os.path.isdir(folder_path):
+                    if folder != 'radio_IRs':
+                        raise FileNotFoundError(f"Folder {folder_path} does not exist.")
+                    recordings[mic_setup][folder] = None
+                    continue
+                mtimes[os.path.join(mic_setup, folder)] = os.stat(folder_path).st_mtime_ns
+                conditions = sorted([wav[:-4] for wav in os.listdir(folder_path)], key=natsort_key)
+                recordings[mic_setup][folder] = {condition: cls.__recording_details(os.path.join(folder_path, condition + '.wav')) if details else None
+                                                 for condition in conditions}
+            ref_file = os.path.join('references_16kHz', info_dict['make'] + '_' + info_dict['model'], mic_setup, 'reference.json')
+            with open(os.path.join(Car.__SOURCE_FOLDER, ref_file), 'r') as f:
+                references[mic_setup] = json.load(f)
+            source_mtimes[ref_file] = os.stat(os.path.join(Car.__SOURCE_FOLDER, ref_file)).st_mtime_ns
+        with open(os.path.join(Car.__SOURCE_FOLDER, gains_file), 'r') as f:
+            gains = json.load(f)
+        return {'info': info_dict, 'recordings': recordings, 'references': references, 'gains': gains,
+                'entries': entries, 'mtimes': mtimes, 'source_mtimes': source_mtimes}
+
+    @staticmethod
+    def __recording_details(path):
+        """Returns the number of frames, sampling frequency, number of channels, modification time and size of a recording."""
+        info = sf.info(path)
+        return {'frames': info.frames, 'samplerate': info.samplerate, 'channels': info.channels, **Car.__source_signature(path)}
+
+    @classmethod
+    def __manifest_entry(cls, path):
         """
-        This function returns a list of folders in self.__path that match a given condition.
+        Returns the entry of the car folder `path` in the manifest of its dataset folder, or None if there is no manifest, the car is not
+        in it or the entry is out of date. An entry is out of date when a file or folder has been added to or removed from the car folder,
+        or when a folder of a microphone setup (and therefore its list of files), its info.json or the references and gains it was built with have been modified since the manifest was built.
+        """
+        path = os.path.abspath(path)
+        manifest_file = os.path.join(os.path.dirname(path), Car.__MANIFEST_FILE)
+        try:
+            mtime = os.stat(manifest_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if manifest_file not in cls.__manifests or cls.__manifests[manifest_file][0] != mtime:
+            with open(manifest_file, 'r') as f:
+                cls.__manifests[manifest_file] = (mtime, json.load(f))
+        entry = cls.__manifests[manifest_file][1]['cars'].get(os.path.basename(path))
+        if entry is None:
+            return None
+        try:
+            stale = (sorted(f for f in os.listdir(path) if not f.startswith('.')) != entry['entries']
+                     or any(os.stat(os.path.join(path, relative_path)).st_mtime_ns != mtime for relative_path, mtime in entry['mtimes'].items())
+                     or any(os.stat(os.path.join(Car.__SOURCE_FOLDER, relative_path)).st_mtime_ns != mtime for relative_path, mtime in entry['source_mtimes'].items()))
+        except FileNotFoundError:
+            stale = True
+        if stale:
+            warnings.warn(f"The manifest entry of {path} is out of date; its folders are scanned instead. Rebuild it with prepare.py manifest.")
+            return None
+        return entry
+
+    def __index_conditions(self):
+        """
+        Builds the condition index of the car: the sets of conditions and speaker locations per microphone setup, used to validate
+        conditions in constant time, the natsorted speaker locations and the parsed conditions searched by query_conditions.
+        """
+        natsort_key = natsort_keygen(key=lambda y: y.lower())
+        self.__conditions = {}
+        self.__speaker_locations = {}
+        self.__records = {kind: [] for kind in Car.__CONDITION_KINDS}
+        for mic_setup in self.mic_setups:
+            lists = {'IRs': self.irs[mic_setup], 'noise': self.noise_recordings[mic_setup],
+                     'radio_IRs': self.radio_irs[mic_setup], 'ventilation': self.ventilation_recordings[mic_setup]}
+            self.__conditions[mic_setup] = {folder: frozenset(conditions) if conditions is not None else None for folder, conditions in lists.items()}
+            locations = {condition.rpartition('_w')[0] for condition in lists['IRs']}
+            self.__conditions[mic_setup]['locations'] = frozenset(locations)
+            self.__speaker_locations[mic_setup] = sorted(locations, key=natsort_key)
+            for kind, folder in Car.__CONDITION_KINDS.items():
+                for condition in lists[folder] or []:
+                    record = Car.__parse_condition(kind, condition)
+                    if record is not None:
+                        self.__records[kind].append({'mic_setup': mic_setup, **record})
 
-        Parameters:
-        condition (str, optional): The condition that folder names must match. If no condition is provided, all folders in the path are returned.
+    @staticmethod
+    def __parse_condition(kind, condition):
+        """
+        Parses the name of a recording into the arguments of its getter, e.g. 's120_w1_ver1' of kind 'noise' into
+        {'speed': 120, 'window': 1, 'version': 'ver1'}. Returns None if the name does not follow the naming of the dataset.
+        """
+        try:
+            if kind == 'speech':
+                location, _, window = condition.rpartition('_w')
+                return {'location': location, 'window': int(window)}
+            if kind == 'radio':
+                return {'window': int(condition[1:])}
+            parts = condition.split('_')
+            version = '_'.join(parts[2:]) or None
+            if kind == 'noise':
+                return {'speed': int(parts[0][1:]), 'window': int(parts[1][1:]), 'version': version}
+            return {'level': int(parts[0][1:]), 'window': int(parts[1][1:]), 'version': version}
+        except (ValueError, IndexError):
+            return None
+
+    def __recording_path(self, mic_setup, folder, condition):
+        """
+        Returns the path of a recording and the channels of the microphone setup in it.
+
+        Recordings of a 'hybrid' car are stored in the 'hybrid' folder; the 'array' and 'distributed' setups use a subset of its channels.
+        """
+        path = os.path.join(self.__path, mic_setup, folder, condition + '.wav')
+        mic_range = range(8)
+        if not os.path.exists(path):  # hybrid
+            path = os.path.join(self.__path, 'hybrid', folder, condition + '.wav')
+            if mic_setup == 'array':
+                mic_range = range(4)
+            elif mic_setup == 'distributed':
+                mic_range = [2, 4, 5, 6, 7]
+        return path, mic_range
+
+    def __load_recording(self, mic_setup, folder, condition, offset=0.0, duration=None, use_bank=True, dtype=None, compact=True):
+        """
+        Reads a recording of the given folder ('IRs', 'noise', 'radio_IRs' or 'ventilation') and returns the channels of the microphone setup at Car.fs.
+
+        Recordings of a 'hybrid' car are read from the 'hybrid' folder, keeping the channels of the requested setup.
+        Decoded and resampled recordings are kept in the recordings cache when its budget allows it; in this case
+        the returned array is shared with the cache and is read-only. If only a window of the recording is requested,
+        it is sliced from the cache if the whole recording is cached, otherwise only the frames of the window are
+        decoded (and resampled) from the file. A recording that is being loaded by the prefetch threads is taken from them.
+
+        Args:
+            mic_setup (str): The microphone setup.
+            folder (str): The folder of the recording inside the microphone setup folder.
+            condition (str): The condition (file name without extension) of the recording.
+            offset (float, optional): The start of the window in seconds. Defaults to 0.
+            duration (float, optional): The duration of the window in seconds. Defaults to None, which reads until the end of the recording.
+            use_bank (bool, optional): A boolean indicating whether noise and ventilation recordings are read from the noise bank, if it is available. Defaults to True.
+            dtype (str, optional): The sample format of the decoded recording. Defaults to None, in which case Car.dtype is used. Recordings
+                                   read from the noise bank keep the format of the bank.
+            compact (bool, optional): A boolean indicating whether IRs and radio IRs are read from the IR store when Car.compact_irs is True. Defaults to True.
 
         Returns:
-        list: A list of folder names that match the condition. If no folders match the condition, a message is printed and None is returned.
+            tuple: A tuple containing the recording as a NumPy array (N_samples x M_channels) and its sampling frequency.
+
+        Raises:
+            ValueError: If the offset is negative or beyond the end of the recording, or if the duration is not positive.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
-        items = [f for f in os.listdir(self.__path) if os.path.isdir(os.path.join(self.__path, f))]
-        if not condition:
-            return items
-        cond_items = [item for item in items if os.path.isdir(os.path.join(self.__path, item)) and condition in item]
-        if cond_items:
-            return cond_items
+        dtype = self.__dtype_of(dtype)
+        if offset < 0:
+            raise ValueError(f"offset must be non-negative.")
+        if duration is not None and duration <= 0:
+            raise ValueError(f"duration must be positive.")
+        path, mic_range = self.__recording_path(mic_setup, folder, condition)
+
+        windowed = offset > 0 or duration is not None
+        start = int(round(offset * self.fs))
+        stop = None if duration is None else start + int(round(duration * self.fs))
+        if use_bank and folder in ('noise', 'ventilation'):
+            banked = self.__banked_recording(mic_setup, folder, condition, path)
+            if banked is not None:
+                Car.__count(bank_reads=1)
+                x, scale = banked
+                if windowed:
+                    if start >= len(x):
+                        raise ValueError(f"offset {offset} s is beyond the end of the recording.")
+                    x = x[start:stop]
+                if scale is not None:
+                    x = x * np.float32(scale)
+                return x, self.fs
+        if compact and self.__compact_irs and folder in Car.__IR_FOLDERS:
+            compacted = self.__compacted_ir(mic_setup, folder, condition, path)
+            if compacted is not None:
+                stored_path, entry = compacted
+                key = (stored_path, entry['onset'], entry['stop'], dtype.name)
+                x = self.__cache.get(key)
+                if x is None:
+                    x = self.__cache.put(key, np.load(stored_path).astype(dtype, copy=False))
+                return (x[start:stop] if windowed else x), self.fs
+
+        key = (path, self.fs, self.__resampler, tuple(mic_range), dtype.name)
+        with self.__prefetch_lock:
+            # loads pending in the parent of a forked process never complete in the child
+            future = self.__prefetched.pop(key, None) if self.__prefetch_pid == os.getpid() else None
+        if future is not None:
+            with Car.__stage('prefetch_wait'):
+                x = future.result()
+            Car.__count(prefetch_hits=1)
         else:
-            print(f"No folders found with {condition} in their names.")
+            x = self.__cache.get(key)
+            if x is not None:
+                Car.__count(recording_cache_hits=1)
+        if x is not None:
+            if windowed and start >= len(x):
+                raise ValueError(f"offset {offset} s is beyond the end of the recording.")
+            return (x[start:stop] if windowed else x), self.fs
+
+        Car.__count(recording_cache_misses=1)
+        if not windowed:
+            return self.__decode_recording(key, path, mic_range, dtype), self.fs
+
+        # prefer an up-to-date copy materialized at Car.fs
+        stored_path = self.__stored_recording(path)
+        # seek to the window and decode only its frames
+        with sf.SoundFile(stored_path or path) as f:
+            fs_x = f.samplerate
+            if start >= int(np.ceil(f.frames * self.fs / fs_x)):
+                raise ValueError(f"offset {offset} s is beyond the end of the recording.")
+            if fs_x == self.fs:
+                f.seek(start)
+                with Car.__stage('decode'):
+                    x = f.read(-1 if stop is None else stop - start, dtype=dtype.name, always_2d=True)
+            else:
+                # start decoding at a sample shared by both sampling frequencies, at or before the window, so that the
+                # resampled window is a slice of the resampled recording, and read some context around the window so
+                # that the resampling filter does not see its edges, keeping the margin a whole number of such samples
+                unit = fs_x // np.gcd(fs_x, self.fs)
+                aligned = start * fs_x // self.fs // unit * unit
+                margin = min(int(np.ceil(Car.__RESAMPLING_MARGIN * fs_x / unit)) * unit, aligned)
+                frames = -1
+                if stop is not None:
+                    frames = -(-stop * fs_x // self.fs) - aligned + margin + int(np.ceil(Car.__RESAMPLING_MARGIN * fs_x))
+                f.seek(aligned - margin)
+                with Car.__stage('decode'):
+                    x = f.read(frames, dtype=dtype.name, always_2d=True)
+        Car.__count(decoded_bytes=x.nbytes, decoded_frames=len(x))
+        # resample only the window
+        if fs_x != self.fs:
+            with Car.__stage('resample'):
+                x = Car.resample(x, fs_x, self.fs, self.__resampler).astype(dtype, copy=False)
+            Car.__count(resampled_frames=len(x))
+            # the first decoded sample is at a whole number of samples at Car.fs
+            x = x[start - (aligned - margin) * self.fs // fs_x:]
+            if stop is not None:
+                x = x[:stop - start]
+        return x[:, mic_range], self.fs
+
+    def __decode_recording(self, key, path, mic_range, dtype):
+        """Decodes (and resamples) a whole recording, keeps the channels `mic_range` and stores it in the recordings cache under `key`."""
+        # prefer an up-to-date copy materialized at Car.fs
+        stored_path = self.__stored_recording(path)
+        with Car.__stage('decode'):
+            x, fs_x = sf.read(stored_path or path, dtype=dtype.name)
+        Car.__count(decoded_bytes=x.nbytes, decoded_frames=len(x))
+        # resample
+        if fs_x != self.fs:
+            with Car.__stage('resample'):
+                x = Car.resample(x, fs_x, self.fs, self.__resampler).astype(dtype, copy=False)
+            Car.__count(resampled_frames=len(x))
+        x = x[:, mic_range]
+        return self.__cache.put(key, x)
+
+    def __prefetch_recording(self, mic_setup, folder, condition, dtype):
+        """
+        Submits the load of a whole recording to the prefetch threads, unless it is read from the noise bank, cached or already loading.
+        Returns the key of the load if it was submitted and None otherwise.
+        """
+        path, mic_range = self.__recording_path(mic_setup, folder, condition)
+        if folder in ('noise', 'ventilation') and self.__banked_recording(mic_setup, folder, condition, path) is not None:
             return None
-        
+        if self.__compact_irs and folder in Car.__IR_FOLDERS and self.__compacted_ir(mic_setup, folder, condition, path) is not None:
+            return None
+        key = (path, self.fs, self.__resampler, tuple(mic_range), dtype.name)
+        with self.__prefetch_lock:
+            if self.__prefetch_executor is None or self.__prefetch_pid != os.getpid():
+                # threads do not survive a fork, so a forked process starts its own
+                self.__prefetch_executor = ThreadPoolExecutor(self.__prefetch_workers, thread_name_prefix='Car-prefetch')
+                self.__prefetch_pid = os.getpid()
+                self.__prefetched = {}
+            if key in self.__prefetched or key in self.__cache:
+                return None
+            self.__prefetched[key] = self.__prefetch_executor.submit(self.__decode_recording, key, path, mic_range, dtype)
+        Car.__count(prefetch_submitted=1)
+        return key
+
+    def __drop_prefetched(self, keys):
+        """Drops the prefetched recordings `keys` that no call has taken, cancelling their loads if they have not started."""
+        with self.__prefetch_lock:
+            if self.__prefetch_pid != os.getpid():
+                return
+            for key in keys:
+                future = self.__prefetched.pop(key, None)
+                if future is not None:
+                    future.cancel()
+
+    @contextlib.contextmanager
+    def __prefetching(self, specs):
+        """
+        Returns a context manager that prefetches the recordings of `specs` for the call that it wraps, and drops those that the call did
+        not take, e.g. the IR of a component that was found in the component cache.
+        """
+        keys = self.__prefetch_specs(specs) if self.__prefetch_workers else []
+        try:
+            yield
+        finally:
+            if keys:
+                self.__drop_prefetched(keys)
+
+    def __dtype_of(self, dtype):
+        """Returns the NumPy dtype of a per call `dtype` argument, Car.dtype if it is None."""
+        if dtype is None:
+            return self.__dtype
+        if dtype not in Car.__DTYPES:
+            raise ValueError(f"dtype must be one of {Car.__DTYPES}.")
+        return np.dtype(dtype)
+
+    def __noise_condition(self, mic_setup, condition):
+        """Returns the noise recording of a condition, falling back to its first version ('_ver1') if the condition has multiple versions."""
+        if condition not in self.__conditions[mic_setup]['noise']:
+            new_condition = condition + '_ver1'
+            if new_condition not in self.__conditions[mic_setup]['noise']:
+                raise ValueError(f"Noise condition {condition} is not available in Car.noise_recordings[mic_setup].")
+            condition = new_condition
+        return condition
+
+    def __recording_length(self, mic_setup, folder, condition):
+        """Returns the number of samples of a recording at Car.fs without decoding it."""
+        path, _ = self.__recording_path(mic_setup, folder, condition)
+        if folder in ('noise', 'ventilation'):
+            banked = self.__banked_recording(mic_setup, folder, condition, path)
+            if banked is not None:
+                return len(banked[0])
+        stored_path = self.__stored_recording(path)
+        if stored_path is None:
+            # the manifest holds the length of the source recordings
+            recording_setup = os.path.basename(os.path.dirname(os.path.dirname(path)))
+            details = (self.__recordings.get(recording_setup, {}).get(folder) or {}).get(condition)
+            if details and {'mtime': details['mtime'], 'size': details['size']} == Car.__source_signature(path):
+                return int(np.ceil(details['frames'] * self.fs / details['samplerate']))
+        info = sf.info(stored_path or path)
+        return int(np.ceil(info.frames * self.fs / info.samplerate))
+
+    def __streamed_level(self, x, h, block_size, mean_length=None):
+        """
+        Returns the A-weighted level in dB of the convolution of `x` with the single-channel IR `h`, computed block by block.
+
+        Args:
+            x (numpy.ndarray): The input signal vector (N_samples,).
+            h (numpy.ndarray): The impulse response of the reference microphone (K_samples x 1).
+            block_size (int): The number of samples of the convolution computed at once.
+            mean_length (int, optional): The number of samples over which the power is averaged. Defaults to None, in which case the length of the convolution is used.
+
+        Returns:
+            float: The A-weighted level in dB.
+        """
+        sos = Car.__A_weighting_sos(self.fs)
+        zi = np.zeros((len(sos), 2))
+        length = len(x) + len(h) - 1
+        energy = 0.0
+        for start in range(0, length, block_size):
+            y = Car.__convolve_segment(x, h, start, min(length, start + block_size))[:, 0]
+            with Car.__stage('a_weighting'):
+                y, zi = sosfilt(sos, y, zi=zi)
+            energy += np.sum(np.square(y))
+        return 20 * np.log10(np.sqrt(energy / (length if mean_length is None else mean_length)))
+
+    def __spectral_level(self, x, h, ir_key, autocorrelations=None, mean_length=None):
+        """
+        Returns the A-weighted level in dB of the convolution of `x` with the single-channel IR `h`, without computing the convolution.
+
+        The energy of x * h * a, where a is the impulse response of the A-weighting filter, is the inner product of the autocorrelation of
+        `x` with the autocorrelation of h * a (the inverse transforms of their power spectra). The latter is computed once per IR, so
+        that the level costs one FFT of `x` and a dot product. The level matches the time-domain calibration up to the energy of the
+        A-weighting filter ringing beyond the end of the convolution.
+
+        Args:
+            x (numpy.ndarray or PreparedSignal): The input signal vector (N_samples,).
+            h (numpy.ndarray): The impulse response of the reference microphone (K_samples,).
+            ir_key (tuple): The microphone setup, folder and condition of the IR, used to cache its autocorrelation.
+            autocorrelations (dict, optional): Autocorrelations of input signals keyed by (id(x), number of lags), reused across IRs.
+            mean_length (int, optional): The number of samples over which the power is averaged. Defaults to None, in which case the length of the convolution is used.
+
+        Returns:
+            float: The A-weighted level in dB.
+        """
+        # full and compacted IRs of a condition have different lengths
+        key = ir_key + (self.fs, self.__resampler, len(h))
+        if key not in self.__weighted_ir_autocorrelations:
+            g = self.__A_weighting_filter(np.concatenate([h, np.zeros(int(Car.__A_WEIGHTING_TAIL * self.fs))]), self.fs)
+            self.__weighted_ir_autocorrelations[key] = Car.__autocorrelation(g, len(g))
+        r_g = self.__weighted_ir_autocorrelations[key]
+        if isinstance(x, PreparedSignal):
+            r_x = x.autocorrelation(len(r_g))
+        else:
+            if autocorrelations is None:
+                autocorrelations = {}
+            if (id(x), len(r_g)) not in autocorrelations:
+                autocorrelations[(id(x), len(r_g))] = Car.__autocorrelation(x, len(r_g))
+            r_x = autocorrelations[(id(x), len(r_g))]
+        energy = r_x[0] * r_g[0] + 2 * np.dot(r_x[1:], r_g[1:])
+        return 10 * np.log10(energy / (len(x) + len(h) - 1 if mean_length is None else mean_length))
+
+    @staticmethod
+    def __autocorrelation(x, lags):
+        """Returns the first `lags` lags of the (unnormalized) autocorrelation of `x`, computed from its power spectrum."""
+        n = next_fast_len(len(x) + lags - 1, real=True)
+        spectrum = rfft(np.asarray(x, dtype=np.float64), n)
+        return irfft(spectrum.real ** 2 + spectrum.imag ** 2, n)[:lags]
+
+    def __store_folder(self, store):
+        """Returns the folder of the given store of preprocessed recordings inside the hidden '.cache' folder."""
+        return os.path.join(self.__path, Car.__CACHE_FOLDER, store)
+
+    def __store_index(self, store):
+        """
+        Returns the index of the given store of preprocessed recordings.
+
+        The index maps the path of each preprocessed file (relative to the store folder) to the modification time and
+        size of its source recording at the time it was processed. It is re-read whenever the index file changes on disk.
+        """
+        index_file = os.path.join(self.__store_folder(store), 'index.json')
+        try:
+            mtime = os.stat(index_file).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if store not in self.__stores or self.__stores[store][0] != mtime:
+            with open(index_file, 'r') as f:
+                self.__stores[store] = (mtime, json.load(f))
+        return self.__stores[store][1]
+
+    def __write_store_index(self, store, index):
+        """Atomically writes the index of the given store of preprocessed recordings."""
+        index_file = os.path.join(self.__store_folder(store), 'index.json')
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        with open(index_file + '.tmp', 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(index_file + '.tmp', index_file)
+
+    @staticmethod
+    def __source_signature(path):
+        """Returns the modification time and size of a file, used to detect stale preprocessed copies."""
+        st = os.stat(path)
+        return {'mtime': st.st_mtime_ns, 'size': st.st_size}
+
+    def __stored_recording(self, path):
+        """Returns the path of an up-to-date copy of the recording `path` materialized at Car.fs or None if there is none."""
+        store = f'{self.fs}Hz'
+        index = self.__store_index(store)
+        if not index:
+            return None
+        relative_path = os.path.relpath(path, self.__path)
+        if index.get(relative_path) != Car.__source_signature(path):
+            return None
+        stored_path = os.path.join(self.__store_folder(store), relative_path)
+        return stored_path if os.path.exists(stored_path) else None
+
+    def __banked_recording(self, mic_setup, folder, condition, path):
+        """
+        Returns the noise bank entry of a recording as a read-only memory map and the scale of its samples.
+
+        The scale is None for float32 banks. Returns None if the recording is not in the noise bank of Car.fs or if its source has changed.
+        """
+        store = f'bank_{self.fs}Hz'
+        index = self.__store_index(store)
+        if not index:
+            return None
+        relative_path = os.path.join(mic_setup, folder, condition + '.npy')
+        entry = index.get(relative_path)
+        if entry is None or entry['source'] != os.path.relpath(path, self.__path):
+            return None
+        if {'mtime': entry['mtime'], 'size': entry['size']} != Car.__source_signature(path):
+            return None
+        return np.load(os.path.join(self.__store_folder(store), relative_path), mmap_mode='r'), entry.get('scale')
+
+    def __compacted_ir(self, mic_setup, folder, condition, path):
+        """
+        Returns the path of the compacted IR of a condition in the IR store of Car.fs and its index entry, or None if it is not in the store
+        or if its source has changed.
+        """
+        store = f'irs_{self.fs}Hz'
+        index = self.__store_index(store)
+        if not index:
+            return None
+        relative_path = os.path.join(mic_setup, folder, condition + '.npy')
+        entry = index.get(relative_path)
+        if entry is None or entry['source'] != os.path.relpath(path, self.__path):
+            return None
+        if {'mtime': entry['mtime'], 'size': entry['size']} != Car.__source_signature(path):
+            return None
+        return os.path.join(self.__store_folder(store), relative_path), entry
+
+    def __full_ir_length(self, mic_setup, folder, condition, h):
+        """Returns the length at Car.fs of the IR `h` of a condition before compaction, i.e. len(h) unless `h` is a compacted IR of the IR store."""
+        if self.__compact_irs:
+            path, _ = self.__recording_path(mic_setup, folder, condition)
+            compacted = self.__compacted_ir(mic_setup, folder, condition, path)
+            if compacted is not None and len(h) == compacted[1]['stop'] - compacted[1]['onset']:
+                return compacted[1]['length']
+        return len(h)
+
+    @staticmethod
+    def __ir_support(h, threshold_db):
+        """
+        Returns the common onset and end (exclusive) of the channels of the IR `h`: the samples before the onset and after the end each hold
+        less than `threshold_db` of the energy of the IR summed over its channels.
+        """
+        energy = np.sum(np.square(h, dtype=np.float64), axis=1)
+        total = np.sum(energy)
+        if total == 0:
+            return 0, len(h)
+        limit = total * 10 ** (threshold_db / 10)
+        onset = int(np.searchsorted(np.cumsum(energy), limit, side='right'))
+        # energy decay curve: the energy from each sample to the end
+        decay = np.cumsum(energy[::-1])[::-1]
+        below = np.flatnonzero(decay <= limit)
+        stop = int(below[0]) if len(below) else len(h)
+        return onset, max(stop, onset + 1)
+
+    def __recording_statistics(self, mic_setup, folder, condition, n_fft):
+        """
+        Returns the statistics of a noise or ventilation recording at Car.fs, without correction gains.
+
+        Statistics are read from the statistics store of Car.fs if it holds an entry for the FFT size whose source has not changed. Otherwise
+        they are computed and written to the store, or a warning is issued if the car folder is not writable. Loaded statistics are kept in
+        memory per sampling frequency and source signature, so that a modified recording is never served from memory either.
+        """
+        path, _ = self.__recording_path(mic_setup, folder, condition)
+        signature = Car.__source_signature(path)
+        key = (mic_setup, folder, condition, self.fs, n_fft, signature['mtime'], signature['size'])
+        if key in self.__statistics:
+            return self.__statistics[key]
+
+        store = f'stats_{self.fs}Hz'
+        relative_path = os.path.join(mic_setup, folder, f'{condition}_{n_fft}.npz')
+        stored_path = os.path.join(self.__store_folder(store), relative_path)
+        entry = self.__store_index(store).get(relative_path)
+        if (entry is not None and entry['source'] == os.path.relpath(path, self.__path)
+                and {'mtime': entry['mtime'], 'size': entry['size']} == signature and os.path.exists(stored_path)):
+            with np.load(stored_path) as f:
+                statistics = {name: f[name] for name in f.files}
+        else:
+            x, _ = self.__load_recording(mic_setup, folder, condition, dtype='float64')
+            statistics = self.__compute_statistics(x, n_fft)
+            try:
+                self.__write_statistics(store, relative_path, statistics,
+                                        {'source': os.path.relpath(path, self.__path), 'n_fft': n_fft, **signature})
+            except OSError as e:
+                warnings.warn(f"Statistics of {relative_path} could not be stored for {self} ({e}); they are recomputed by every new Car.")
+        for value in statistics.values():
+            value.flags.writeable = False
+        self.__statistics[key] = statistics
+        return statistics
+
+    def __write_statistics(self, store, relative_path, statistics, entry):
+        """Atomically writes the statistics of a recording to a store and adds their entry to its index."""
+        stored_path = os.path.join(self.__store_folder(store), relative_path)
+        os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+        with open(stored_path + '.tmp', 'wb') as f:
+            np.savez(f, **statistics)
+        os.replace(stored_path + '.tmp', stored_path)
+        index = dict(self.__store_index(store))
+        index[relative_path] = entry
+        self.__write_store_index(store, index)
+
+    def __compute_statistics(self, x, n_fft):
+        """
+        Computes the statistics of a multichannel recording (N_samples x M_channels) in chunks, without holding its STFT in memory.
+
+        The STFT uses a periodic Hann window of n_fft samples with a hop of n_fft // 4 and only frames that lie inside the recording. Its
+        frames are scaled as by scipy.signal.stft, so that the covariance matrices match the STFTs of the beamforming module.
+
+        Returns:
+            dict: The arrays 'frequencies' (F), 'covariance' (F x M x M, mean of X X^H over frames), 'psd' (F x M, one-sided power spectral
+                density in units^2/Hz by Welch's method), 'levels' (K x M, A-weighted levels in dB of consecutive blocks of
+                Car.__LEVEL_BLOCK_SECONDS), 'level_block' (the duration of the blocks) and 'frames' (the number of STFT frames).
+        """
+        hop = n_fft // 4
+        window = get_window('hann', n_fft)
+        n_channels = x.shape[1]
+        n_bins = n_fft // 2 + 1
+        covariance = np.zeros((n_bins, n_channels, n_channels), dtype=complex)
+        power = np.zeros((n_bins, n_channels))
+        frames = 0
+        tail = np.zeros((0, n_channels))
+
+        block = max(1, int(round(Car.__LEVEL_BLOCK_SECONDS * self.fs)))
+        sos = Car.__A_weighting_sos(self.fs)
+        zi = np.zeros((sos.shape[0], 2, n_channels))
+        energies = []
+
+        chunk_size = block * Car.__STATISTICS_CHUNK_BLOCKS
+        for start in range(0, len(x), chunk_size):
+            chunk = np.asarray(x[start:start + chunk_size], dtype=float)
+
+            # STFT frames of the chunk, continuing the frames of the previous chunks
+            buffer = np.concatenate([tail, chunk])
+            n_frames = (len(buffer) - n_fft) // hop + 1 if len(buffer) >= n_fft else 0
+            if n_frames:
+                segments = np.lib.stride_tricks.sliding_window_view(buffer, n_fft, axis=0)[:n_frames * hop:hop]
+                X = rfft(segments * window, axis=-1)
+                covariance += np.einsum('tmf,tkf->fmk', X, X.conj())
+                power += np.sum(np.abs(X) ** 2, axis=0).T
+                frames += n_frames
+            tail = buffer[n_frames * hop:]
+
+            # A-weighted energy of the level blocks of the chunk; only the last chunk may end with a partial block
+            y, zi = sosfilt(sos, chunk, axis=0, zi=zi)
+            for block_start in range(0, len(y), block):
+                energies.append(np.mean(np.square(y[block_start:block_start + block]), axis=0))
+
+        # scaling of scipy.signal.stft for the covariance, one-sided density for the PSD
+        covariance /= max(frames, 1) * np.sum(window) ** 2
+        psd = power / (max(frames, 1) * self.fs * np.sum(window ** 2))
+        psd[1:n_bins - (n_fft % 2 == 0)] *= 2
+        with np.errstate(divide='ignore'):
+            levels = 10 * np.log10(np.array(energies).reshape(-1, n_channels))
+        return {
+            'frequencies': np.fft.rfftfreq(n_fft, 1 / self.fs),
+            'covariance': covariance,
+            'psd': psd,
+            'levels': levels,
+            'level_block': np.array(block / self.fs),
+            'frames': np.array(frames),
+            }
+
+    def __select_statistics(self, statistics, mics, use_correction_gains):
+        """Returns the statistics of the microphones `mics` (an integer, a list of integers or None for all), with their correction gains applied if requested."""
+        n_channels = statistics['psd'].shape[1]
+        if mics is None:
+            mics = list(range(n_channels))
+        if not isinstance(mics, list):
+            mics = [mics]
+        selected = dict(statistics)
+        selected['covariance'] = statistics['covariance'][:, mics][:, :, mics]
+        selected['psd'] = statistics['psd'][:, mics]
+        selected['levels'] = statistics['levels'][:, mics]
+        if use_correction_gains:
+            gains = np.array([self.correction_gains[str(mic)] for mic in mics])
+            selected['covariance'] = selected['covariance'] * np.outer(gains, gains)
+            selected['psd'] = selected['psd'] * gains ** 2
+            selected['levels'] = selected['levels'] + 20 * np.log10(gains)
+        return selected
+
     def __A_weighting_filter(self, s, fs):
+        """Applies the A-weighting filter designed by Car.__A_weighting_sos to the signal `s`, or to each column of `s` if it is a matrix of signals (N_samples x N_signals)."""
+        with Car.__stage('a_weighting'):
+            Car.__count(a_weighted_samples=np.size(s))
+            return sosfilt(Car.__A_weighting_sos(fs), s, axis=0)
+
+    def __A_weighted_levels(self, signals, mean_lengths=None):
+        """
+        Returns the A-weighted levels in dB of a list of signals, filtering the signals of equal length in one call.
+
+        Args:
+            signals (list): The signal vectors.
+            mean_lengths (list, optional): The number of samples over which the power of each signal is averaged. Defaults to None, in which case the lengths of the signals are used.
+
+        Returns:
+            list: The levels in dB, in the order of `signals`.
+        """
+        levels = [None] * len(signals)
+        by_length = {}
+        for i, x in enumerate(signals):
+            by_length.setdefault(len(x), []).append(i)
+        for indices in by_length.values():
+            filtered = self.__A_weighting_filter(np.stack([signals[i] for i in indices], axis=1), self.fs)
+            lengths = len(filtered) if mean_lengths is None else np.array([mean_lengths[i] for i in indices])
+            rms = np.sqrt(np.sum(np.square(filtered), axis=0) / lengths)
+            for i, value in zip(indices, rms):
+                levels[i] = 20 * np.log10(value)
+        return levels
+
+    @classmethod
+    def __A_weighting_sos(cls, fs):
         """Design of an A-weighting filter.
-        b, a = A_weighting(fs) designs a digital A-weighting filter for sampling frequency `fs`. Usage: y = scipy.signal.lfilter(b, a, x).
+        sos = A_weighting(fs) designs a digital A-weighting filter for sampling frequency `fs` in second-order sections. Usage: y = scipy.signal.sosfilt(sos, x).
+        The design is computed once per sampling frequency and the returned array is shared, so it must not be modified.
         Warning: `fs` should normally be higher than 20 kHz. For example,
         fs = 48000 yields a class 1-compliant filter.
         References:
         [1] IEC/CD 1672: Electroacoustics-Sound Level Meters, Nov. 1996.
         """
-        # Definition of analog A-weighting filter according to IEC/CD 1672.
-        f1 = 20.598997
-        f2 = 107.65265
-        f3 = 737.86223
-        f4 = 12194.217
-        A1000 = 1.9997
+        if fs not in cls.__A_weighting_cache:
+            # Definition of analog A-weighting filter according to IEC/CD 1672.
+            f1 = 20.598997
+            f2 = 107.65265
+            f3 = 737.86223
+            f4 = 12194.217
+            A1000 = 1.9997
 
-        NUMs = [(2*np.pi * f4)**2 * (10**(A1000/20)), 0, 0, 0, 0]
-        DENs = np.polymul([1, 4*np.pi * f4, (2*np.pi * f4)**2],
-                    [1, 4*np.pi * f1, (2*np.pi * f1)**2])
-        DENs = np.polymul(np.polymul(DENs, [1, 2*np.pi * f3]),
-                                    [1, 2*np.pi * f2])
+            # zeros, poles and gain of the analog filter (2*pi*f4)^2 * 10^(A1000/20) * s^4 / ((s + 2*pi*f4)^2 (s + 2*pi*f1)^2 (s + 2*pi*f3) (s + 2*pi*f2))
+            zeros = np.zeros(4)
+            poles = -2*np.pi * np.array([f4, f4, f1, f1, f3, f2])
+            gain = (2*np.pi * f4)**2 * (10**(A1000/20))
+
+            cls.__A_weighting_cache[fs] = zpk2sos(*bilinear_zpk(zeros, poles, gain, fs))
+        return cls.__A_weighting_cache[fs]
+
+    def __speech_offset(self, mic_setup, ir_condition, convolved_reference_level):
+        """
+        Returns the gain in dB that brings speech convolved with the IR of `ir_condition` to a speech effort level of 0, i.e. the gain for
+        the speech effort level `ls` is `ls` plus the offset.
+
+        Args:
+            mic_setup (str): The microphone setup.
+            ir_condition (str): The IR condition ("speaker location_window condition").
+            convolved_reference_level (float): The A-weighted level in dB of the convolved speech at the reference microphone.
+
+        Returns:
+            float: The offset in dB.
+        """
+        return self.__references[mic_setup][ir_condition] - 72.5 - convolved_reference_level
+
+    def __radio_offset(self, mic_setup, convolved_radio_level):
+        """
+        Returns the gain in dB that brings audio convolved with a radio IR to an audio level of 0, i.e. the gain for the audio level `la` is
+        `la` plus the offset.
+
+        Args:
+            mic_setup (str): The microphone setup.
+            convolved_radio_level (float): The A-weighted level in dB FS of the convolved audio at the reference microphone.
+
+        Returns:
+            float: The offset in dB.
+        """
+        return -(convolved_radio_level + Car.__DB_FSA_TO_DB_A[self.__reference_mic[mic_setup]])
+
+    def __speech_gain(self, mic_setup, ir_condition, ls, convolved_reference_level):
+        """Returns the gain that brings speech convolved with the IR of `ir_condition` to the speech effort level `ls`."""
+        return 10 ** ((ls + self.__speech_offset(mic_setup, ir_condition, convolved_reference_level)) / 20)
+
+    def __radio_gain(self, mic_setup, la, convolved_radio_level):
+        """Returns the gain that brings audio convolved with a radio IR to the audio level `la`."""
+        return 10 ** ((la + self.__radio_offset(mic_setup, convolved_radio_level)) / 20)
+
+    def __dry_signal(self, x, dtype=None):
+        """
+        Returns the dry speech or radio audio `x` as a mono signal vector of `dtype` (Car.dtype if None), averaging its channels, or as is if
+        it is a PreparedSignal.
+
+        Raises:
+            ValueError: If `x` is a PreparedSignal with a sampling frequency other than Car.fs.
+        """
+        if isinstance(x, PreparedSignal):
+            if x.fs is not None and x.fs != self.fs:
+                raise ValueError(f"The prepared signal has a sampling frequency of {x.fs} Hz instead of {self.fs} Hz.")
+            return x
+        if len(x.shape) > 1:
+            x = np.mean(x, axis=1)
+        return x.astype(self.__dtype_of(dtype), copy=False)
+
+    def __calibrated_component(self, mic_setup, folder, condition, x, mics, calibration, offset_of_level, dtype=None):
+        """
+        Convolves the mono signal `x` with an IR of `folder` ('IRs' or 'radio_IRs') and returns it as a CalibratedComponent, using the
+        component cache.
+
+        Args:
+            mic_setup (str): The microphone setup.
+            folder (str): The folder of the IR.
+            condition (str): The condition of the IR.
+            x (numpy.ndarray): The input signal vector.
+            mics (int or list of int): The microphone indices, or None for all microphones.
+            calibration (str): The method that computes the level at the reference microphone, 'time' or 'spectral'.
+            offset_of_level (callable): A function that returns the offset of the component from the A-weighted level at the reference microphone.
+            dtype (str, optional): The sample format of the IR and of the convolved signal. Defaults to None, in which case Car.dtype is used.
+
+        Returns:
+            CalibratedComponent: The convolved signal with its offset.
+        """
+        dtype = self.__dtype_of(dtype)
+        key = None
+        if self.__component_cache.max_bytes > 0:
+            key = (folder, mic_setup, condition, self.fs, self.__resampler, Car.__digest(x), mics if not isinstance(mics, list) else tuple(mics),
+                   calibration, dtype.name, self.__compact_irs)
+            component = self.__component_cache.get(key)
+            if component is not None:
+                Car.__count(component_cache_hits=1)
+                return component
+            Car.__count(component_cache_misses=1)
+        loader = self.load_ir if folder == 'IRs' else self.load_radio_ir
+        h, _ = loader(mic_setup, condition, dtype=dtype.name)
+        reference_mic = self.__reference_mic[mic_setup]
+        if mics is None:
+            mics = list(range(h.shape[1]))
+        if not isinstance(mics, list):
+            mics = [mics]
+
+        # the level of a compacted IR is averaged over the length of the convolution with the full IR
+        mean_length = len(x) + self.__full_ir_length(mic_setup, folder, condition, h) - 1
+
+        # convolve the selected microphones and, for the time-domain calibration, the reference microphone in one call
+        channels = sorted(set(mics) | {reference_mic}) if calibration == 'time' else sorted(set(mics))
+        convolved = Car.__convolve(x, h[:, channels])
+        if calibration == 'time':
+            # Apply A-weighting filter
+            convolved_reference_signal = self.__A_weighting_filter(convolved[:, channels.index(reference_mic)], self.fs)
+            # Calculate RMS
+            convolved_reference_rms = Car.__calculate_rms(convolved_reference_signal, mean_length)
+            # to dB
+            convolved_reference_level = 20 * np.log10(convolved_reference_rms)
+        else:
+            with Car.__stage('spectral_level'):
+                convolved_reference_level = self.__spectral_level(x, h[:, reference_mic], (mic_setup, folder, condition), mean_length=mean_length)
+
+        component = CalibratedComponent(convolved[:, [channels.index(mic) for mic in mics]], offset_of_level(convolved_reference_level),
+                                        mics, np.array([self.correction_gains[str(mic)] for mic in mics]))
+        if key is not None:
+            self.__component_cache.put(key, component)
+        return component
+
+    @staticmethod
+    def __digest(x):
+        """Returns a digest of the samples of `x`, used to key cached components by the content of their input signal."""
+        if isinstance(x, PreparedSignal):
+            return x.digest
+        x = np.ascontiguousarray(x)
+        digest = hashlib.blake2b(f'{x.dtype}{x.shape}'.encode(), digest_size=16)
+        digest.update(x.reshape(-1).view(np.uint8))
+        return digest.hexdigest()
 
-        b, a = bilinear(NUMs, DENs, fs)
-           
-        return lfilter(b, a, s)
-        
     @classmethod
-    def __calculate_rms(cls, x):
+    def __calculate_rms(cls, x, length=None):
         """
         Calculates the root mean square (RMS) of the given array.
 
@@ -330,14 +1270,180 @@ class Car:
 
         Args:
             x (numpy.ndarray): A numpy array for which the RMS is to be calculated.
+            length (int, optional): The number of samples over which the mean is taken. Defaults to None, in which case len(x) is used.
 
         Returns:
             float: The RMS of the input array.
         """
-        return np.sqrt(np.sum(np.square(x))/len(x))
+        return np.sqrt(np.sum(np.square(x, dtype=np.float64))/(len(x) if length is None else length))
+
+    @classmethod
+    def __convolve(cls, x, h):
+        """
+        Convolves a single-channel signal with every channel of an impulse response in one call.
+
+        Overlap-add convolution is used when one of the two signals is much longer than the other
+        (e.g. an utterance of several seconds and an IR of a few thousand taps), otherwise a single
+        full-length FFT convolution is performed.
+
+        Args:
+            x (numpy.ndarray or PreparedSignal): The input signal vector (N_samples,).
+            h (numpy.ndarray): The impulse response (K_samples x M_channels).
+
+        Returns:
+            numpy.ndarray: The full convolution of `x` with each channel of `h` ((N_samples + K_samples - 1) x M_channels).
+        """
+        Car.__count(convolved_samples=(len(x) + len(h) - 1) * h.shape[1])
+        with Car.__stage('convolve'):
+            if isinstance(x, PreparedSignal):
+                # the spectra of prepared signals are kept in float64
+                return x.convolve(h).astype(h.dtype, copy=False)
+            if min(len(x), len(h)) * cls.__OA_RATIO < max(len(x), len(h)):
+                return oaconvolve(x[:, np.newaxis], h, mode='full', axes=0)
+            return fftconvolve(x[:, np.newaxis], h, mode='full', axes=0)
+
+    @classmethod
+    def __convolve_segment(cls, x, h, start, stop):
+        """
+        Returns the samples `start` to `stop` of the full convolution of `x` with every channel of `h`.
+
+        Only the part of `x` that contributes to the requested samples is convolved, so that long signals can be
+        convolved block by block (overlap-save) without computing the whole convolution.
+
+        Args:
+            x (numpy.ndarray): The input signal vector (N_samples,).
+            h (numpy.ndarray): The impulse response (K_samples x M_channels).
+            start (int): The first sample of the convolution to return.
+            stop (int): The sample after the last sample of the convolution to return. Must not exceed N_samples + K_samples - 1.
+
+        Returns:
+            numpy.ndarray: The requested samples of the convolution ((stop - start) x M_channels).
+        """
+        first = max(0, start - len(h) + 1)
+        y = cls.__convolve(x[first:min(len(x), stop)], h)
+        return y[start - first:stop - first]
+
+    @classmethod
+    def __crossfade_masks(cls, fs):
+        """
+        Returns the first quarter of a sine and a cosine of 4 seconds period, used by match_duration to crossfade the end of a looped signal into its start.
+
+        Args:
+            fs (int): The sampling frequency.
+
+        Returns:
+            tuple: The read-only sine (fade in) and cosine (fade out) masks, each one second long. The masks are computed once per sampling frequency.
+        """
+        if fs not in cls.__crossfade_masks_cache:
+            period = 4 * Car.__CROSSFADE_SECONDS
+            f = 1 / period
+            samples = np.arange(period * fs) / fs
+            sine = np.sin(2 * np.pi * f * samples)
+            cos = np.cos(2 * np.pi * f * samples)
+            # keep the first quarter of each function
+            masks = sine[:int(len(samples)/4)], cos[:int(len(samples)/4)]
+            for mask in masks:
+                mask.flags.writeable = False
+            cls.__crossfade_masks_cache[fs] = masks
+        return cls.__crossfade_masks_cache[fs]
+
+    @classmethod
+    def __loop_segments(cls, length, target_length, crossfade, start, stop):
+        """
+        Describes the samples `start` to `stop` of a signal of `length` samples looped with crossfading to `target_length` samples, as done by match_duration.
+
+        The looped signal consists of the start and the middle part of the signal (the signal without its first and last
+        `crossfade` samples), followed by the crossfade of the signal's start into its end and then by repetitions of the
+        middle part and the crossfade. The last repetition ends with the end of the signal instead of the crossfade. A signal
+        of at least `target_length` samples is simply truncated.
+
+        Args:
+            length (int): The length of the signal in samples.
+            target_length (int): The length of the looped signal in samples.
+            crossfade (int): The length of the crossfade in samples.
+            start (int): The first sample of the looped signal to describe.
+            stop (int): The sample after the last sample of the looped signal to describe. Must not exceed target_length.
+
+        Returns:
+            list: A list of (out_start, out_stop, kind, source_start) tuples covering `start` to `stop`, where kind is 'signal' for samples
+                  copied from the signal starting at source_start and 'crossfade' for samples of the crossfade starting at source_start.
+
+        Raises:
+            ValueError: If a signal that has to be looped is shorter than the crossfade.
+        """
+        segments = []
+        def add(out_start, out_stop, kind, source_start):
+            first, last = max(out_start, start), min(out_stop, stop)
+            if first < last:
+                segments.append((first, last, kind, source_start + first - out_start))
+
+        if length >= target_length:
+            add(0, target_length, 'signal', 0)
+            return segments
+        if length < crossfade:
+            raise ValueError(f"Signals shorter than the crossfade ({crossfade} samples) cannot be looped.")
+        middle = max(0, length - 2 * crossfade)
+        period = middle + crossfade
+        # start and middle part, then the first crossfade
+        add(0, period, 'signal', 0)
+        add(period, period + crossfade, 'crossfade', 0)
+        # repetitions of the middle part and the crossfade, skipping those before start
+        first = period + crossfade
+        base = first + max(0, (start - first) // period) * period
+        while base < stop:
+            add(base, base + middle, 'signal', crossfade)
+            if base + period > target_length:
+                add(base + middle, base + period, 'signal', length - crossfade)
+            else:
+                add(base + middle, base + period, 'crossfade', 0)
+            base += period
+        return segments
         
 
     # class methods
+    @classmethod
+    def enable_profiler(cls, profiler=None):
+        """
+        Enables the recording of the stages and counters of all cars of the process.
+
+        Args:
+            profiler (Profiler, optional): The profiler that records them. Defaults to None, in which case a new Profiler is created.
+
+        Returns:
+            Profiler: The enabled profiler.
+        """
+        Car.__profiler = profiler if profiler is not None else Profiler()
+        return Car.__profiler
+
+    @classmethod
+    def disable_profiler(cls):
+        """
+        Disables the recording of stages and counters, which then costs nothing.
+
+        Returns:
+            Profiler: The profiler that was enabled, or None.
+        """
+        profiler, Car.__profiler = Car.__profiler, None
+        return profiler
+
+    @classmethod
+    def profiler(cls):
+        """Returns the enabled profiler, or None if profiling is disabled."""
+        return Car.__profiler
+
+    @staticmethod
+    def __stage(name):
+        """Returns the context manager that records the stage `name` with the enabled profiler, or a no-op context manager."""
+        profiler = Car.__profiler
+        return _NO_STAGE if profiler is None else profiler.stage(name)
+
+    @staticmethod
+    def __count(**counters):
+        """Adds the given values to the counters of the enabled profiler, if any."""
+        profiler = Car.__profiler
+        if profiler is not None:
+            profiler.count(**counters)
+
     @classmethod
     def match_duration(cls, n: list, fs):
         """
@@ -358,93 +1464,43 @@ class Car:
             - If the list `n` contains only one element, it is returned as is.
             - Crossfading is used to loop shorter elements. The crossfade duration is set to 1 second.
             - The crossfade is achieved using the first quarter of sine and cosine functions.
+            - The list `n` is not modified; a new list is returned.
 
         Example:
             >>> signals = [np.array([1, 2, 3, 4, 5]), np.array([1, 2, 3])]
             >>> fs = 44100
             >>> matched_signals = Car.match_duration(signals, fs)
         """
-        if len(n) == 1:
-            return n
+        with Car.__stage('match_duration'):
+            if len(n) == 1:
+                return n
         
-        # Check if all arrays have the same number of columns
-        num_columns = n[0].shape[1] if len(n[0].shape) > 1 else 1
-        for component in n:
-            if (len(component.shape) > 1 and component.shape[1] != num_columns) or (len(component.shape) == 1 and num_columns != 1):
-                raise ValueError("All components must have the same number of columns.")
-        
-        def create_sine_cosine_masks(period):
-            '''Create the first quarter of sine and cosine functions for crossfading. 
-            period must be 4*crossfade_seconds.
-            '''
-            f = 1 / period
-            samples = np.arange(period * fs) / fs
-            sine = np.sin(2 * np.pi * f * samples)
-            cos = np.cos(2 * np.pi * f * samples)
-            # return the first quarter of each function
-            return sine[:int(len(samples)/4)], cos[:int(len(samples)/4)]
-        
-        x = n.pop(0)
-        if num_columns == 1:
-            for i, element in enumerate(n):
-                if len(element) >= len(x):
-                    n[i] = element[:len(x)]
-                elif len(element) < len(x):
-                    crossfade_seconds = 1
-                    crossfade_samples = int(crossfade_seconds*fs) # Number of samples for crossfade
-            
-                    # Create sine and cosine masks for crossfading. 
-                    # We want the first quarter of each function, 
-                    # so the length should be 4*crossfade_seconds.
-                    sine, cos = create_sine_cosine_masks(4*crossfade_seconds)
-
-                    start = element[0:crossfade_samples]
-                    middle = element[crossfade_samples:len(element)-crossfade_samples]
-                    end = element[len(element)-crossfade_samples:]
-                    cf = start * sine + end * cos 
-                
-                    result = np.concatenate((start, middle, cf))
-                    while len(result) < len(x):
-                        result = np.concatenate((result, middle))
-                        if len(result) + len(cf) > len(x):
-                            result = np.concatenate((result, end))
-                        else:
-                            result = np.concatenate((result, cf))
-                    
-                    # Cut result to match the length of x
-                    n[i] = result[:len(x)]
-            n.insert(0, x)
-            return n
-        else:
-            reference_len = len(x[:, 0])
-            out = []
-            for i, element in enumerate(n):
-                if len(element[:, 0]) >= reference_len:
-                    out.append(element[:reference_len, :])
-                elif len(element[:, 0]) < reference_len:
-                    crossfade_seconds = 1
-                    crossfade_samples = int(crossfade_seconds*fs)
-                    sine, cos = create_sine_cosine_masks(4*crossfade_seconds)
-                    
-                    crossfaded_mic = np.zeros((reference_len, num_columns))
-                    for j in range(num_columns):
-                        start = element[0:crossfade_samples, j]
-                        middle = element[crossfade_samples:len(element)-crossfade_samples, j]
-                        end = element[len(element)-crossfade_samples:, j]
-                        cf = start * sine + end * cos 
-                    
-                        result = np.concatenate((start, middle, cf))
-                        while len(result) < reference_len:
-                            result = np.concatenate((result, middle), axis=0)
-                            if len(result) + len(cf) > len(x):
-                                result = np.concatenate((result, end), axis=0)
-                            else:
-                                result = np.concatenate((result, cf), axis=0)
-                        
-                        # Cut result to match the length of reference
-                        crossfaded_mic[:, j] = result[:reference_len]
-                    out.append(crossfaded_mic)
-            out.insert(0, x)
+            # Check if all arrays have the same number of columns
+            num_columns = n[0].shape[1] if len(n[0].shape) > 1 else 1
+            for component in n:
+                if (len(component.shape) > 1 and component.shape[1] != num_columns) or (len(component.shape) == 1 and num_columns != 1):
+                    raise ValueError("All components must have the same number of columns.")
+
+            x = n[0]
+            reference_len = len(x)
+            crossfade_samples = int(cls.__CROSSFADE_SECONDS * fs)
+            out = [x]
+            for element in n[1:]:
+                if len(element) >= reference_len:
+                    out.append(element[:reference_len])
+                    continue
+
+                # Loop the element with crossfading into a preallocated output, all channels at once
+                sine, cos = cls.__crossfade_masks(fs)
+                element_2d = element.reshape(len(element), -1)
+                cf = element_2d[:crossfade_samples] * sine[:, np.newaxis] + element_2d[len(element)-crossfade_samples:] * cos[:, np.newaxis]
+                # float32 components stay in float32
+                result = np.empty((reference_len,) + element.shape[1:], dtype=np.result_type(element.dtype, np.float32))
+                result_2d = result.reshape(reference_len, -1)
+                for out_start, out_stop, kind, source_start in cls.__loop_segments(len(element), reference_len, crossfade_samples, 0, reference_len):
+                    source = element_2d if kind == 'signal' else cf
+                    result_2d[out_start:out_stop] = source[source_start:source_start + out_stop - out_start]
+                out.append(result)
             return out
         
         
@@ -502,85 +1558,471 @@ class Car:
                     'prr': 12
                     }
 
-        return angles
-    
+        return angles
+    
+
+    def query_conditions(self, kind, mic_setup=None, **filters):
+        """
+        Lists the available conditions of a kind that match the given filters.
+
+        Each condition is a dictionary with the arguments of its getter, so that it can be passed on directly, e.g.
+        `car.get_noise(**condition, mics=[0, 1])`. The keys are 'mic_setup', 'location' and 'window' for 'speech',
+        'mic_setup', 'speed', 'window' and 'version' for 'noise', 'mic_setup' and 'window' for 'radio' and 'mic_setup', 'level',
+        'window' and 'version' for 'ventilation'. Conditions are returned in the order of Car.irs, Car.noise_recordings, Car.radio_irs
+        and Car.ventilation_recordings.
+
+        Args:
+            kind (str): The kind of condition, 'speech', 'noise', 'radio' or 'ventilation'.
+            mic_setup (str or list of str, optional): The microphone setup(s). Defaults to None, in which case all setups are listed.
+            **filters: Filters on the keys of the conditions. A filter is either a value, a list, tuple, set or range of accepted values,
+                or a function that returns True for accepted values. E.g. all speeds of at least 80 km/h with window 0, in any version:
+                `car.query_conditions('noise', speed=lambda speed: speed >= 80, window=0)`.
+
+        Returns:
+            list: The matching conditions.
+
+        Raises:
+            ValueError: If kind is not 'speech', 'noise', 'radio' or 'ventilation'.
+            ValueError: If a filter is not a key of the conditions of the given kind.
+        """
+        if kind not in Car.__CONDITION_KINDS:
+            raise ValueError(f"kind must be one of {list(Car.__CONDITION_KINDS)}.")
+        if mic_setup is not None:
+            filters['mic_setup'] = mic_setup
+        keys = {'speech': ('location', 'window'), 'noise': ('speed', 'window', 'version'),
+                'radio': ('window',), 'ventilation': ('level', 'window', 'version')}[kind]
+        unknown = set(filters) - set(keys) - {'mic_setup'}
+        if unknown:
+            raise ValueError(f"Unknown filters {sorted(unknown)} for {kind} conditions.")
+
+        def accepts(accepted, value):
+            if callable(accepted):
+                return accepted(value)
+            if isinstance(accepted, (list, tuple, set, frozenset, range)):
+                return value in accepted
+            return value == accepted
+
+        return [dict(record) for record in self.__records[kind]
+                if all(accepts(accepted, record[key]) for key, accepted in filters.items())]
+
+    def recording_duration(self, kind, mic_setup, **condition):
+        """
+        Returns the duration at Car.fs of the recording or IR of a condition, read from the noise bank, the manifest or the file
+        header without decoding the samples, e.g. to draw the offset of a segment of get_noise or get_ventilation.
+
+        Args:
+            kind (str): The kind of condition, 'speech', 'noise', 'radio' or 'ventilation'.
+            mic_setup (str): The microphone setup.
+            **condition: The other keys of a condition of query_conditions, e.g. `car.recording_duration('noise', **condition)`
+                for a condition returned by `car.query_conditions('noise')`.
+
+        Returns:
+            float: The duration in seconds.
+
+        Raises:
+            ValueError: If kind is not 'speech', 'noise', 'radio' or 'ventilation'.
+            ValueError: If the microphone setup or the condition is not available.
+        """
+        if kind not in Car.__CONDITION_KINDS:
+            raise ValueError(f"kind must be one of {list(Car.__CONDITION_KINDS)}.")
+        if mic_setup not in self.mic_setups:
+            raise ValueError(f"Microphone setup {mic_setup} is not available.")
+        try:
+            if kind == 'speech':
+                name = f"{condition['location']}_w{condition['window']}"
+            elif kind == 'radio':
+                name = f"w{condition['window']}"
+            else:
+                name = f"{'s' if kind == 'noise' else 'v'}{condition['speed' if kind == 'noise' else 'level']}_w{condition['window']}"
+                if condition.get('version'):
+                    name += f"_{condition['version']}"
+        except KeyError as key:
+            raise ValueError(f"Missing key {key} in {kind} condition.")
+        folder = Car.__CONDITION_KINDS[kind]
+        if name not in (self.__conditions[mic_setup][folder] or ()):
+            raise ValueError(f"Condition {name} is not available in the {folder} of {mic_setup}.")
+        return self.__recording_length(mic_setup, folder, name) / self.fs
+
+    def clear_cache(self):
+        """
+        Removes all decoded recordings from the recordings cache and all components from the calibrated components cache, and resets their
+        hit and miss counters. Prefetched recordings that no call has taken are dropped.
+        """
+        self.__cache.clear()
+        self.__component_cache.clear()
+        with self.__prefetch_lock:
+            self.__prefetched.clear()
+
+    def prefetch(self, specs):
+        """
+        Starts loading the recordings of upcoming get_components calls on the prefetch threads, so that they are decoded (and resampled)
+        while the caller convolves or renders other mixtures. A call that needs a prefetched recording takes it from the threads, waiting
+        for its load to finish if needed, and the recordings cache keeps it when its budget allows it.
+
+        A prefetched recording is held until a call takes it or until clear_cache, so callers should announce a bounded lookahead, e.g.
+        the next few mixtures. get_components and get_components_batch prefetch their own recordings when prefetch_workers is larger than 0,
+        and drop those that they did not take, e.g. IRs of components found in the component cache.
+        Recordings read from the noise bank or already cached are not prefetched, nor are conditions that are not available; the call
+        that uses them raises the error.
+
+        Args:
+            specs (list of dict): The arguments of the upcoming get_components calls, as in get_components_batch. Only "mic_setup", "location",
+                                  "speed", "window", "version", "ls", "la", "vent_level" and "dtype" are used and other keys are ignored.
+
+        Returns:
+            int: The number of recordings whose load has started. Always 0 if prefetch_workers is 0.
+
+        Raises:
+            ValueError: If the dtype of a spec is not 'float64' or 'float32'.
+
+        Example:
+            >>> my_car = Car(path=car_path, cache_size=512 * 2**20, prefetch_workers=2)
+            >>> for i, spec in enumerate(specs):
+            ...     my_car.prefetch(specs[i + 1:i + 3])
+            ...     components = my_car.get_components(**spec)
+        """
+        if not self.__prefetch_workers:
+            return 0
+        return len(self.__prefetch_specs(specs))
+
+    def __prefetch_specs(self, specs):
+        """Submits the loads of the recordings of `specs` to the prefetch threads (see prefetch) and returns the keys of the submitted loads."""
+        submitted = []
+        for spec in specs:
+            mic_setup, window = spec.get('mic_setup'), spec.get('window')
+            if mic_setup not in self.mic_setups:
+                continue
+            dtype = self.__dtype_of(spec.get('dtype'))
+            conditions = self.__conditions[mic_setup]
+            # in the order in which get_components uses them
+            recordings = []
+            if spec.get('ls'):
+                recordings.append(('IRs', f"{spec.get('location')}_w{window}"))
+            if spec.get('la'):
+                recordings.append(('radio_IRs', f'w{window}'))
+            if spec.get('vent_level'):
+                recordings.append(('ventilation', f"v{spec['vent_level']}_w{window}"))
+            noise = f"s{spec.get('speed')}_w{window}" + (f"_{spec['version']}" if spec.get('version') else '')
+            if noise not in conditions['noise']:
+                noise += '_ver1'
+            recordings.append(('noise', noise))
+            for folder, condition in recordings:
+                if condition in (conditions[folder] or ()):
+                    key = self.__prefetch_recording(mic_setup, folder, condition, dtype)
+                    if key is not None:
+                        submitted.append(key)
+        return submitted
+
+    @staticmethod
+    def resample(x, fs_x, fs, resampler='librosa'):
+        """
+        Resamples a signal along its first axis, e.g. a dry speech or radio audio signal read from a file, with one of the resamplers of Car.
+        The backend is imported on first use.
+
+        Args:
+            x (numpy.ndarray): The signal vector, or a matrix (N_samples x channels).
+            fs_x (int): The sampling frequency of the signal.
+            fs (int): The target sampling frequency, e.g. Car.fs.
+            resampler (str, optional): The backend, 'librosa', 'soxr', 'polyphase' (scipy.signal.resample_poly) or 'none'. Defaults to 'librosa'.
+
+        Returns:
+            numpy.ndarray: The signal at fs, or the signal itself if fs_x is fs.
+
+        Raises:
+            ValueError: If the resampler is not available.
+            ValueError: If fs_x is not fs and the resampler is 'none'.
+        """
+        if resampler not in Car.__RESAMPLERS:
+            raise ValueError(f"resampler must be one of {Car.__RESAMPLERS}.")
+        if fs_x == fs:
+            return x
+        if resampler == 'polyphase':
+            g = np.gcd(fs_x, fs)
+            return resample_poly(x, fs // g, fs_x // g, axis=0)
+        if resampler == 'soxr':
+            import soxr
+            return soxr.resample(np.ascontiguousarray(x), fs_x, fs, quality='HQ')
+        if resampler == 'librosa':
+            import librosa
+            return librosa.resample(x, orig_sr=fs_x, target_sr=fs, axis=0)
+        raise ValueError(f"Signal at {fs_x} Hz has to be resampled to {fs} Hz, but the resampler is 'none'.")
+
+
+    def materialize(self, fs=None, overwrite=False):
+        """
+        Writes copies of all IRs, noise, radio IRs and ventilation recordings of the car resampled with Car.resampler.
+
+        The copies are stored in the hidden '.cache' folder inside the car folder, together with an index of the modification time and size of
+        each source recording. Once materialized, the load_* methods of a car with the same sampling frequency read the copies instead of
+        resampling the original recordings, as long as the source recordings have not changed.
+
+        Args:
+            fs (int, optional): The sampling frequency of the copies. Defaults to None, in which case Car.fs is used.
+            overwrite (bool, optional): A boolean indicating whether to rewrite copies that are already up to date. Defaults to False.
+
+        Returns:
+            int: The number of recordings that were resampled and written.
+        """
+        fs = fs or self.fs
+        store = f'{fs}Hz'
+        store_folder = self.__store_folder(store)
+        index = dict(self.__store_index(store))
+        written = 0
+        for mic_setup in self.__recordings:
+            for folder in Car.__RECORDING_FOLDERS:
+                source_folder = os.path.join(self.__path, mic_setup, folder)
+                if not os.path.isdir(source_folder):
+                    continue
+                for wav in os.listdir(source_folder):
+                    if not wav.endswith('.wav'):
+                        continue
+                    source_path = os.path.join(source_folder, wav)
+                    relative_path = os.path.relpath(source_path, self.__path)
+                    signature = Car.__source_signature(source_path)
+                    stored_path = os.path.join(store_folder, relative_path)
+                    if not overwrite and index.get(relative_path) == signature and os.path.exists(stored_path):
+                        continue
+                    if sf.info(source_path).samplerate == fs:
+                        # nothing to resample, the loaders read the original recording
+                        continue
+                    x, fs_x = sf.read(source_path)
+                    x = Car.resample(x, fs_x, fs, self.__resampler)
+                    os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+                    sf.write(stored_path + '.tmp', x, fs, subtype='DOUBLE', format='WAV')
+                    os.replace(stored_path + '.tmp', stored_path)
+                    index[relative_path] = signature
+                    written += 1
+
+        if written:
+            self.__write_store_index(store, index)
+        return written
+
+
+    @classmethod
+    def build_manifest(cls, path):
+        """
+        Writes the manifest of a dataset folder, which lists the conditions, the number of frames, sampling frequency and number of channels
+        of the recordings, the references and the correction gains of every car in it. Cars of the dataset read their manifest entry at
+        construction instead of scanning their folders, as long as it is up to date.
+
+        Args:
+            path (str): The path to the dataset folder.
+
+        Returns:
+            int: The number of cars in the manifest.
+
+        Raises:
+            ValueError: If there is no car folder (a folder with an info.json file) in `path`.
+        """
+        cars = {}
+        for name in sorted(os.listdir(path)):
+            info_file = os.path.join(path, name, 'info.json')
+            if os.path.exists(info_file):
+                with open(info_file, 'r') as f:
+                    info_dict = json.load(f)
+                cars[name] = Car.__scan_car(os.path.join(path, name), info_dict, details=True)
+        if not cars:
+            raise ValueError(f"No car folders found in {path}.")
+        manifest_file = os.path.join(path, Car.__MANIFEST_FILE)
+        with open(manifest_file + '.tmp', 'w') as f:
+            json.dump({'cars': cars}, f)
+        os.replace(manifest_file + '.tmp', manifest_file)
+        return len(cars)
+
+    def build_noise_bank(self, dtype='float32', overwrite=False):
+        """
+        Writes the noise and ventilation recordings of every microphone setup at Car.fs as memory-mappable .npy files.
+
+        The noise bank is stored in the hidden '.cache' folder inside the car folder, together with an index of the modification time and size of
+        each source recording. Once built, load_noise, load_ventilation, get_noise and get_ventilation return read-only np.memmap views of the bank
+        (float32 banks) instead of decoding the recordings, so that processes working on the same car share the decoded samples through the
+        page cache of the operating system, and cropping with offset and duration does not copy any samples. int16 banks halve the size of
+        the bank; their crops are converted to float32 when loaded.
+
+        Args:
+            dtype (str, optional): The sample format of the bank, 'float32' or 'int16'. Defaults to 'float32'.
+            overwrite (bool, optional): A boolean indicating whether to rewrite entries that are already up to date. Defaults to False.
+
+        Returns:
+            int: The number of recordings that were written to the bank.
+
+        Raises:
+            ValueError: If dtype is not 'float32' or 'int16'.
+        """
+        if dtype not in ('float32', 'int16'):
+            raise ValueError(f"dtype must be 'float32' or 'int16'.")
+        store = f'bank_{self.fs}Hz'
+        store_folder = self.__store_folder(store)
+        index = dict(self.__store_index(store))
+        conditions = {'noise': self.noise_recordings, 'ventilation': self.ventilation_recordings}
+        written = 0
+        for folder, recordings in conditions.items():
+            for mic_setup in self.mic_setups:
+                for condition in recordings[mic_setup]:
+                    relative_path = os.path.join(mic_setup, folder, condition + '.npy')
+                    entry = index.get(relative_path)
+                    bank_path = os.path.join(store_folder, relative_path)
+                    source_path, _ = self.__recording_path(mic_setup, folder, condition)
+                    signature = Car.__source_signature(source_path)
+                    if (not overwrite and entry is not None and entry['dtype'] == dtype and entry['mtime'] == signature['mtime']
+                            and entry['size'] == signature['size'] and os.path.exists(bank_path)):
+                        continue
+                    x, _ = self.__load_recording(mic_setup, folder, condition, use_bank=False, dtype='float64')
+                    entry = {'source': os.path.relpath(source_path, self.__path), 'dtype': dtype, **signature}
+                    if dtype == 'int16':
+                        peak = np.max(np.abs(x))
+                        entry['scale'] = float(peak / 32767) if peak > 0 else 1.0
+                        x = np.round(x / entry['scale']).astype(np.int16)
+                    else:
+                        x = x.astype(np.float32)
+                    os.makedirs(os.path.dirname(bank_path), exist_ok=True)
+                    with open(bank_path + '.tmp', 'wb') as f:
+                        np.save(f, np.ascontiguousarray(x))
+                    os.replace(bank_path + '.tmp', bank_path)
+                    index[relative_path] = entry
+                    written += 1
+
+        if written:
+            self.__write_store_index(store, index)
+        return written
+
+
+    def build_noise_statistics(self, n_fft=512, overwrite=False):
+        """
+        Computes and stores the statistics returned by get_noise_statistics and get_ventilation_statistics for every noise and ventilation
+        recording of every microphone setup at Car.fs.
+
+        The statistics are stored in the hidden '.cache' folder inside the car folder, one file per recording and FFT size, together with an
+        index of the modification time and size of each source recording. Statistics whose source has changed are recomputed when they are
+        requested.
+
+        Args:
+            n_fft (int, optional): The FFT size of the STFT. Defaults to 512.
+            overwrite (bool, optional): A boolean indicating whether to recompute statistics that are already up to date. Defaults to False.
+
+        Returns:
+            int: The number of recordings whose statistics were computed.
+        """
+        store = f'stats_{self.fs}Hz'
+        conditions = {'noise': self.noise_recordings, 'ventilation': self.ventilation_recordings}
+        written = 0
+        for folder, recordings in conditions.items():
+            for mic_setup in self.mic_setups:
+                for condition in recordings[mic_setup]:
+                    source_path, _ = self.__recording_path(mic_setup, folder, condition)
+                    relative_path = os.path.join(mic_setup, folder, f'{condition}_{n_fft}.npz')
+                    entry = self.__store_index(store).get(relative_path)
+                    signature = Car.__source_signature(source_path)
+                    if (not overwrite and entry is not None and entry['mtime'] == signature['mtime'] and entry['size'] == signature['size']
+                            and os.path.exists(os.path.join(self.__store_folder(store), relative_path))):
+                        continue
+                    x, _ = self.__load_recording(mic_setup, folder, condition, dtype='float64')
+                    self.__write_statistics(store, relative_path, self.__compute_statistics(x, n_fft),
+                                            {'source': os.path.relpath(source_path, self.__path), 'n_fft': n_fft, **signature})
+                    written += 1
+        return written
 
-    def load_noise(self, mic_setup: str, condition):
+    def build_ir_store(self, threshold_db=-60.0, overwrite=False):
+        """
+        Writes the compacted IRs and radio IRs of every microphone setup at Car.fs, used instead of the full IRs by cars whose compact_irs is True.
+
+        The channels of an IR share a common onset and end: the samples before the onset hold less than `threshold_db` of the energy of the IR
+        summed over its channels, i.e. the silence before the direct path to the nearest microphone, and the samples after the end hold less
+        than `threshold_db` of it, i.e. the tail of the decay below the noise floor. Only the samples between them are convolved, so that the
+        inter-channel delays are kept. The compacted IRs are stored as .npy files in the hidden '.cache' folder inside the car folder, together
+        with an index of their onset, end and full length at Car.fs and of the modification time and size of each source recording.
+
+        Args:
+            threshold_db (float, optional): The energy in dB, relative to the energy of the IR, of the leading and of the trailing samples that are dropped. Defaults to -60.
+            overwrite (bool, optional): A boolean indicating whether to rewrite entries that are already up to date. Defaults to False.
+
+        Returns:
+            int: The number of IRs that were compacted and written.
+
+        Raises:
+            ValueError: If threshold_db is not negative.
+        """
+        if threshold_db >= 0:
+            raise ValueError(f"threshold_db must be negative.")
+        store = f'irs_{self.fs}Hz'
+        store_folder = self.__store_folder(store)
+        index = dict(self.__store_index(store))
+        written = 0
+        for mic_setup in self.mic_setups:
+            for folder, recordings in (('IRs', self.irs[mic_setup]), ('radio_IRs', self.radio_irs[mic_setup])):
+                for condition in recordings or []:
+                    relative_path = os.path.join(mic_setup, folder, condition + '.npy')
+                    entry = index.get(relative_path)
+                    store_path = os.path.join(store_folder, relative_path)
+                    source_path, _ = self.__recording_path(mic_setup, folder, condition)
+                    signature = Car.__source_signature(source_path)
+                    if (not overwrite and entry is not None and entry['threshold_db'] == threshold_db and entry['mtime'] == signature['mtime']
+                            and entry['size'] == signature['size'] and os.path.exists(store_path)):
+                        continue
+                    h, _ = self.__load_recording(mic_setup, folder, condition, dtype='float64', compact=False)
+                    onset, stop = Car.__ir_support(h, threshold_db)
+                    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+                    with open(store_path + '.tmp', 'wb') as f:
+                        np.save(f, np.ascontiguousarray(h[onset:stop]))
+                    os.replace(store_path + '.tmp', store_path)
+                    index[relative_path] = {'source': os.path.relpath(source_path, self.__path), **signature, 'threshold_db': threshold_db,
+                                            'onset': onset, 'stop': stop, 'length': len(h)}
+                    written += 1
+
+        if written:
+            self.__write_store_index(store, index)
+        return written
+
+    def load_noise(self, mic_setup: str, condition, offset=0.0, duration=None, dtype=None):
         """
         Loads the noise recording channels for a given microphone setup and noise condition.
 
         Args:
             mic_setup (str): The microphone setup to load the noise recording for.
             condition (str): The specific noise condition to load ("speed condition_window condition").
+            offset (float, optional): The time in seconds from which to start reading. Defaults to 0.
+            duration (float, optional): The duration in seconds to read. Defaults to None, in which case the recording is read until its end.
+            dtype (str, optional): The sample format of the noise data, except for recordings read from the noise bank, which are float32, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
 
         Returns:
             tuple: A tuple containing the noise data as a NumPy array (N_samples x M_channels) and the sampling frequency of noise recording.
 
         Raises:
             ValueError: If the given noise condition is not available for the given microphone setup.
+            ValueError: If the offset is negative or beyond the end of the recording, or if the duration is not positive.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
-        if condition not in self.noise_recordings[mic_setup]:
-            new_condition = condition + '_ver1'
-            if new_condition not in self.noise_recordings[mic_setup]:
-                raise ValueError(f"Noise condition {condition} is not available in Car.noise_recordings[mic_setup].")
-            condition = new_condition
-        
-        noise_path = os.path.join(self.__path, mic_setup, 'noise', condition + '.wav')
-        mic_range = range(8)
-        if not os.path.exists(noise_path):  # hybrid
-            noise_path = os.path.join(self.__path, 'hybrid', 'noise', condition + '.wav')
-            if mic_setup == 'array':
-                mic_range = range(4)
-            elif mic_setup == 'distributed':
-                mic_range = [2, 4, 5, 6, 7]
-
-        noise, fs_noise = sf.read(noise_path)
-        # resample
-        if fs_noise != self.fs:
-            noise = librosa.resample(noise, orig_sr=fs_noise, target_sr=self.fs, axis=0)
-            fs_noise = self.fs
-        return noise[:, mic_range], fs_noise
+        condition = self.__noise_condition(mic_setup, condition)
+        return self.__load_recording(mic_setup, 'noise', condition, offset, duration, dtype=dtype)
     
-    def load_ir(self, mic_setup: str, condition):
+    def load_ir(self, mic_setup: str, condition, dtype=None):
         """
         Loads the impulse response (IR) channels for a given microphone setup and IR condition.
         
         Args:
             mic_setup (str): The microphone setup to load the IR for.
             condition (str): The specific IR condition to load ("speaker location_window condition").
+            dtype (str, optional): The sample format of the IR data, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             tuple: A tuple containing the IR data as a NumPy array (N_samples x M_channels) and the sampling frequency of IR.
         
         Raises:
             ValueError: If the given IR condition is not available for the given microphone setup.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
-        if condition not in self.irs[mic_setup]:
+        if condition not in self.__conditions[mic_setup]['IRs']:
             raise ValueError(f"IR condition {condition} is not in Car.irs[mic_setup].")
-        ir_path = os.path.join(self.__path, mic_setup, 'IRs', condition + '.wav')
-        
-        mic_range = range(8)
-        if not os.path.exists(ir_path):  # hybrid
-            ir_path = os.path.join(self.__path, 'hybrid', 'IRs', condition + '.wav')
-            if mic_setup == 'array':
-                mic_range = range(4)
-            elif mic_setup == 'distributed':
-                mic_range = [2, 4, 5, 6, 7]
-        
-        ir, fs_ir = sf.read(ir_path)
-        # resample
-        if fs_ir != self.fs:
-            ir = librosa.resample(ir, orig_sr=fs_ir, target_sr=self.fs, axis=0)
-            fs_ir = self.fs
-        return ir[:, mic_range], fs_ir
+        return self.__load_recording(mic_setup, 'IRs', condition, dtype=dtype)
     
-    def load_radio_ir(self, mic_setup: str, condition):
+    def load_radio_ir(self, mic_setup: str, condition, dtype=None):
         """
         Loads the radio impulse response (IR) channels for a given microphone setup and radio condition.
         
         Args:
             mic_setup (str): The microphone setup to load the IR for.
             condition (str): The specific IR condition to load ("window condition").
+            dtype (str, optional): The sample format of the IR data, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             tuple: A tuple containing the IR data as a NumPy array (N_samples x M_channels) and the sampling frequency of radio IR.
@@ -588,68 +2030,129 @@ class Car:
         Raises:
             ValueError: If radio IRs are not available.
             ValueError: If the given radio IR condition is not available for the given microphone configuration.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
         if not self.radio_irs[mic_setup]:
             raise ValueError(f"Radio IRs not available for this car.")
-        if condition not in self.radio_irs[mic_setup]:
+        if condition not in self.__conditions[mic_setup]['radio_IRs']:
             raise ValueError(f"Radio IR condition {condition} is not in Car.radio_irs[condition].")
     
-        ir_path = os.path.join(self.__path, mic_setup, 'radio_IRs', condition + '.wav')    
-        mic_range = range(8)
-        if not os.path.exists(ir_path):  # hybrid
-            ir_path = os.path.join(self.__path, 'hybrid', 'radio_IRs', condition + '.wav')
-            if mic_setup == 'array':
-                mic_range = range(4)
-            elif mic_setup == 'distributed':
-                mic_range = [2, 4, 5, 6, 7]
-        
-        ir, fs_ir = sf.read(ir_path) 
-        # resample
-        if fs_ir != self.fs:
-            ir = librosa.resample(ir, orig_sr=fs_ir, target_sr=self.fs, axis=0)
-            fs_ir = self.fs   
-        return ir[:, mic_range], fs_ir
+        return self.__load_recording(mic_setup, 'radio_IRs', condition, dtype=dtype)
     
 
-    def load_ventilation(self, mic_setup: str, condition):
+    def load_ventilation(self, mic_setup: str, condition, offset=0.0, duration=None, dtype=None):
         """
         Loads the ventilation recording for a given microphone setup and condition.
         
         Args:
             mic_setup (str): The microphone setup to load the ventilation recording for.
             condition (str): The specific ventilation condition to load ("ventilation level_window condition").
+            offset (float, optional): The time in seconds from which to start reading. Defaults to 0.
+            duration (float, optional): The duration in seconds to read. Defaults to None, in which case the recording is read until its end.
+            dtype (str, optional): The sample format of the ventilation data, except for recordings read from the noise bank, which are float32, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             tuple: A tuple containing the ventilation data as a NumPy array (N_samples x M_channels) and the sampling frequency.
         
         Raises:
             ValueError: If the given ventilation condition is not available for the given microphone setup.
+            ValueError: If the offset is negative or beyond the end of the recording, or if the duration is not positive.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
-        if condition not in self.ventilation_recordings[mic_setup]:
+        if condition not in self.__conditions[mic_setup]['ventilation']:
             raise ValueError(f"Ventilation condition {condition} is not in Car.ventilation_recordings[mic_setup].")
         
-        ventilation_path = os.path.join(self.__path, mic_setup, 'ventilation', condition + '.wav')
-        mic_range = range(8)
-        ir_path = os.path.join(self.__path, mic_setup, 'ventilation', condition + '.wav')    
-        if not os.path.exists(ir_path):  # hybrid
-            ir_path = os.path.join(self.__path, 'hybrid', 'ventilation', condition + '.wav')
-            if mic_setup == 'array':
-                mic_range = range(4)
-                ventilation_path = os.path.join(self.__path, 'hybrid', 'ventilation', condition + '.wav')
-            elif mic_setup == 'distributed':
-                mic_range = [2, 4, 5, 6, 7]
-                ventilation_path = os.path.join(self.__path, 'hybrid', 'ventilation', condition + '.wav')
+        return self.__load_recording(mic_setup, 'ventilation', condition, offset, duration, dtype=dtype)
 
-        ventilation, fs_ventilation = sf.read(ventilation_path)
-        
-        # resample
-        if fs_ventilation != self.fs:
-            ventilation = librosa.resample(ventilation, orig_sr=fs_ventilation, target_sr=self.fs, axis=0)
-            fs_ventilation = self.fs
-        return ventilation[:, mic_range], fs_ventilation
 
+    def get_calibrated_speech(self, mic_setup: str, location: str, window:int, dry_speech, mics=None, calibration='time', dtype=None):
+        """
+        Convolves speech with the impulse response of a microphone setup, location, and condition, and calibrates it without applying a speech
+        effort level. `get_calibrated_speech(...).at_level(ls)` equals `get_speech(..., ls=ls)`, so that a sweep over speech effort levels
+        convolves the dry speech once.
+
+        Components are cached when the `component_cache_size` of the car is larger than 0, keyed by a digest of the dry speech, the IR
+        condition, the sampling frequency and resampler of the car, the microphones and the calibration method.
+
+        Args:
+            mic_setup (str): The microphone setup to use.
+            location (str): The location of the speaker.
+            window (int): The window condition.
+            dry_speech (numpy.ndarray or PreparedSignal): The input speech signal vector, or a PreparedSignal that keeps its spectra across IRs and cars.
+            mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
+            calibration (str, optional): The method that computes the level of the convolved speech at the reference microphone, 'time' or 'spectral' (see get_speech). Defaults to 'time'.
+            dtype (str, optional): The sample format of the convolved speech, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
+
+        Returns:
+            CalibratedComponent: The unscaled convolved speech with the offset that calibrates it.
+
+        Raises:
+            ValueError: If the microphone setup is not available.
+            ValueError: If the location is not available.
+            ValueError: If the window condition is invalid.
+            ValueError: If mics is not an integer or a list of integers.
+            ValueError: If calibration is not 'time' or 'spectral'.
+            ValueError: If a PreparedSignal is given with a sampling frequency other than Car.fs.
+            ValueError: If dtype is not 'float64' or 'float32'.
+        """
+        if mic_setup not in self.mic_setups:
+            raise ValueError(f"Microphone setup {mic_setup} is not available.")
+        if location not in self.__conditions[mic_setup]['locations']:
+            raise ValueError(f"location {location} is not available.")
+        if window not in [0, 1, 2, 3]:
+            raise ValueError(f"Window condition in condition must be 0, 1, 2 or 3.")
+        if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
+            raise ValueError(f"mics must be an integer or a list of integers.")
+        if calibration not in Car.__CALIBRATIONS:
+            raise ValueError(f"calibration must be 'time' or 'spectral'.")
+        # dry speech to mono
+        dry_speech = self.__dry_signal(dry_speech, dtype)
+        ir_condition = f'{location}_w{window}'
+        return self.__calibrated_component(mic_setup, 'IRs', ir_condition, dry_speech, mics, calibration,
+                                           lambda level: self.__speech_offset(mic_setup, ir_condition, level), dtype)
+
+    def get_calibrated_radio(self, mic_setup: str, window:int, radio_audio, mics=None, calibration='time', dtype=None):
+        """
+        Convolves radio audio with the radio impulse response of a microphone setup and condition, and calibrates it without applying an audio
+        level. `get_calibrated_radio(...).at_level(la)` equals `get_radio(..., la=la)`, so that a sweep over audio levels convolves the radio
+        audio once.
+
+        Components are cached when the `component_cache_size` of the car is larger than 0, keyed by a digest of the radio audio, the radio IR
+        condition, the sampling frequency and resampler of the car, the microphones and the calibration method.
+
+        Args:
+            mic_setup (str): The microphone setup to use.
+            window (int): The window condition.
+            radio_audio (numpy.ndarray or PreparedSignal): The input audio signal, provided by the user, or a PreparedSignal that keeps its spectra across IRs and cars.
+            mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
+            calibration (str, optional): The method that computes the level of the convolved audio at the reference microphone, 'time' or 'spectral' (see get_radio). Defaults to 'time'.
+            dtype (str, optional): The sample format of the convolved audio, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
+
+        Returns:
+            CalibratedComponent: The unscaled convolved audio with the offset that calibrates it.
+
+        Raises:
+            ValueError: If the microphone setup is not available.
+            ValueError: If the window condition is invalid.
+            ValueError: If mics is not an integer or a list of integers.
+            ValueError: If calibration is not 'time' or 'spectral'.
+            ValueError: If a PreparedSignal is given with a sampling frequency other than Car.fs.
+            ValueError: If dtype is not 'float64' or 'float32'.
+        """
+        if mic_setup not in self.mic_setups:
+            raise ValueError(f"Microphone setup {mic_setup} is not available.")
+        if window not in [0, 1, 2, 3]:
+            raise ValueError(f"Window condition must be 0, 1, 2 or 3.")
+        if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
+            raise ValueError(f"mics must be an integer or a list of integers.")
+        if calibration not in Car.__CALIBRATIONS:
+            raise ValueError(f"calibration must be 'time' or 'spectral'.")
+        # radio audio to mono
+        radio_audio = self.__dry_signal(radio_audio, dtype)
+        return self.__calibrated_component(mic_setup, 'radio_IRs', f'w{window}', radio_audio, mics, calibration,
+                                           lambda level: self.__radio_offset(mic_setup, level), dtype)
 
-    def get_speech(self, mic_setup: str, location: str, window:int, ls: float, dry_speech, mics=None, use_correction_gains=True):
+    def get_speech(self, mic_setup: str, location: str, window:int, ls: float, dry_speech, mics=None, use_correction_gains=True, calibration='time', dtype=None):
         """
         Generates the convolved speech signal with the corresponding impulse response for a given microphone setup, location, and condition.
         
@@ -658,9 +2161,11 @@ class Car:
             location (str): The location of the speaker.
             window (int): The window condition.
             ls (float): The speech effort level.
-            dry_speech (numpy.ndarray): The input speech signal vector.
+            dry_speech (numpy.ndarray or PreparedSignal): The input speech signal vector, or a PreparedSignal that keeps its spectra across IRs and cars.
             mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
             use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+            calibration (str, optional): The method that computes the level of the convolved speech at the reference microphone, 'time' (A-weighting filter applied to the convolution) or 'spectral' (from the power spectra of the dry speech and of the A-weighted reference IR, which is cached, without convolving the reference microphone). The methods agree to within 0.01 dB. Defaults to 'time'.
+            dtype (str, optional): The sample format of the speech signal, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             numpy.ndarray: The processed speech signal for the specified microphones.
@@ -671,10 +2176,13 @@ class Car:
             ValueError: If the speech effort is negative.
             ValueError: If the window condition is invalid.
             ValueError: If mics is not an integer or a list of integers.
+            ValueError: If calibration is not 'time' or 'spectral'.
+            ValueError: If a PreparedSignal is given with a sampling frequency other than Car.fs.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
         if mic_setup not in self.mic_setups:
             raise ValueError(f"Microphone setup {mic_setup} is not available.")
-        if location not in self.speaker_locations[mic_setup]:
+        if location not in self.__conditions[mic_setup]['locations']:
             raise ValueError(f"location {location} is not available.")
         if ls < 0:
             raise ValueError(f"Speech effort must be positive.")
@@ -682,47 +2190,13 @@ class Car:
             raise ValueError(f"Window condition in condition must be 0, 1, 2 or 3.")
         if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
             raise ValueError(f"mics must be an integer or a list of integers.")
-        # dry speech to mono
-        if len(dry_speech.shape) > 1:
-            dry_speech = np.mean(dry_speech, axis=1)
-        ir_condition = f'{location}_w{window}'
-        ir, _ = self.load_ir(mic_setup, ir_condition) 
-        ir_reference = ir[:, self.__reference_mic[mic_setup]]
-        convolved_reference_signal = np.convolve(dry_speech, ir_reference, mode='full')
-        convolved_reference_signal = self.__A_weighting_filter(convolved_reference_signal, self.fs)
-        # Calculate RMS
-        convolved_reference_rms = Car.__calculate_rms(convolved_reference_signal)
-        # to dB
-        convolved_reference_level = 20 * np.log10(convolved_reference_rms)
-
-        reference = self.__references[mic_setup][ir_condition] + (ls - 72.5)
-        # Calculate correction factor
-        correction_factor = reference - convolved_reference_level
-        gain = 10 ** (correction_factor / 20)
-
-        if mics is None:
-            mics = list(range(ir.shape[1]))
-        if not isinstance(mics, list):
-            mics = [mics]
-            
-        result = []
-        for mic in mics:
-            # Apply correction factor to selected microphone
-            convolved_x = np.convolve(dry_speech, ir[:, mic], mode='full')
-            # apply correction gain
-            if use_correction_gains:
-                mic_gain = gain * self.correction_gains[str(mic)]
-                convolved_x *= mic_gain
-            else:
-                convolved_x *= gain
-         
-            result.append(convolved_x)
-
-        result = np.array(result).T
-        return result
+        if calibration not in Car.__CALIBRATIONS:
+            raise ValueError(f"calibration must be 'time' or 'spectral'.")
+        with Car.__stage('get_speech'):
+            return self.get_calibrated_speech(mic_setup, location, window, dry_speech, mics, calibration, dtype).at_level(ls, use_correction_gains)
     
 
-    def get_noise(self, mic_setup:str, speed:int, window:int, version:str=None, mics=None, use_correction_gains=True):
+    def get_noise(self, mic_setup:str, speed:int, window:int, version:str=None, mics=None, use_correction_gains=True, offset=0.0, duration=None, dtype=None):
         """
         Retrieves the in-motion noise recording for a given microphone setup, condition, and microphone index.
         
@@ -733,6 +2207,9 @@ class Car:
             version (str, optional): The version of the noise recording in case there are multiple versions. Defaults to None. Must be "ver1", "ver2", etc or "coarse". 
             mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
             use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+            offset (float, optional): The time in seconds of the noise recording from which to start. Defaults to 0.
+            duration (float, optional): The duration in seconds of the noise segment. Defaults to None, in which case the recording is returned until its end.
+            dtype (str, optional): The sample format of the noise signal, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             numpy.ndarray: The processed noise signal.
@@ -740,6 +2217,8 @@ class Car:
         Raises:
             ValueError: If the specified microphone setup is not available.
             ValueError: If mics is not an integer or a list of integers.
+            ValueError: If the offset is negative or beyond the end of the recording, or if the duration is not positive.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
         if mic_setup not in self.mic_setups:
             raise ValueError(f"Microphone setup {mic_setup} is not available.")
@@ -750,22 +2229,74 @@ class Car:
         condition = f's{speed}_w{window}'
         if version:
             condition += f'_{version}'
-        noise, _ = self.load_noise(mic_setup, condition)
+        with Car.__stage('get_noise'):
+            noise, _ = self.load_noise(mic_setup, condition, offset, duration, dtype)
 
         if mics is None:
             mics = list(range(noise.shape[1]))
         if not isinstance(mics, list):
             mics = [mics]
-        noise = noise[:, mics] 
+        if mics != list(range(noise.shape[1])):
+            noise = noise[:, mics]
+        # recordings of the noise bank are float32
+        noise = noise.astype(self.__dtype_of(dtype), copy=False)
         # apply correction gain
         if use_correction_gains:
             gains = [self.correction_gains[str(mic)] for mic in mics]
-            noise = noise * np.array(gains)
+            noise = noise * np.array(gains, dtype=noise.dtype)
 
         return noise
     
 
-    def get_radio(self, mic_setup: str, window:int, la: float, radio_audio, mics=None, use_correction_gains=True):
+    def get_noise_statistics(self, mic_setup: str, speed: int, window: int, version: str=None, mics=None, use_correction_gains=True, n_fft=512):
+        """
+        Returns the spatial covariance matrices, power spectral densities and A-weighted level envelopes of a whole noise recording, e.g. for
+        MVDR or multichannel Wiener filtering and for SNR estimation, without decoding the recording once they are stored.
+
+        Statistics are read from the hidden '.cache' folder inside the car folder (see build_noise_statistics) if they are up to date with the
+        source recording. Otherwise they are computed from the recording at Car.fs and stored for the next calls and processes. If the car folder
+        is not writable, a warning is issued and the statistics are only kept in memory, so every new Car computes them again.
+
+        Args:
+            mic_setup (str): The microphone setup to use.
+            speed (int): The speed condition.
+            window (int): The window condition.
+            version (str, optional): The version of the noise recording in case there are multiple versions. Defaults to None. Must be "ver1", "ver2", etc or "coarse".
+            mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
+            use_correction_gains (bool, optional): A boolean indicating whether to apply the correction gains, as get_noise does. Defaults to True.
+            n_fft (int, optional): The FFT size of the STFT. Defaults to 512.
+
+        Returns:
+            dict: The statistics as read-only NumPy arrays:
+                'frequencies' (F_bins): the frequencies of the STFT bins, F_bins = n_fft // 2 + 1.
+                'covariance' (F_bins x M_mics x M_mics): the spatial covariance matrices, i.e. the mean of X X^H over STFT frames, with the
+                    scaling of scipy.signal.stft (Hann window, hop n_fft // 4) used by the beamforming module.
+                'psd' (F_bins x M_mics): the one-sided power spectral densities of the channels (Welch's method, units^2/Hz).
+                'levels' (K_blocks x M_mics): the A-weighted levels in dB of consecutive blocks of the recording.
+                'level_block': the duration in seconds of the blocks of 'levels' (0.125 s).
+                'frames': the number of STFT frames of the recording.
+
+        Raises:
+            ValueError: If the specified microphone setup is not available.
+            ValueError: If the window condition is invalid.
+            ValueError: If mics is not an integer or a list of integers.
+            ValueError: If the given noise condition is not available for the given microphone setup.
+        """
+        if mic_setup not in self.mic_setups:
+            raise ValueError(f"Microphone setup {mic_setup} is not available.")
+        if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
+            raise ValueError(f"mics must be an integer or a list of integers.")
+        if window not in [0, 1, 2, 3]:
+            raise ValueError(f"Window condition in condition must be 0, 1, 2 or 3.")
+        condition = f's{speed}_w{window}'
+        if version:
+            condition += f'_{version}'
+        condition = self.__noise_condition(mic_setup, condition)
+        statistics = self.__recording_statistics(mic_setup, 'noise', condition, n_fft)
+        return self.__select_statistics(statistics, mics, use_correction_gains)
+
+
+    def get_radio(self, mic_setup: str, window:int, la: float, radio_audio, mics=None, use_correction_gains=True, calibration='time', dtype=None):
         """
         Generates the radio (car-audio) signal by exploiting the measured  impulse response for a given microphone setup, condition, and microphone index.
         
@@ -773,9 +2304,11 @@ class Car:
             mic_setup (str): The microphone setup to use.
             window (int): The window condition.
             la (float): The radio audio level.
-            radio_audio (numpy.ndarray): The input audio signal, provided by the user.
+            radio_audio (numpy.ndarray or PreparedSignal): The input audio signal, provided by the user, or a PreparedSignal that keeps its spectra across IRs and cars.
             mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
             use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+            calibration (str, optional): The method that computes the level of the convolved audio at the reference microphone, 'time' (A-weighting filter applied to the convolution) or 'spectral' (from the power spectra of the radio audio and of the A-weighted reference IR, which is cached, without convolving the reference microphone). The methods agree to within 0.01 dB. Defaults to 'time'.
+            dtype (str, optional): The sample format of the audio signal, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             numpy.ndarray: The processed audio signal for the specified microphones.
@@ -785,6 +2318,9 @@ class Car:
             ValueError: If the audio level is negative.
             ValueError: If the window condition is invalid.
             ValueError: If mics is not an integer or a list of integers.
+            ValueError: If calibration is not 'time' or 'spectral'.
+            ValueError: If a PreparedSignal is given with a sampling frequency other than Car.fs.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
         if mic_setup not in self.mic_setups:
             raise ValueError(f"Microphone setup {mic_setup} is not available.")
@@ -794,54 +2330,13 @@ class Car:
             raise ValueError(f"Window condition must be 0, 1, 2 or 3.")
         if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
             raise ValueError(f"mics must be an integer or a list of integers.")
-        # radio audio to mono
-        if len(radio_audio.shape) > 1:
-            radio_audio = np.mean(radio_audio, axis=1)
-        db_fsa_to_db_a = {
-            0: 124.8755,
-            1: 124.8381,
-            2: 124.7017,
-            3: 124.9197,
-            4: 124.3212,
-            5: 126.4183,
-            6: 125.8413,
-            7: 124.9133,
-            }
-             
-        radio_ir_condition = f'w{window}'
-        radio_ir, _ = self.load_radio_ir(mic_setup, radio_ir_condition)
-        radio_ir_reference = radio_ir[:, self.__reference_mic[mic_setup]]
-
-        convolved_radio_reference_signal = np.convolve(radio_audio, radio_ir_reference, mode='full')
-        # Apply A-weighting filter
-        convolved_radio_reference_signal = self.__A_weighting_filter(convolved_radio_reference_signal, self.fs)
-        # Calculate RMS
-        convolved_radio_rms = Car.__calculate_rms(convolved_radio_reference_signal)
-        # to dB
-        convolved_radio_level = 20 * np.log10(convolved_radio_rms)
-        level = convolved_radio_level + db_fsa_to_db_a[self.__reference_mic[mic_setup]] 
-        # Calculate correction factor
-        correction_factor = la - level
-        gain = 10 ** (correction_factor / 20)
-        if mics is None:
-            mics = list(range(radio_ir.shape[1]))
-        if not isinstance(mics, list):
-            mics = [mics]
-        result = []
-        for mic in mics:
-            convolved_radio_ir = np.convolve(radio_audio, radio_ir[:, mic], mode='full')
-            # apply correction gain
-            if use_correction_gains:
-                mic_gain = gain * self.correction_gains[str(mic)]
-                convolved_radio_ir *= mic_gain
-            else:
-                convolved_radio_ir *= gain
-            result.append(convolved_radio_ir)
-        result = np.array(result).T
-        return result
+        if calibration not in Car.__CALIBRATIONS:
+            raise ValueError(f"calibration must be 'time' or 'spectral'.")
+        with Car.__stage('get_radio'):
+            return self.get_calibrated_radio(mic_setup, window, radio_audio, mics, calibration, dtype).at_level(la, use_correction_gains)
 
 
-    def get_ventilation(self, mic_setup: str, level: int, window:int, version:str=None, mics=None, use_correction_gains=True):
+    def get_ventilation(self, mic_setup: str, level: int, window:int, version:str=None, mics=None, use_correction_gains=True, offset=0.0, duration=None, dtype=None):
         """
         Retrieves and processes the ventilation recording for a given microphone setup, condition, and ventilation level.
         
@@ -852,6 +2347,9 @@ class Car:
             version (str, optional): The version of the ventilation recording in case there are multiple versions. Defaults to None. Must be "ver1", "ver2". 
             mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
             use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+            offset (float, optional): The time in seconds of the ventilation recording from which to start. Defaults to 0.
+            duration (float, optional): The duration in seconds of the ventilation segment. Defaults to None, in which case the recording is returned until its end.
+            dtype (str, optional): The sample format of the ventilation signal, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
         numpy.ndarray: The processed ventilation signal for the specified microphones.
@@ -861,6 +2359,8 @@ class Car:
             ValueError: If the ventilation level is not 1, 2, or 3.
             ValueError: If the window condition is invalid.
             ValueError: If mics is not an integer or a list of integers.
+            ValueError: If the offset is negative or beyond the end of the recording, or if the duration is not positive.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
         if mic_setup not in self.mic_setups:
             raise ValueError(f"Microphone setup {mic_setup} is not available.")
@@ -873,25 +2373,77 @@ class Car:
         ventilation_condition = f'v{level}_w{window}'
         if version:
             ventilation_condition += f'_{version}'
-        ventilation, _ = self.load_ventilation(mic_setup, ventilation_condition)
+        with Car.__stage('get_ventilation'):
+            ventilation, _ = self.load_ventilation(mic_setup, ventilation_condition, offset, duration, dtype)
         # resample to fs
         if mics is None:
             mics = list(range(ventilation.shape[1]))
         if not isinstance(mics, list):
             mics = [mics]
-        ventilation = ventilation[:, mics]
+        if mics != list(range(ventilation.shape[1])):
+            ventilation = ventilation[:, mics]
+        # recordings of the noise bank are float32
+        ventilation = ventilation.astype(self.__dtype_of(dtype), copy=False)
         # apply correction gain
         if use_correction_gains:
             gains = [self.correction_gains[str(mic)] for mic in mics]
-            ventilation = ventilation * np.array(gains)
+            ventilation = ventilation * np.array(gains, dtype=ventilation.dtype)
         return ventilation  
     
 
-    def get_components(self, mic_setup, location, speed:int, window:int, version:str=None, mics=None, ls=None, dry_speech=None, la=None, radio_audio=None, vent_level=None, use_correction_gains=True): 
+    def get_ventilation_statistics(self, mic_setup: str, level: int, window: int, version: str=None, mics=None, use_correction_gains=True, n_fft=512):
+        """
+        Returns the spatial covariance matrices, power spectral densities and A-weighted level envelopes of a whole ventilation recording,
+        stored and invalidated as those of get_noise_statistics.
+
+        Args:
+            mic_setup (str): The microphone setup to use.
+            level (int): The ventilation level (must be 1, 2, or 3).
+            window (int): The window condition.
+            version (str, optional): The version of the ventilation recording in case there are multiple versions. Defaults to None. Must be "ver1", "ver2".
+            mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
+            use_correction_gains (bool, optional): A boolean indicating whether to apply the correction gains, as get_ventilation does. Defaults to True.
+            n_fft (int, optional): The FFT size of the STFT. Defaults to 512.
+
+        Returns:
+            dict: The statistics as read-only NumPy arrays:
+                'frequencies' (F_bins): the frequencies of the STFT bins, F_bins = n_fft // 2 + 1.
+                'covariance' (F_bins x M_mics x M_mics): the spatial covariance matrices, i.e. the mean of X X^H over STFT frames, with the
+                    scaling of scipy.signal.stft (Hann window, hop n_fft // 4) used by the beamforming module.
+                'psd' (F_bins x M_mics): the one-sided power spectral densities of the channels (Welch's method, units^2/Hz).
+                'levels' (K_blocks x M_mics): the A-weighted levels in dB of consecutive blocks of the recording.
+                'level_block': the duration in seconds of the blocks of 'levels' (0.125 s).
+                'frames': the number of STFT frames of the recording.
+
+        Raises:
+            ValueError: If the microphone setup is not available.
+            ValueError: If the ventilation level is not 1, 2, or 3.
+            ValueError: If the window condition is invalid.
+            ValueError: If mics is not an integer or a list of integers.
+            ValueError: If the given ventilation condition is not available for the given microphone setup.
+        """
+        if mic_setup not in self.mic_setups:
+            raise ValueError(f"Microphone setup {mic_setup} is not available.")
+        if level not in [1, 2, 3]:
+            raise ValueError(f"Ventilation level must be 1, 2 or 3.")
+        if window not in [0, 1, 2, 3]:
+            raise ValueError(f"Window condition must be 0, 1, 2 or 3.")
+        if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
+            raise ValueError(f"mics must be an integer or a list of integers.")
+        condition = f'v{level}_w{window}'
+        if version:
+            condition += f'_{version}'
+        if condition not in self.__conditions[mic_setup]['ventilation']:
+            raise ValueError(f"Ventilation condition {condition} is not in Car.ventilation_recordings[mic_setup].")
+        statistics = self.__recording_statistics(mic_setup, 'ventilation', condition, n_fft)
+        return self.__select_statistics(statistics, mics, use_correction_gains)
+
+    def get_components(self, mic_setup, location, speed:int, window:int, version:str=None, mics=None, ls=None, dry_speech=None, la=None, radio_audio=None, vent_level=None, use_correction_gains=True, calibration='time', dtype=None): 
         """
         A wrapper function of the get_noise, get_speech, get_radio, and get_ventilation methods.
         Returns a list of components of the mixture in the following order: noise, speech, radio, ventilation.
-        Speech, radio, and ventilation are optional.
+        Speech, radio, and ventilation are optional. When prefetch_workers is larger than 0, the recordings are loaded on the prefetch
+        threads, so that the reads of the radio IR, ventilation and noise overlap the convolution of speech.
         
         Args:
             mic_setup (str): The microphone setup to use.
@@ -901,11 +2453,13 @@ class Car:
             version (str, optional): The version of the noise recording in case there are multiple versions. Defaults to None. Must be "ver1", "ver2", etc or "coarse". 
             mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
             ls (float, optional): The speech effort level. Defaults to None.
-            dry_speech (numpy.ndarray, optional): The input speech signal vector.
+            dry_speech (numpy.ndarray or PreparedSignal, optional): The input speech signal vector.
             la (float, optional): The reference audio level. Defaults to None.
-            radio_audio (numpy.ndarray, optional): The input audio signal vector.
+            radio_audio (numpy.ndarray or PreparedSignal, optional): The input audio signal vector.
             vent_level (float, optional): The ventilation level. Defaults to None.
             use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+            calibration (str, optional): The method that computes the levels of speech and radio, 'time' or 'spectral' (see get_speech). Defaults to 'time'.
+            dtype (str, optional): The sample format of the components, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
         
         Returns:
             list: A list of NumPy arrays representing the components of the mixture. Order: noise, speech (optional), radio(optional), ventilation(optional).
@@ -915,59 +2469,375 @@ class Car:
             ValueError: If the speech effort or audio level is negative.
             ValueError: If dry speech  or dry speech sampling frequency is not provided when speech effort level is specified.
             ValueError: If radio audio or radio audio sampling frequency is not provided when reference audio level is specified.
+            ValueError: If dtype is not 'float64' or 'float32'.
+        """
+        spec = dict(mic_setup=mic_setup, location=location, speed=speed, window=window, version=version, ls=ls, la=la, vent_level=vent_level,
+                    dtype=dtype)
+        with Car.__stage('get_components'), self.__prefetching([spec]):
+            l = []
+            if ls:
+                if dry_speech is None:
+                    raise ValueError("Dry speech must be provided if ls is provided.")
+                sp = self.get_speech(mic_setup=mic_setup, location=location, window=window, ls=ls, dry_speech=dry_speech, mics=mics, use_correction_gains=use_correction_gains, calibration=calibration, dtype=dtype)
+                l.append(sp)
+            if la:
+                if radio_audio is None:
+                    raise ValueError("Radio audio must be provided if la is provided.")
+                radio_audio = self.get_radio(mic_setup=mic_setup, window=window, la=la, radio_audio=radio_audio, mics=mics, use_correction_gains=use_correction_gains, calibration=calibration, dtype=dtype)
+                l.append(radio_audio)
+            if vent_level:
+                vent = self.get_ventilation(mic_setup=mic_setup, window=window, level=vent_level, mics=mics, use_correction_gains=use_correction_gains, dtype=dtype)
+                l.append(vent)
+            n = self.get_noise(mic_setup=mic_setup, speed=speed, window=window, version=version, mics=mics, use_correction_gains=use_correction_gains, dtype=dtype)
+            l.append(n)
+        
+            # s, a, v, n
+            out = Car.match_duration(l, self.fs)
+
+            # n, s, a, v
+            out = [out[-1]] + out[:-1]
+
+            return out
+
+    def get_components_batch(self, specs):
+        """
+        A batch version of get_components that synthesizes the components of many mixtures in one call.
+
+        Each IR, radio IR, noise and ventilation recording that is shared by several specs is loaded once, and each dry speech or radio audio
+        signal is convolved and calibrated once per IR, for all the microphones requested by the specs that use it. Specs that differ only in
+        ls, la, mics or use_correction_gains therefore cost little more than a gain application each. When prefetch_workers is larger than 0,
+        all the recordings of the batch are loaded on the prefetch threads while the first signals are convolved.
+
+        Args:
+            specs (list of dict): A list of dictionaries with the arguments of get_components for each mixture ("mic_setup", "location", "speed",
+                                  "window" and optionally "version", "mics", "ls", "dry_speech", "la", "radio_audio", "vent_level",
+                                  "use_correction_gains", "calibration" and "dtype"). Specs that use the same dry speech or radio audio should pass the same array object.
+
+        Returns:
+            list: A list with the output of get_components for each spec, in the order of `specs`, in the sample format of the spec (Car.dtype if it has no dtype).
+
+        Raises:
+            ValueError: If a spec has unknown or missing arguments.
+            ValueError: If the microphone setup, location, or condition of a spec is not available.
+            ValueError: If the speech effort or audio level of a spec is negative.
+            ValueError: If dry speech or radio audio is not provided when the respective level is specified.
+            ValueError: If mics is not an integer or a list of integers.
+            ValueError: If calibration is not 'time' or 'spectral'.
+            ValueError: If dtype is not 'float64' or 'float32'.
+
+        Example:
+            >>> specs = [dict(mic_setup='array', location='d50', speed=speed, window=1, ls=ls, dry_speech=dry_voice)
+            ...          for speed in (50, 100) for ls in (60, 70, 80)]
+            >>> batch = my_car.get_components_batch(specs)
+        """
+        defaults = {'version': None, 'mics': None, 'ls': None, 'dry_speech': None, 'la': None, 'radio_audio': None,
+                    'vent_level': None, 'use_correction_gains': True, 'calibration': 'time', 'dtype': None}
+        required = ('mic_setup', 'location', 'speed', 'window')
+        normalized = []
+        for spec in specs:
+            unknown = set(spec) - set(defaults) - set(required)
+            if unknown:
+                raise ValueError(f"Unknown arguments {sorted(unknown)} in spec.")
+            missing = [key for key in required if key not in spec]
+            if missing:
+                raise ValueError(f"Missing arguments {missing} in spec.")
+            spec = {**defaults, **spec}
+            if spec['mic_setup'] not in self.mic_setups:
+                raise ValueError(f"Microphone setup {spec['mic_setup']} is not available.")
+            if spec['window'] not in [0, 1, 2, 3]:
+                raise ValueError(f"Window condition must be 0, 1, 2 or 3.")
+            mics = spec['mics']
+            if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
+                raise ValueError(f"mics must be an integer or a list of integers.")
+            if mics is not None and not isinstance(mics, list):
+                spec['mics'] = [mics]
+            if spec['ls']:
+                if spec['dry_speech'] is None:
+                    raise ValueError("Dry speech must be provided if ls is provided.")
+                if spec['location'] not in self.__conditions[spec['mic_setup']]['locations']:
+                    raise ValueError(f"location {spec['location']} is not available.")
+                if spec['ls'] < 0:
+                    raise ValueError(f"Speech effort must be positive.")
+            if spec['la']:
+                if spec['radio_audio'] is None:
+                    raise ValueError("Radio audio must be provided if la is provided.")
+                if spec['la'] < 0:
+                    raise ValueError(f"Audio level must be positive.")
+            if spec['vent_level'] and spec['vent_level'] not in [1, 2, 3]:
+                raise ValueError(f"Ventilation level must be 1, 2 or 3.")
+            if spec['calibration'] not in Car.__CALIBRATIONS:
+                raise ValueError(f"calibration must be 'time' or 'spectral'.")
+            spec['dtype'] = self.__dtype_of(spec['dtype'])
+            normalized.append(spec)
+        with self.__prefetching(normalized):
+            # every recording is loaded once per batch
+            recordings = {}
+            def load(loader, mic_setup, condition, dtype):
+                key = (loader.__name__, mic_setup, condition, dtype.name)
+                if key not in recordings:
+                    recording, _ = loader(mic_setup, condition, dtype=dtype.name)
+                    # recordings of the noise bank are float32
+                    recordings[key] = recording.astype(dtype, copy=False)
+                return recordings[key]
+
+            def channels_of(spec, recording):
+                return spec['mics'] if spec['mics'] is not None else list(range(recording.shape[1]))
+
+            def gains_of(spec, channels, gain=1.0):
+                if spec['use_correction_gains']:
+                    return (gain * np.array([self.correction_gains[str(mic)] for mic in channels])).astype(spec['dtype'])
+                return spec['dtype'].type(gain)
+
+            # every signal is convolved once per IR, for the union of the microphones that the specs request
+            def convolve_groups(level_key, signal_key, loader, folder, condition_of):
+                groups = {}
+                for spec in normalized:
+                    if spec[level_key]:
+                        key = (spec['mic_setup'], condition_of(spec), id(spec[signal_key]), spec['calibration'], spec['dtype'])
+                        groups.setdefault(key, []).append(spec)
+                results = []
+                mono = {}
+                autocorrelations = {}
+                for (mic_setup, condition, signal_id, calibration, dtype), group in groups.items():
+                    h = load(loader, mic_setup, condition, dtype)
+                    if (signal_id, dtype) not in mono:
+                        mono[(signal_id, dtype)] = self.__dry_signal(group[0][signal_key], dtype)
+                    x = mono[(signal_id, dtype)]
+                    reference_mic = self.__reference_mic[mic_setup]
+                    channels = sorted(set(mic for spec in group for mic in channels_of(spec, h)) | ({reference_mic} if calibration == 'time' else set()))
+                    y = Car.__convolve(x, h[:, channels])
+                    mean_length = len(x) + self.__full_ir_length(mic_setup, folder, condition, h) - 1
+                    if calibration == 'time':
+                        results.append([group, y, channels, h, y[:, channels.index(reference_mic)], mean_length])
+                    else:
+                        # the autocorrelation of each signal is computed once for all its IRs
+                        results.append([group, y, channels, h, self.__spectral_level(x, h[:, reference_mic], (mic_setup, folder, condition), autocorrelations,
+                                                                                     mean_length), mean_length])
+                # the reference signals of the time-domain calibration are A-weighted together
+                time_results = [result for result in results if isinstance(result[4], np.ndarray)]
+                for result, level in zip(time_results, self.__A_weighted_levels([result[4] for result in time_results], [result[5] for result in time_results])):
+                    result[4] = level
+                convolved = {}
+                for group, y, channels, h, level, _ in results:
+                    for spec in group:
+                        convolved[id(spec)] = (y, channels, level, channels_of(spec, h))
+                return convolved
+
+            speech = convolve_groups('ls', 'dry_speech', self.load_ir, 'IRs', lambda spec: f"{spec['location']}_w{spec['window']}")
+            radio = convolve_groups('la', 'radio_audio', self.load_radio_ir, 'radio_IRs', lambda spec: f"w{spec['window']}")
+
+            out = []
+            for spec in normalized:
+                mic_setup = spec['mic_setup']
+                l = []
+                if spec['ls']:
+                    y, channels, level, mics = speech[id(spec)]
+                    gain = self.__speech_gain(mic_setup, f"{spec['location']}_w{spec['window']}", spec['ls'], level)
+                    l.append(y[:, [channels.index(mic) for mic in mics]] * gains_of(spec, mics, gain))
+                if spec['la']:
+                    y, channels, level, mics = radio[id(spec)]
+                    gain = self.__radio_gain(mic_setup, spec['la'], level)
+                    l.append(y[:, [channels.index(mic) for mic in mics]] * gains_of(spec, mics, gain))
+                if spec['vent_level']:
+                    ventilation = load(self.load_ventilation, mic_setup, f"v{spec['vent_level']}_w{spec['window']}", spec['dtype'])
+                    mics = channels_of(spec, ventilation)
+                    l.append(ventilation[:, mics] * gains_of(spec, mics))
+                condition = f"s{spec['speed']}_w{spec['window']}"
+                if spec['version']:
+                    condition += f"_{spec['version']}"
+                noise = load(self.load_noise, mic_setup, condition, spec['dtype'])
+                mics = channels_of(spec, noise)
+                l.append(noise[:, mics] * gains_of(spec, mics))
+
+                # s, a, v, n
+                components = Car.match_duration(l, self.fs)
+                # n, s, a, v
+                out.append([components[-1]] + components[:-1])
+            return out
+
+    def stream_components(self, mic_setup, location, speed:int, window:int, block_size:int=16000, version:str=None, mics=None, ls=None, dry_speech=None, la=None, radio_audio=None, vent_level=None, use_correction_gains=True, duration=None, mixture=False, calibration='time', dtype=None):
+        """
+        A block-wise version of get_components that yields the components of the mixture in blocks of `block_size` samples.
+
+        Speech and radio are convolved block by block, only for the samples of each block, and noise and ventilation are read
+        incrementally from the recordings. Components shorter than the mixture are looped with the same crossfading as
+        match_duration, across block boundaries. Memory usage is therefore independent of the duration of the mixture, except for
+        the dry speech and radio audio signals, which are provided by the user.
+
+        Args:
+            mic_setup (str): The microphone setup to use.
+            location (str): The location of the speaker.
+            speed (int): The speed condition.
+            window (int): The window condition.
+            block_size (int, optional): The number of samples of each block. Defaults to 16000.
+            version (str, optional): The version of the noise recording in case there are multiple versions. Defaults to None. Must be "ver1", "ver2", etc or "coarse". 
+            mics (int or list of int, optional): The microphone index or a list of microphone indices to use. Defaults to None. If mics is None, all microphones are used.
+            ls (float, optional): The speech effort level. Defaults to None.
+            dry_speech (numpy.ndarray or PreparedSignal, optional): The input speech signal vector.
+            la (float, optional): The reference audio level. Defaults to None.
+            radio_audio (numpy.ndarray or PreparedSignal, optional): The input audio signal vector.
+            vent_level (float, optional): The ventilation level. Defaults to None.
+            use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+            duration (float, optional): The duration of the mixture in seconds. Defaults to None, in which case the duration is the one of the
+                                        first component of speech, radio, ventilation and noise that is requested, as in get_components.
+            mixture (bool, optional): A boolean indicating whether to yield the sum of the components instead of the components. Defaults to False.
+            calibration (str, optional): The method that computes the levels of speech and radio, 'time' (the reference microphone is convolved
+                                         and A-weighted block by block before the first block is yielded) or 'spectral' (see get_speech). Defaults to 'time'.
+            dtype (str, optional): The sample format of the blocks, 'float64' or 'float32'. Defaults to None, in which case Car.dtype is used.
+
+        Yields:
+            list or numpy.ndarray: A list of NumPy arrays (block_size x M_channels, shorter for the last block) with the components of the mixture
+                                   in the order of get_components (noise, speech, radio, ventilation), or their sum if `mixture` is True,
+                                   in the sample format `dtype`.
+
+        Raises:
+            ValueError: If the microphone setup, location, or condition is not available.
+            ValueError: If the speech effort or audio level is negative.
+            ValueError: If dry speech is not provided when speech effort level is specified.
+            ValueError: If radio audio is not provided when reference audio level is specified.
+            ValueError: If mics is not an integer or a list of integers.
+            ValueError: If block_size or duration is not positive.
+            ValueError: If calibration is not 'time' or 'spectral'.
+            ValueError: If dtype is not 'float64' or 'float32'.
         """
-        l = []
+        if mic_setup not in self.mic_setups:
+            raise ValueError(f"Microphone setup {mic_setup} is not available.")
+        if window not in [0, 1, 2, 3]:
+            raise ValueError(f"Window condition must be 0, 1, 2 or 3.")
+        if not (isinstance(mics, list) and all(isinstance(item, int) for item in mics)) and not isinstance(mics, int) and mics is not None:
+            raise ValueError(f"mics must be an integer or a list of integers.")
+        if block_size <= 0:
+            raise ValueError(f"block_size must be positive.")
+        if duration is not None and duration <= 0:
+            raise ValueError(f"duration must be positive.")
+        if calibration not in Car.__CALIBRATIONS:
+            raise ValueError(f"calibration must be 'time' or 'spectral'.")
+        dtype = self.__dtype_of(dtype)
+        if mics is not None and not isinstance(mics, list):
+            mics = [mics]
+
+        def gains_of(channels, gain=1.0):
+            if use_correction_gains:
+                return (gain * np.array([self.correction_gains[str(mic)] for mic in channels])).astype(dtype)
+            return np.full(len(channels), gain, dtype=dtype)
+
+        def convolved_source(x, h, ir_key, gain_of_level):
+            channels = mics if mics is not None else list(range(h.shape[1]))
+            reference_mic = self.__reference_mic[mic_setup]
+            mean_length = len(x) + self.__full_ir_length(*ir_key, h) - 1
+            if calibration == 'spectral':
+                level = self.__spectral_level(x, h[:, reference_mic], ir_key, mean_length=mean_length)
+            # the segments are convolved in the time domain
+            if isinstance(x, PreparedSignal):
+                x = x.signal.astype(dtype, copy=False)
+            if calibration == 'time':
+                level = self.__streamed_level(x, h[:, [reference_mic]], block_size, mean_length)
+            h = h[:, channels]
+            return (len(x) + len(h) - 1, lambda start, stop: Car.__convolve_segment(x, h, start, stop), gains_of(channels, gain_of_level(level)))
+
+        def recording_source(folder, condition):
+            _, mic_range = self.__recording_path(mic_setup, folder, condition)
+            channels = mics if mics is not None else list(range(len(mic_range)))
+            def read(start, stop):
+                x, _ = self.__load_recording(mic_setup, folder, condition, offset=start / self.fs, duration=(stop - start) / self.fs,
+                                              dtype=dtype.name)
+                return x[:, channels]
+            return (self.__recording_length(mic_setup, folder, condition), read, gains_of(channels))
+
+        # components in the order of get_components before reordering: speech, radio, ventilation, noise
+        sources = []
         if ls:
             if dry_speech is None:
                 raise ValueError("Dry speech must be provided if ls is provided.")
-            sp = self.get_speech(mic_setup=mic_setup, location=location, window=window, ls=ls, dry_speech=dry_speech, mics=mics, use_correction_gains=use_correction_gains)
-            l.append(sp)
+            if location not in self.__conditions[mic_setup]['locations']:
+                raise ValueError(f"location {location} is not available.")
+            if ls < 0:
+                raise ValueError(f"Speech effort must be positive.")
+            dry_speech = self.__dry_signal(dry_speech, dtype)
+            ir_condition = f'{location}_w{window}'
+            ir, _ = self.load_ir(mic_setup, ir_condition, dtype=dtype.name)
+            sources.append(convolved_source(dry_speech, ir, (mic_setup, 'IRs', ir_condition), lambda level: self.__speech_gain(mic_setup, ir_condition, ls, level)))
         if la:
             if radio_audio is None:
                 raise ValueError("Radio audio must be provided if la is provided.")
-            radio_audio = self.get_radio(mic_setup=mic_setup, window=window, la=la, radio_audio=radio_audio, mics=mics, use_correction_gains=use_correction_gains)
-            l.append(radio_audio)
+            if la < 0:
+                raise ValueError(f"Audio level must be positive.")
+            radio_audio = self.__dry_signal(radio_audio, dtype)
+            radio_ir, _ = self.load_radio_ir(mic_setup, f'w{window}', dtype=dtype.name)
+            sources.append(convolved_source(radio_audio, radio_ir, (mic_setup, 'radio_IRs', f'w{window}'), lambda level: self.__radio_gain(mic_setup, la, level)))
         if vent_level:
-            vent = self.get_ventilation(mic_setup=mic_setup, window=window, level=vent_level, mics=mics, use_correction_gains=use_correction_gains)
-            l.append(vent)
-        n = self.get_noise(mic_setup=mic_setup, speed=speed, window=window, version=version, mics=mics, use_correction_gains=use_correction_gains)
-        l.append(n)
-        
-        # s, a, v, n
-        out = Car.match_duration(l, self.fs)
+            if vent_level not in [1, 2, 3]:
+                raise ValueError(f"Ventilation level must be 1, 2 or 3.")
+            ventilation_condition = f'v{vent_level}_w{window}'
+            if ventilation_condition not in self.__conditions[mic_setup]['ventilation']:
+                raise ValueError(f"Ventilation condition {ventilation_condition} is not in Car.ventilation_recordings[mic_setup].")
+            sources.append(recording_source('ventilation', ventilation_condition))
+        condition = f's{speed}_w{window}'
+        if version:
+            condition += f'_{version}'
+        sources.append(recording_source('noise', self.__noise_condition(mic_setup, condition)))
 
-        # n, s, a, v
-        out = [out[-1]] + out[:-1]
+        total_length = sources[0][0] if duration is None else int(round(duration * self.fs))
+        crossfade = int(Car.__CROSSFADE_SECONDS * self.fs)
+        sine, cos = Car.__crossfade_masks(self.fs)
+        crossfades = []
+        for length, read, _ in sources:
+            if length < total_length:
+                crossfades.append(read(0, crossfade) * sine[:, np.newaxis] + read(length - crossfade, length) * cos[:, np.newaxis])
+            else:
+                crossfades.append(None)
 
-        return out
+        for start in range(0, total_length, block_size):
+            stop = min(total_length, start + block_size)
+            blocks = []
+            for (length, read, gains), cf in zip(sources, crossfades):
+                block = np.empty((stop - start, len(gains)), dtype=dtype)
+                for out_start, out_stop, kind, source_start in Car.__loop_segments(length, total_length, crossfade, start, stop):
+                    source_stop = source_start + out_stop - out_start
+                    block[out_start - start:out_stop - start] = read(source_start, source_stop) if kind == 'signal' else cf[source_start:source_stop]
+                block *= gains
+                blocks.append(block)
+            # n, s, a, v
+            blocks = [blocks[-1]] + blocks[:-1]
+            yield np.sum(blocks, axis=0) if mixture else blocks
 
     def construct_steering_vector(self, freq, theta):
         """
         Calculates the steering vectors for a given frequency and angle for a microphone array configuration.
         The acoustic center is defined as the center of the microphone array. 0 degrees point towards the rear middle passenger,
         so that the driver is positioned at a negative angle and the front passenger at a positive angle.
+        Arrays of frequencies and angles are broadcast against each other.
         
         Args:
-            freq (float): The frequency in Hz at which to calculate the steering vectors.
-            theta (float): The angle in degrees at which to calculate the steering vectors.
+            freq (float or numpy.ndarray): The frequency in Hz at which to calculate the steering vectors.
+            theta (float or numpy.ndarray): The angle in degrees at which to calculate the steering vectors.
         
         Returns:
-            numpy.ndarray: An array of complex steering vectors for each microphone in the array.
+            numpy.ndarray: An array of complex steering vectors for each microphone in the array, along the last axis.
         """
-        mic_angles = {
-            0: np.pi,
-            1: 3*np.pi/4,
-            2: np.pi/2,
-            3: np.pi/4,
-            4: 0,
-            5: -np.pi/4,
-            6: -np.pi/2,
-            7: -3*np.pi/4,
-        }
-        c = 343
-        theta = np.deg2rad(theta)
-        result = []
-        for mic in mic_angles.keys():
-            result.append(np.exp(1j * 2 * np.pi * freq / c * np.cos(theta - mic_angles[mic])))
-        
-        return np.array(result)
+        freq = np.asarray(freq, dtype=float)[..., None]
+        theta = np.deg2rad(np.asarray(theta, dtype=float))[..., None]
+        return np.exp(1j * 2 * np.pi * freq / Car.__SPEED_OF_SOUND * np.cos(theta - Car.__ARRAY_MIC_ANGLES))
+
+    def steering_manifold(self, angles, n_fft=512, radius=1.0):
+        """
+        Calculates the steering vectors of the microphone array at every frequency bin of an STFT and every angle at once.
+        Manifolds are cached per sampling frequency, FFT size, radius and angles, and shared by all cars.
+
+        Args:
+            angles (float or list): The angles in degrees, with the convention of construct_steering_vector.
+            n_fft (int, optional): The FFT size of the STFT. The frequencies are the n_fft // 2 + 1 bins of numpy.fft.rfftfreq(n_fft, 1 / Car.fs).
+                Defaults to 512.
+            radius (float, optional): The distance in meters of the microphones from the acoustic center, which scales the phase differences
+                between microphones. Defaults to 1, which matches construct_steering_vector.
+
+        Returns:
+            numpy.ndarray: A read-only complex array of steering vectors (n_fft // 2 + 1 x N_angles x 8 microphones), shared with the cache.
+        """
+        angles = np.atleast_1d(np.asarray(angles, dtype=float))
+        key = (self.fs, n_fft, radius, angles.tobytes())
+        manifold = Car.__steering_cache.get(key)
+        if manifold is None:
+            freqs = np.fft.rfftfreq(n_fft, 1 / self.fs) * radius
+            manifold = Car.__steering_cache.put(key, self.construct_steering_vector(freqs[:, None], angles[None, :]))
+        return manifold
@@ -0,0 +1,207 @@
+"""
+STFT-domain beamformers for the circular microphone array of CAVEMOVE.
+
+The beamformers steer the array towards any number of look directions at once, using the steering manifold of the car
+(Car.steering_manifold), and run on the output of Car.get_components or Car.get_speech for the 'array' setup, either on a
+single signal (N_samples x M_mics) or on a batch of signals of the same length (B x N_samples x M_mics).
+
+Usage:
+    from Car import Car
+    import beamforming
+
+    car = Car(path='path/to/cavemove/dataset/Honda_CR-V')
+    noise, speech = car.get_components('array', 'd55', speed=100, window=0, ls=70, dry_speech=dry_voice)
+    angles = beamforming.look_directions(car, ['d55', 'fp'])
+    enhanced = beamforming.mvdr(noise + speech, car, angles, noise=noise)  # N_samples x 2 look directions
+"""
+import numpy as np
+from scipy.signal import stft, istft
+
+
+def look_directions(car, locations=None, mic_setup='array'):
+    """
+    Returns the angles of speaker locations of a car, to be used as look directions of the beamformers.
+
+    Args:
+        car (Car): The car.
+        locations (list, optional): The speaker locations. Defaults to None, in which case all the locations of Car.speaker_locations_angles are used.
+        mic_setup (str, optional): The microphone setup. Defaults to 'array'.
+
+    Returns:
+        numpy.ndarray: The angles in degrees of the locations, in the order of `locations`.
+
+    Raises:
+        ValueError: If the microphone setup has no angles or a location has no angle.
+    """
+    angles = car.speaker_locations_angles(mic_setup)
+    if angles is None:
+        raise ValueError(f"Microphone setup {mic_setup} has no speaker angles.")
+    if locations is None:
+        locations = list(angles)
+    missing = [location for location in locations if location not in angles]
+    if missing:
+        raise ValueError(f"Locations {missing} have no angle in Car.speaker_locations_angles({mic_setup!r}).")
+    return np.array([angles[location] for location in locations], dtype=float)
+
+
+def _analysis(x, fs, n_fft, hop):
+    """Returns the STFT (B x M x F x T) of a batch of multichannel signals (B x N x M)."""
+    _, _, X = stft(np.swapaxes(x, -1, -2), fs=fs, nperseg=n_fft, noverlap=n_fft - hop)
+    return X
+
+
+def _synthesis(Y, fs, n_fft, hop, length):
+    """Returns the signals (B x N x A) of the STFT of a batch of beamformer outputs (B x A x F x T)."""
+    _, y = istft(Y, fs=fs, nperseg=n_fft, noverlap=n_fft - hop)
+    y = y[..., :length]
+    if y.shape[-1] < length:
+        y = np.concatenate([y, np.zeros(y.shape[:-1] + (length - y.shape[-1],))], axis=-1)
+    return np.swapaxes(y, -1, -2)
+
+
+def _batch(x, mics):
+    """Returns a signal or a batch of signals as a batch (B x N x M), the microphones of its channels, and whether it was a single signal."""
+    x = np.asarray(x)
+    if x.ndim not in (2, 3):
+        raise ValueError(f"Signals must have the shape (N_samples x M_mics) or (B x N_samples x M_mics).")
+    single_signal = x.ndim == 2
+    x = x[None] if single_signal else x
+    if mics is None:
+        mics = list(range(x.shape[-1]))
+    if len(mics) != x.shape[-1]:
+        raise ValueError(f"Signals have {x.shape[-1]} channels but {len(mics)} mics are given.")
+    return x, mics, single_signal
+
+
+def _covariance(X, diagonal_loading):
+    """Returns the spatial covariance matrices (B x F x M x M) of a batch of STFTs (B x M x F x T), with diagonal loading relative to their mean diagonal."""
+    R = np.einsum('bmft,bkft->bfmk', X, X.conj()) / X.shape[-1]
+    M = R.shape[-1]
+    loading = diagonal_loading * np.real(np.trace(R, axis1=-2, axis2=-1)) / M
+    return R + loading[..., None, None] * np.eye(M)
+
+
+def _squeeze(y, single_signal, single_angle):
+    """Removes the batch and look direction axes of an output (B x N x A) that were added to a single signal or angle."""
+    if single_angle:
+        y = y[..., 0]
+    return y[0] if single_signal else y
+
+
+def delay_and_sum(x, car, angles, n_fft=512, hop=None, mics=None, radius=1.0):
+    """
+    Steers the array towards each angle with a delay-and-sum beamformer.
+
+    Args:
+        x (numpy.ndarray): A signal of the 'array' setup (N_samples x M_mics) or a batch of signals (B x N_samples x M_mics) at Car.fs.
+        car (Car): The car of the signals, which provides the steering manifold.
+        angles (float or list): The look directions in degrees, e.g. from look_directions.
+        n_fft (int, optional): The FFT size of the STFT. Defaults to 512.
+        hop (int, optional): The hop size of the STFT. Defaults to None, in which case n_fft // 4 is used.
+        mics (list, optional): The microphones of the array of the channels of x. Defaults to None, in which case the channels are mics 0 to M_mics - 1.
+        radius (float, optional): The radius of the array in meters, see Car.steering_manifold. Defaults to 1.
+
+    Returns:
+        numpy.ndarray: The outputs (N_samples x N_angles), or (B x N_samples x N_angles) for a batch. The angle axis is dropped for a single angle.
+
+    Raises:
+        ValueError: If x is not a signal or a batch of signals, or if its number of channels does not match mics.
+    """
+    hop = hop or n_fft // 4
+    x, mics, single_signal = _batch(x, mics)
+    manifold = car.steering_manifold(angles, n_fft=n_fft, radius=radius)[:, :, mics]
+    X = _analysis(x, car.fs, n_fft, hop)
+    # y = a^H x / M for every look direction
+    Y = np.einsum('fam,bmft->baft', manifold.conj(), X) / manifold.shape[-1]
+    return _squeeze(_synthesis(Y, car.fs, n_fft, hop, x.shape[-2]), single_signal, np.ndim(angles) == 0)
+
+
+def mvdr(x, car, angles, noise=None, n_fft=512, hop=None, mics=None, radius=1.0, diagonal_loading=1e-3, covariance=None):
+    """
+    Steers the array towards each angle with a minimum variance distortionless response (MVDR) beamformer.
+
+    The spatial covariance matrix of each frequency bin is estimated from the STFT of `noise` (e.g. the sum of the noise, radio and
+    ventilation components of Car.get_components) or, if it is not given, of x itself, averaged over frames and over the batch. The
+    covariance matrices of whole noise and ventilation recordings, stored by Car.get_noise_statistics and Car.get_ventilation_statistics,
+    can be passed instead with `covariance`, which avoids decoding and transforming the interference on every run.
+
+    Args:
+        x (numpy.ndarray): A signal of the 'array' setup (N_samples x M_mics) or a batch of signals (B x N_samples x M_mics) at Car.fs.
+        car (Car): The car of the signals, which provides the steering manifold.
+        angles (float or list): The look directions in degrees, e.g. from look_directions.
+        noise (numpy.ndarray, optional): The interference of the covariance estimate, with the shape of x except for its length. Defaults to None.
+        n_fft (int, optional): The FFT size of the STFT. Defaults to 512.
+        hop (int, optional): The hop size of the STFT. Defaults to None, in which case n_fft // 4 is used.
+        mics (list, optional): The microphones of the array of the channels of x. Defaults to None, in which case the channels are mics 0 to M_mics - 1.
+        radius (float, optional): The radius of the array in meters, see Car.steering_manifold. Defaults to 1.
+        diagonal_loading (float, optional): The loading added to the diagonal of the covariance matrices, relative to their mean diagonal. Defaults to 1e-3.
+        covariance (numpy.ndarray, optional): The covariance matrices of the interference (n_fft // 2 + 1 x M_mics x M_mics), e.g. the sum of the
+            'covariance' statistics of the noise and ventilation of the mixture for the same mics and n_fft. Takes precedence over noise. Defaults to None.
+
+    Returns:
+        numpy.ndarray: The outputs (N_samples x N_angles), or (B x N_samples x N_angles) for a batch. The angle axis is dropped for a single angle.
+
+    Raises:
+        ValueError: If x or noise is not a signal or a batch of signals, or if their number of channels does not match mics.
+        ValueError: If covariance does not match the FFT size and the channels of x.
+    """
+    hop = hop or n_fft // 4
+    x, mics, single_signal = _batch(x, mics)
+    manifold = car.steering_manifold(angles, n_fft=n_fft, radius=radius)[:, :, mics]
+    X = _analysis(x, car.fs, n_fft, hop)
+    if covariance is not None:
+        if covariance.shape != (n_fft // 2 + 1, len(mics), len(mics)):
+            raise ValueError(f"covariance must have the shape {(n_fft // 2 + 1, len(mics), len(mics))}.")
+        loading = diagonal_loading * np.real(np.trace(covariance, axis1=-2, axis2=-1)) / len(mics)
+        R = covariance + loading[:, None, None] * np.eye(len(mics))
+    else:
+        if noise is None:
+            N = X
+        else:
+            noise, _, _ = _batch(noise, mics)
+            N = _analysis(noise, car.fs, n_fft, hop)
+        R = _covariance(N, diagonal_loading).mean(axis=0)
+    # w = R^-1 a / (a^H R^-1 a) for all look directions at once
+    Ra = np.linalg.solve(R, np.swapaxes(manifold, 1, 2))
+    W = Ra / np.einsum('fma,fma->fa', np.swapaxes(manifold, 1, 2).conj(), Ra)[:, None, :]
+    Y = np.einsum('fma,bmft->baft', W.conj(), X)
+    return _squeeze(_synthesis(Y, car.fs, n_fft, hop, x.shape[-2]), single_signal, np.ndim(angles) == 0)
+
+
+def spatial_spectrum(x, car, angles, method='delay_and_sum', n_fft=512, hop=None, mics=None, radius=1.0, diagonal_loading=1e-3):
+    """
+    Computes the power of the array steered towards each angle, e.g. to estimate the direction of arrival of a speaker over a grid of
+    hundreds of angles. The power is computed from the spatial covariance matrices of the STFT, without synthesizing the beamformer
+    outputs, so its cost hardly depends on the number of angles.
+
+    Args:
+        x (numpy.ndarray): A signal of the 'array' setup (N_samples x M_mics) or a batch of signals (B x N_samples x M_mics) at Car.fs.
+        car (Car): The car of the signals, which provides the steering manifold.
+        angles (list): The angles in degrees.
+        method (str, optional): 'delay_and_sum' (steered response power, a^H R a / M^2) or 'mvdr' (Capon spectrum, 1 / a^H R^-1 a),
+            summed over frequency bins. Defaults to 'delay_and_sum'.
+        n_fft (int, optional): The FFT size of the STFT. Defaults to 512.
+        hop (int, optional): The hop size of the STFT. Defaults to None, in which case n_fft // 4 is used.
+        mics (list, optional): The microphones of the array of the channels of x. Defaults to None, in which case the channels are mics 0 to M_mics - 1.
+        radius (float, optional): The radius of the array in meters, see Car.steering_manifold. Defaults to 1.
+        diagonal_loading (float, optional): The loading added to the diagonal of the covariance matrices, relative to their mean diagonal. Defaults to 1e-3.
+
+    Returns:
+        numpy.ndarray: The power at each angle (N_angles), or (B x N_angles) for a batch.
+
+    Raises:
+        ValueError: If the method is not 'delay_and_sum' or 'mvdr'.
+        ValueError: If x is not a signal or a batch of signals, or if its number of channels does not match mics.
+    """
+    if method not in ('delay_and_sum', 'mvdr'):
+        raise ValueError(f"method must be 'delay_and_sum' or 'mvdr'.")
+    hop = hop or n_fft // 4
+    x, mics, single_signal = _batch(x, mics)
+    manifold = car.steering_manifold(angles, n_fft=n_fft, radius=radius)[:, :, mics]
+    R = _covariance(_analysis(x, car.fs, n_fft, hop), diagonal_loading if method == 'mvdr' else 0)
+    if method == 'delay_and_sum':
+        power = np.einsum('fam,bfmk,fak->ba', manifold.conj(), R, manifold).real / manifold.shape[-1] ** 2
+    else:
+        Ra = np.linalg.solve(R, np.swapaxes(manifold, 1, 2)[None])
+        power = np.sum(1 / np.einsum('fma,bfma->bfa', np.swapaxes(manifold, 1, 2).conj(), Ra).real, axis=1)
+    return power[0] if single_signal else power
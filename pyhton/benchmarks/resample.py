@@ -0,0 +1,95 @@
+"""
+Throughput and quality of the resampling backends of Car.
+
+Usage:
+    python benchmarks/resample.py --duration 10 --channels 8 --repeat 5
+
+For each available backend and each resampling path (48 kHz to 16 kHz and 16 kHz to 8 kHz), the benchmark reports:
+    import     the time to import the backend in a new interpreter, paid once by every process that resamples
+    speed      the duration of audio resampled per second of computation, as a multiple of real time (best of --repeat runs)
+    passband   the signal-to-error ratio of a sum of tones below 0.4 times the target sampling frequency, compared to the
+               same tones synthesized at the target sampling frequency
+    stopband   the attenuation of a tone at 0.6 times the target sampling frequency, which aliases if it is not filtered out
+"""
+import argparse
+import functools
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Car import Car
+
+BACKENDS = {'librosa': 'librosa', 'soxr': 'soxr', 'polyphase': 'scipy.signal'}
+PATHS = [(48000, 16000), (16000, 8000)]
+# samples discarded at both ends of the quality measurements, where the filters see the edges of the signal
+EDGE = 0.1
+
+
+def import_time(module, baseline=0.0):
+    """Returns the time in seconds to import a module in a new interpreter minus `baseline`, or None if it is not installed."""
+    start = time.perf_counter()
+    if subprocess.run([sys.executable, '-c', f'import {module}'], capture_output=True).returncode:
+        return None
+    return time.perf_counter() - start - baseline
+
+
+def tones(frequencies, fs, duration):
+    """Returns the sum of unit sines at the given frequencies with fixed phases."""
+    t = np.arange(int(duration * fs)) / fs
+    return sum(np.sin(2 * np.pi * f * t + i) for i, f in enumerate(frequencies))
+
+
+def quality(resample, fs_x, fs, duration=2.0):
+    """Returns the passband signal-to-error ratio and the stopband attenuation in dB of a resampling function."""
+    edge = int(EDGE * fs)
+    frequencies = np.linspace(0.05, 0.4, 8) * fs
+    y = resample(tones(frequencies, fs_x, duration), fs_x)
+    reference = tones(frequencies, fs, duration)
+    n = min(len(y), len(reference))
+    error = y[edge:n - edge] - reference[edge:n - edge]
+    passband = 10 * np.log10(np.sum(reference[edge:n - edge] ** 2) / np.sum(error ** 2))
+
+    y = resample(tones([0.6 * fs], fs_x, duration), fs_x)
+    stopband = -10 * np.log10(np.mean(y[edge:len(y) - edge] ** 2) / 0.5)
+    return passband, stopband
+
+
+def speed(resample, fs_x, duration, channels, repeat):
+    """Returns the duration of audio resampled per second of computation, best of `repeat` runs."""
+    x = np.random.default_rng(0).standard_normal((int(duration * fs_x), channels))
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        resample(x, fs_x)
+        best = min(best, time.perf_counter() - start)
+    return duration / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the resampling backends of Car.')
+    parser.add_argument('--duration', type=float, default=10.0, help='Duration in seconds of the resampled signal. Defaults to 10.')
+    parser.add_argument('--channels', type=int, default=8, help='Number of channels of the resampled signal. Defaults to 8.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs of each backend. Defaults to 5.')
+    args = parser.parse_args(argv)
+
+    # startup of the interpreter itself
+    baseline = import_time('sys')
+    print(f"{'backend':10s} {'path':>14s} {'import':>9s} {'speed':>10s} {'passband':>10s} {'stopband':>10s}")
+    for backend, module in BACKENDS.items():
+        startup = import_time(module, baseline)
+        if startup is None:
+            print(f'{backend:10s} not installed')
+            continue
+        for fs_x, fs in PATHS:
+            resample = functools.partial(Car.resample, fs=fs, resampler=backend)
+            passband, stopband = quality(resample, fs_x, fs)
+            realtime = speed(resample, fs_x, args.duration, args.channels, args.repeat)
+            print(f'{backend:10s} {fs_x // 1000:>5d}k -> {fs // 1000:>2d}k {startup:8.2f}s {realtime:9.0f}x {passband:8.1f}dB {stopband:8.1f}dB')
+
+
+if __name__ == '__main__':
+    main()
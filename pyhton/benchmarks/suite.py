@@ -0,0 +1,173 @@
+"""
+Benchmark suite of Car on a synthetic dataset.
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --dataset path/to/synthetic/dataset --lengths 1 5 20 --mics 1 4 8 --output results.json
+    python benchmarks/suite.py --output new.json --compare results.json --tolerance 1.25
+
+Without --dataset, a synthetic dataset (see synthetic.py) is written to a temporary folder and removed at the end. The suite times
+the construction of a car (scan and manifest), each load_* method, get_speech, get_radio, get_components and match_duration, for
+every signal length (--lengths, in seconds) and number of microphones (--mics) where they apply. Each case is run --repeat times
+after one warm-up run; recordings caches are disabled so that every run decodes and resamples its recordings.
+
+Results are written as JSON with the environment of the run and, per case, its name, parameters and the times of its runs. With
+--compare, the median of each case is compared to that of a previous result file, and the command exits with status 1 if a case
+is slower than --tolerance times its previous median.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import scipy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Car import Car
+import synthetic
+
+# car and microphone setup of the suite; Honda_CR-V has separate 'array' and 'distributed' setups with all recording folders
+CAR = 'Honda_CR-V'
+MIC_SETUP = 'array'
+
+
+def timed(function, repeat):
+    """Returns the times in seconds of `repeat` runs of `function`, after one warm-up run."""
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def environment():
+    """Returns the versions and platform of the run, and the git commit of the repository if available."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def cases(dataset, fs, lengths, mics_counts, resampler, dtype='float64'):
+    """Yields the name, parameters and function of every case of the suite."""
+    car_path = os.path.join(dataset, CAR)
+    yield 'construction', {'manifest': False}, lambda: Car(car_path, fs=fs, use_manifest=False, resampler=resampler, dtype=dtype)
+    Car.build_manifest(dataset)
+    yield 'construction', {'manifest': True}, lambda: Car(car_path, fs=fs, resampler=resampler, dtype=dtype)
+
+    car = Car(car_path, fs=fs, resampler=resampler, dtype=dtype)
+    ir = car.irs[MIC_SETUP][0]
+    location = ir.rsplit('_w', 1)[0]
+    noise = car.noise_recordings[MIC_SETUP][0]
+    ventilation = car.ventilation_recordings[MIC_SETUP][0]
+    yield 'load_ir', {}, lambda: car.load_ir(MIC_SETUP, ir)
+    yield 'load_radio_ir', {}, lambda: car.load_radio_ir(MIC_SETUP, car.radio_irs[MIC_SETUP][0])
+    yield 'load_noise', {}, lambda: car.load_noise(MIC_SETUP, noise)
+    yield 'load_ventilation', {}, lambda: car.load_ventilation(MIC_SETUP, ventilation)
+    for seconds in lengths:
+        yield 'load_noise', {'seconds': seconds}, lambda seconds=seconds: car.load_noise(MIC_SETUP, noise, offset=1.0, duration=seconds)
+
+    rng = np.random.default_rng(0)
+    speed, window = (int(value[1:]) for value in noise.split('_')[:2])
+    for seconds in lengths:
+        speech = 0.1 * rng.standard_normal(int(seconds * fs))
+        radio = 0.1 * rng.standard_normal((int(seconds * fs), 2))
+        for count in mics_counts:
+            mics = list(range(count))
+            params = {'seconds': seconds, 'mics': count}
+            yield 'get_speech', params, lambda speech=speech, mics=mics: car.get_speech(
+                MIC_SETUP, location, window=0, ls=70, dry_speech=speech, mics=mics)
+            yield 'get_radio', params, lambda radio=radio, mics=mics: car.get_radio(
+                MIC_SETUP, window=0, la=60, radio_audio=radio, mics=mics)
+            yield 'get_components', params, lambda speech=speech, radio=radio, mics=mics: car.get_components(
+                MIC_SETUP, location, speed=speed, window=window, mics=mics, ls=70, dry_speech=speech, la=60, radio_audio=radio, vent_level=2)
+            # a shorter signal that is looped (at least as long as the crossfade) and a longer one that is truncated
+            signals = [rng.standard_normal((int(seconds * fs), count)).astype(dtype),
+                       rng.standard_normal((int(max(0.6 * seconds, 1.2) * fs), count)).astype(dtype),
+                       rng.standard_normal((int(seconds * fs * 1.5), count)).astype(dtype)]
+            yield 'match_duration', params, lambda signals=signals: Car.match_duration(signals, fs)
+
+
+def compare(results, baseline, tolerance):
+    """Prints the ratio of the median of every case to that of the baseline and returns the number of cases slower than `tolerance`."""
+    previous = {(result['name'], json.dumps(result['params'], sort_keys=True)): result for result in baseline['results']}
+    regressions = 0
+    for result in results:
+        old = previous.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if old is None:
+            continue
+        ratio = result['median'] / old['median']
+        flag = ' REGRESSION' if ratio > tolerance else ''
+        regressions += bool(flag)
+        print(f"{result['name']:18s} {json.dumps(result['params']):32s} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark suite of Car on a synthetic dataset.')
+    parser.add_argument('--dataset', default=None, help='Synthetic dataset folder. Defaults to a temporary dataset written for the run.')
+    parser.add_argument('--fs', type=int, default=16000, help='Sampling frequency of the cars in Hz. Defaults to 16000.')
+    parser.add_argument('--dataset-fs', type=int, default=48000, help='Sampling frequency of the temporary dataset in Hz. Defaults to 48000.')
+    parser.add_argument('--lengths', type=float, nargs='+', default=[1.0, 5.0, 20.0], help='Signal lengths in seconds. Defaults to 1 5 20.')
+    parser.add_argument('--mics', type=int, nargs='+', default=[1, 4, 8], help='Numbers of microphones. Defaults to 1 4 8.')
+    parser.add_argument('--resampler', choices=['librosa', 'soxr', 'polyphase'], default='librosa',
+                        help='Resampler of the cars. Defaults to librosa.')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64', help='Sample format of the cars. Defaults to float64.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs of each case. Defaults to 5.')
+    parser.add_argument('--output', default=None, help='JSON file of the results.')
+    parser.add_argument('--compare', default=None, help='JSON file of previous results to compare to.')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='Slowdown ratio above which a case is a regression. Defaults to 1.25.')
+    args = parser.parse_args(argv)
+
+    dataset = args.dataset
+    temporary = dataset is None
+    if temporary:
+        dataset = tempfile.mkdtemp(prefix='cavemove_')
+        noise_seconds = max(args.lengths) + 5
+        synthetic.write_dataset(dataset, cars=[CAR], fs=args.dataset_fs, noise_seconds=noise_seconds, ventilation_seconds=noise_seconds)
+    try:
+        results = []
+        for name, params, function in cases(dataset, args.fs, args.lengths, args.mics, args.resampler, args.dtype):
+            times = timed(function, args.repeat)
+            result = {'name': name, 'params': params, 'times': times, 'median': statistics.median(times), 'min': min(times)}
+            results.append(result)
+            print(f"{name:18s} {json.dumps(params):32s} median {result['median'] * 1000:9.2f} ms  min {result['min'] * 1000:9.2f} ms", flush=True)
+    finally:
+        if temporary:
+            shutil.rmtree(dataset)
+
+    report = {'environment': environment(), 'settings': {'fs': args.fs, 'dataset': None if temporary else dataset,
+                                                         'dataset_fs': args.dataset_fs if temporary else None,
+                                                         'resampler': args.resampler, 'dtype': args.dtype, 'repeat': args.repeat},
+              'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Synthetic CAVEMOVE dataset for benchmarks and tests that cannot download the recordings.
+
+Usage:
+    python benchmarks/synthetic.py path/to/synthetic/dataset --fs 48000 --noise-seconds 30
+
+The generated tree has the layout that Car expects: one folder per car with an info.json file and, per microphone setup, the
+folders IRs, noise, radio_IRs and ventilation with multichannel wav files. The cars, microphone setups and IR conditions are those
+of the references shipped in source/references_16kHz, so that Car finds the references and correction gains of every condition.
+IRs are exponentially decaying noise after a short propagation delay, and noise and ventilation recordings are white noise at
+fixed levels; the samples are reproducible for a given seed but carry no acoustic meaning.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import soundfile as sf
+
+REFERENCES_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'source', 'references_16kHz')
+
+
+def shipped_cars():
+    """Returns the microphone setups of every car with references, by car folder name (make_model)."""
+    return {car: sorted(os.listdir(os.path.join(REFERENCES_FOLDER, car))) for car in sorted(os.listdir(REFERENCES_FOLDER))}
+
+
+def impulse_response(rng, length, channels, delay=0.002, decay=0.04, fs=48000):
+    """Returns an IR (length x channels) of white noise decaying with the time constant `decay` in seconds after `delay` seconds."""
+    t = np.arange(length) / fs
+    h = rng.standard_normal((length, channels)) * np.exp(-t / decay)[:, None] * 0.1
+    h[:int(delay * fs)] = 0
+    return h
+
+
+def write_dataset(path, cars=None, fs=48000, channels=8, ir_seconds=0.25, noise_seconds=30.0, ventilation_seconds=10.0,
+                  speeds=(0, 50, 100), versioned_speeds=(120,), seed=0, subtype='FLOAT'):
+    """
+    Writes a synthetic dataset.
+
+    Args:
+        path (str): The dataset folder, created if needed.
+        cars (list, optional): The car folder names (make_model) among those of shipped_cars. Defaults to None, in which case all are written.
+        fs (int, optional): The sampling frequency of the recordings. Defaults to 48000.
+        channels (int, optional): The number of channels of the recordings. Defaults to 8.
+        ir_seconds (float, optional): The duration of the speech and radio IRs. Defaults to 0.25.
+        noise_seconds (float, optional): The duration of the noise recordings. Defaults to 30.
+        ventilation_seconds (float, optional): The duration of the ventilation recordings. Defaults to 10.
+        speeds (tuple, optional): The speed conditions with a single noise recording per window condition. Defaults to (0, 50, 100).
+        versioned_speeds (tuple, optional): The speed conditions with two versions ('ver1' and 'ver2') per window condition. Defaults to (120,).
+        seed (int, optional): The seed of the samples. Defaults to 0.
+        subtype (str, optional): The soundfile subtype of the recordings. Defaults to 'FLOAT'.
+
+    Returns:
+        list: The paths of the car folders.
+
+    Raises:
+        ValueError: If a car has no shipped references.
+    """
+    available = shipped_cars()
+    cars = list(available) if cars is None else cars
+    unknown = [car for car in cars if car not in available]
+    if unknown:
+        raise ValueError(f"Cars {unknown} have no references in {REFERENCES_FOLDER}.")
+
+    rng = np.random.default_rng(seed)
+
+    def write(file, x):
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        sf.write(file, x, fs, subtype=subtype)
+
+    def noise(seconds, level):
+        return level * rng.standard_normal((int(seconds * fs), channels))
+
+    car_paths = []
+    for car in cars:
+        car_path = os.path.join(path, car)
+        make, model = car.split('_', 1)
+        os.makedirs(car_path, exist_ok=True)
+        with open(os.path.join(car_path, 'info.json'), 'w') as f:
+            json.dump({'make': make, 'model': model, 'year': 2024}, f, indent=1)
+        for mic_setup in available[car]:
+            setup_path = os.path.join(car_path, mic_setup)
+            with open(os.path.join(REFERENCES_FOLDER, car, mic_setup, 'reference.json'), 'r') as f:
+                ir_conditions = list(json.load(f))
+            for condition in ir_conditions:
+                write(os.path.join(setup_path, 'IRs', condition + '.wav'), impulse_response(rng, int(ir_seconds * fs), channels, fs=fs))
+            for window in range(4):
+                write(os.path.join(setup_path, 'radio_IRs', f'w{window}.wav'), impulse_response(rng, int(ir_seconds * fs), channels, fs=fs))
+                for speed in speeds:
+                    write(os.path.join(setup_path, 'noise', f's{speed}_w{window}.wav'), noise(noise_seconds, 0.01 * (1 + speed / 50)))
+                for speed in versioned_speeds:
+                    for version in ('ver1', 'ver2'):
+                        write(os.path.join(setup_path, 'noise', f's{speed}_w{window}_{version}.wav'), noise(noise_seconds, 0.01 * (1 + speed / 50)))
+                for level in (1, 2, 3):
+                    write(os.path.join(setup_path, 'ventilation', f'v{level}_w{window}.wav'), noise(ventilation_seconds, 0.005 * level))
+        car_paths.append(car_path)
+    return car_paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic CAVEMOVE dataset.')
+    parser.add_argument('path', help='Output dataset folder.')
+    parser.add_argument('--cars', nargs='*', default=None, help='Car folder names (make_model). Defaults to all cars with shipped references.')
+    parser.add_argument('--fs', type=int, default=48000, help='Sampling frequency of the recordings in Hz. Defaults to 48000.')
+    parser.add_argument('--channels', type=int, default=8, help='Number of channels of the recordings. Defaults to 8.')
+    parser.add_argument('--ir-seconds', type=float, default=0.25, help='Duration of the IRs in seconds. Defaults to 0.25.')
+    parser.add_argument('--noise-seconds', type=float, default=30.0, help='Duration of the noise recordings in seconds. Defaults to 30.')
+    parser.add_argument('--ventilation-seconds', type=float, default=10.0, help='Duration of the ventilation recordings in seconds. Defaults to 10.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the samples. Defaults to 0.')
+    args = parser.parse_args(argv)
+
+    car_paths = write_dataset(args.path, cars=args.cars, fs=args.fs, channels=args.channels, ir_seconds=args.ir_seconds,
+                              noise_seconds=args.noise_seconds, ventilation_seconds=args.ventilation_seconds, seed=args.seed)
+    print(f'{len(car_paths)} synthetic cars written to {args.path}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+A least-recently-used cache bounded by the bytes it holds, shared by the recordings, components and steering caches of Car.
+"""
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+
+class _LRUCache:
+    """
+    A least-recently-used cache of numpy arrays (or other objects that report their size in `nbytes`) bounded by the total number of bytes it holds.
+    The cache can be shared by threads, e.g. the prefetch threads of a Car.
+
+    Args:
+    max_bytes (int): The memory budget of the cache in bytes. A budget of 0 disables caching.
+    """
+    def __init__(self, max_bytes=0):
+        self.hits = 0
+        self.misses = 0
+        self.__bytes = 0
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+        self.max_bytes = max_bytes
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_LRUCache__lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, key):
+        return key in self.__items
+
+    @property
+    def max_bytes(self):
+        """Returns the memory budget of the cache in bytes."""
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        """Sets the memory budget of the cache in bytes, evicting the least recently used entries that exceed it."""
+        if value < 0:
+            raise ValueError('The cache budget must be non-negative.')
+        with self.__lock:
+            self.__max_bytes = value
+            self.__evict()
+
+    @property
+    def nbytes(self):
+        """Returns the number of bytes currently held by the cache."""
+        return self.__bytes
+
+    def get(self, key):
+        """Returns the cached value for `key` (marking it as most recently used) or None on a miss."""
+        with self.__lock:
+            if key in self.__items:
+                self.__items.move_to_end(key)
+                self.hits += 1
+                return self.__items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """
+        Stores `value` under `key` and evicts the least recently used entries that exceed the budget.
+        Values are numpy arrays, which are made read-only, or objects with an `nbytes` attribute.
+        """
+        if value.nbytes > self.max_bytes:
+            return value
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        with self.__lock:
+            if key in self.__items:
+                self.__bytes -= self.__items.pop(key).nbytes
+            self.__items[key] = value
+            self.__bytes += value.nbytes
+            self.__evict()
+        return value
+
+    def __evict(self):
+        """Removes least recently used entries until the cache fits its budget. The caller holds the lock."""
+        while self.__bytes > self.__max_bytes:
+            _, evicted = self.__items.popitem(last=False)
+            self.__bytes -= evicted.nbytes
+
+    def clear(self):
+        """Removes all entries and resets the hit and miss counters."""
+        with self.__lock:
+            self.__items.clear()
+            self.__bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Returns a dictionary with the hit and miss counters and the memory usage of the cache."""
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.__items),
+                    'bytes': self.__bytes, 'max_bytes': self.max_bytes}
@@ -0,0 +1,300 @@
+"""
+Bulk synthesis of CAVEMOVE mixtures from a manifest.
+
+Usage:
+    python generate.py manifest.csv --dataset path/to/cavemove/dataset --out path/to/output --workers 8
+
+The manifest is a CSV file (or a JSON lines file with the same keys) with one mixture per row and the columns:
+    id (optional), car, mic_setup, location, speed, window, version, ls, la, vent_level, speech, radio, mics
+Empty cells are treated as missing values and `mics` is a list of microphone indices separated by spaces (e.g. "0 1 2 3").
+`speech` and `radio` are paths to the dry speech and radio audio files.
+
+For each item, the mixture and its components are written as multichannel wav files in a folder named after the item id,
+together with a meta.json file with the condition of the item. Items whose meta.json exists are skipped, so an interrupted
+run can be resumed by running the same command again. The noise segment of each item starts at a random offset of the
+noise recording, drawn from a generator seeded by the base seed and the item id, so that reruns are reproducible.
+
+With --profile, every process records the stages of its cars (see Car.enable_profiler) and writes them when it exits to the
+given folder, as a snapshot (worker_<pid>.json) and as Chrome trace events (worker_<pid>.trace.json).
+
+With --shards flac or --shards npy, the items are packed into tar shards of about --shard-size MiB in the output folder instead
+(see shards.py): the processes synthesize the items and the main process writes them on a background thread, with the
+condition of each item as its metadata. Items whose id is in an index of the folder are skipped, and each run writes its shards
+under a new prefix (part000, part001, ...). The FLAC samples are 24-bit with --subtype PCM_24 and 16-bit otherwise.
+"""
+import argparse
+import csv
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+
+import numpy as np
+import soundfile as sf
+
+from Car import Car
+from profiler import Profiler
+from shards import ShardReader, ShardWriter
+
+# conversion of the manifest columns
+COLUMNS = {
+    'id': str,
+    'car': str,
+    'mic_setup': str,
+    'location': str,
+    'speed': int,
+    'window': int,
+    'version': str,
+    'ls': float,
+    'la': float,
+    'vent_level': int,
+    'speech': str,
+    'radio': str,
+    'mics': lambda value: [int(mic) for mic in value.split()],
+}
+
+# cars of the worker process, built once per car
+_cars = {}
+_settings = {}
+
+
+def read_manifest(path):
+    """
+    Reads a manifest of mixtures.
+
+    Args:
+        path (str): The path to a CSV or JSON lines (.jsonl) manifest.
+
+    Returns:
+        list: A list of dictionaries, one per mixture, with the values of the manifest converted to their types.
+
+    Raises:
+        ValueError: If the manifest has unknown columns or an item misses one of the car, mic_setup, speed and window columns.
+    """
+    with open(path, 'r', newline='') as f:
+        if path.endswith('.jsonl'):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    items = []
+    for i, row in enumerate(rows):
+        unknown = set(row) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns {sorted(unknown)} in manifest.")
+        item = {key: COLUMNS[key](value) if isinstance(value, str) else value
+                for key, value in row.items() if value not in (None, '')}
+        missing = [key for key in ('car', 'mic_setup', 'speed', 'window') if key not in item]
+        if missing:
+            raise ValueError(f"Missing values {missing} in row {i} of the manifest.")
+        item.setdefault('id', f'{i:08d}')
+        items.append(item)
+    return items
+
+
+def item_seed(seed, item_id):
+    """Returns the seed of an item, derived from the base seed and the item id so that it does not depend on the order of the items."""
+    return np.random.SeedSequence([seed, zlib.crc32(str(item_id).encode())])
+
+
+def _init_worker(dataset, fs, cache_size, seed, subtype, resampler, profile=None, dtype='float64', prefetch_workers=0):
+    """Stores the settings of the run in the worker process, and enables its profiler if `profile` is a folder."""
+    _cars.clear()
+    _settings.update(dataset=dataset, fs=fs, cache_size=cache_size, seed=seed, subtype=subtype, resampler=resampler, dtype=dtype,
+                     prefetch_workers=prefetch_workers)
+    if profile is not None:
+        profiler = Car.enable_profiler(Profiler(trace=True))
+        Finalize(profiler, _write_profile, args=(profiler, profile), exitpriority=10)
+
+
+def _write_profile(profiler, folder):
+    """Writes the snapshot and the trace of the profiler of the worker process when it exits."""
+    os.makedirs(folder, exist_ok=True)
+    profiler.to_json(os.path.join(folder, f'worker_{os.getpid()}.json'))
+    profiler.chrome_trace(os.path.join(folder, f'worker_{os.getpid()}.trace.json'))
+
+
+def _car(name):
+    """Returns the car of the worker process with the given folder name, building it on first use."""
+    if name not in _cars:
+        _cars[name] = Car(path=os.path.join(_settings['dataset'], name), fs=_settings['fs'], cache_size=_settings['cache_size'],
+                          resampler=_settings['resampler'], dtype=_settings['dtype'], prefetch_workers=_settings['prefetch_workers'])
+    return _cars[name]
+
+
+def _read_audio(path, car):
+    """Reads a mono audio file at the sampling frequency of `car`, resampled with its resampler."""
+    x, fs_x = sf.read(path)
+    if len(x.shape) > 1:
+        x = np.mean(x, axis=1)
+    return Car.resample(x, fs_x, car.fs, car.resampler)
+
+
+def render_item(item):
+    """
+    Synthesizes one mixture.
+
+    Args:
+        item (dict): The mixture, as returned by read_manifest.
+
+    Returns:
+        tuple: The item id, the components of the mixture by name, matched in duration, and the condition of the item.
+    """
+    car = _car(item['car'])
+    fs = car.fs
+    rng = np.random.default_rng(item_seed(_settings['seed'], item['id']))
+    mic_setup, window, mics = item['mic_setup'], item['window'], item.get('mics')
+    # the recordings of the item are read while the speech file is read and convolved, but for the noise, of which only a segment is read
+    car.prefetch([{key: item.get(key) for key in ('mic_setup', 'location', 'window', 'ls', 'la', 'vent_level')}])
+
+    components = {}
+    if item.get('ls'):
+        if 'speech' not in item:
+            raise ValueError(f"Item {item['id']} has ls but no speech file.")
+        components['speech'] = car.get_speech(mic_setup=mic_setup, location=item['location'], window=window, ls=item['ls'],
+                                              dry_speech=_read_audio(item['speech'], car), mics=mics)
+    if item.get('la'):
+        if 'radio' not in item:
+            raise ValueError(f"Item {item['id']} has la but no radio file.")
+        components['radio'] = car.get_radio(mic_setup=mic_setup, window=window, la=item['la'],
+                                            radio_audio=_read_audio(item['radio'], car), mics=mics)
+    if item.get('vent_level'):
+        components['ventilation'] = car.get_ventilation(mic_setup=mic_setup, level=item['vent_level'], window=window, mics=mics)
+
+    # read a segment of the noise at a random offset when it is longer than the mixture
+    noise_condition = dict(speed=item['speed'], window=window, version=item.get('version'))
+    offset, duration = 0, None
+    if components:
+        length = len(next(iter(components.values())))
+        available = int(round(car.recording_duration('noise', mic_setup, **noise_condition) * fs))
+        if available > length:
+            offset = int(rng.integers(available - length + 1))
+            duration = length / fs
+    components['noise'] = car.get_noise(mic_setup=mic_setup, **noise_condition, mics=mics, offset=offset / fs, duration=duration)
+
+    names = list(components)
+    matched = dict(zip(names, Car.match_duration([components[name] for name in names], fs)))
+    return item['id'], matched, {**item, 'fs': fs, 'noise_offset': offset}
+
+
+def generate_item(item, out):
+    """
+    Synthesizes one mixture and writes it with its components.
+
+    Args:
+        item (dict): The mixture, as returned by read_manifest.
+        out (str): The output folder of the run.
+
+    Returns:
+        tuple: The item id and a boolean that is False if the item was already generated and has been skipped.
+    """
+    folder = os.path.join(out, item['id'])
+    if os.path.exists(os.path.join(folder, 'meta.json')):
+        return item['id'], False
+
+    _, matched, meta = render_item(item)
+    fs = meta['fs']
+    os.makedirs(folder, exist_ok=True)
+    sf.write(os.path.join(folder, 'mix.wav'), np.sum(list(matched.values()), axis=0), fs, subtype=_settings['subtype'])
+    for name, x in matched.items():
+        sf.write(os.path.join(folder, name + '.wav'), x, fs, subtype=_settings['subtype'])
+    with open(os.path.join(folder, 'meta.json.tmp'), 'w') as f:
+        json.dump(meta, f, indent=1)
+    # the item is complete once its meta.json exists
+    os.replace(os.path.join(folder, 'meta.json.tmp'), os.path.join(folder, 'meta.json'))
+    return item['id'], True
+
+
+def generate(items, dataset, out, fs=16000, workers=None, seed=0, cache_size=512 * 2**20, subtype='FLOAT', chunksize=4,
+             resampler='librosa', profile=None, dtype='float64', shards=None, shard_size=2**30, prefetch_workers=0):
+    """
+    Synthesizes the mixtures of a manifest on a pool of processes.
+
+    Each process builds one Car per car of the manifest and keeps its recordings cache across items, so items are sorted by car,
+    microphone setup and condition to increase cache hits. The output does not depend on the number of processes.
+
+    Args:
+        items (list): The mixtures, as returned by read_manifest.
+        dataset (str): The path to the dataset folder.
+        out (str): The output folder.
+        fs (int, optional): The sampling frequency of the mixtures. Defaults to 16000.
+        workers (int, optional): The number of processes. Defaults to None, in which case the number of CPUs is used.
+        seed (int, optional): The base seed of the run. Defaults to 0.
+        cache_size (int, optional): The recordings cache size in bytes of each Car. Defaults to 512 MiB.
+        subtype (str, optional): The soundfile subtype of the written files. Defaults to 'FLOAT'.
+        chunksize (int, optional): The number of items sent to a process at once. Defaults to 4.
+        resampler (str, optional): The resampler of the cars and of the speech and radio files. Defaults to 'librosa'.
+        profile (str, optional): The folder of the profiles of the processes. Defaults to None, in which case the processes are not profiled.
+        dtype (str, optional): The sample format of the processing, 'float64' or 'float32' (see Car). Defaults to 'float64'.
+        shards (str, optional): The format of the shards, 'flac' or 'npy' (see ShardWriter). Defaults to None, in which case every
+            item is written to its own folder.
+        shard_size (int, optional): The size in bytes above which a shard is closed. Defaults to 1 GiB.
+        prefetch_workers (int, optional): The number of threads of each process that read the recordings of an item ahead of their
+            use (see Car.prefetch). Defaults to 0.
+
+    Returns:
+        int: The number of items that were generated (excluding those that were already complete).
+    """
+    os.makedirs(out, exist_ok=True)
+    items = sorted(items, key=lambda item: (item['car'], item['mic_setup'], item.get('location', ''), item['speed'], item['window']))
+    generated = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dataset, fs, cache_size, seed, subtype, resampler, profile, dtype, prefetch_workers)) as executor:
+        if shards is not None:
+            return _generate_shards(executor, items, out, fs, shards, shard_size, subtype, chunksize)
+        for i, (item_id, done) in enumerate(executor.map(generate_item, items, [out] * len(items), chunksize=chunksize)):
+            generated += done
+            if (i + 1) % 100 == 0 or i + 1 == len(items):
+                print(f'{i + 1}/{len(items)} items ({generated} generated)', flush=True)
+    return generated
+
+
+def _generate_shards(executor, items, out, fs, format, shard_size, subtype, chunksize):
+    """Synthesizes the items that are not in the shards of `out` on the processes of `executor` and packs them into new shards."""
+    indexes = [name for name in os.listdir(out) if name.endswith('.index.jsonl')]
+    done = set(ShardReader(out).keys) if indexes else set()
+    todo = [item for item in items if item['id'] not in done]
+    print(f'{len(items) - len(todo)}/{len(items)} items already in shards', flush=True)
+    if not todo:
+        return 0
+    with ShardWriter(out, fs=fs, format=format, shard_size=shard_size, prefix=f'part{len(indexes):03d}',
+                     subtype='PCM_24' if subtype == 'PCM_24' else 'PCM_16') as writer:
+        for i, (item_id, matched, meta) in enumerate(executor.map(render_item, todo, chunksize=chunksize)):
+            writer.write(item_id, matched, meta=meta)
+            if (i + 1) % 100 == 0 or i + 1 == len(todo):
+                print(f'{i + 1}/{len(todo)} items generated', flush=True)
+    return len(todo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Synthesize CAVEMOVE mixtures from a manifest.')
+    parser.add_argument('manifest', help='Path to the CSV or JSON lines manifest.')
+    parser.add_argument('--dataset', required=True, help='Path to the dataset folder.')
+    parser.add_argument('--out', required=True, help='Output folder.')
+    parser.add_argument('--fs', type=int, default=16000, help='Sampling frequency in Hz. Defaults to 16000.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes. Defaults to the number of CPUs.')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed of the run. Defaults to 0.')
+    parser.add_argument('--cache-size', type=int, default=512, help='Recordings cache size of each car in MiB. Defaults to 512.')
+    parser.add_argument('--subtype', default='FLOAT', help='Soundfile subtype of the written files. Defaults to FLOAT.')
+    parser.add_argument('--resampler', choices=['librosa', 'soxr', 'polyphase', 'none'], default='librosa',
+                        help='Resampler of the recordings and audio files that are not at --fs. Defaults to librosa.')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                        help='Sample format of the processing; float32 halves memory and memory traffic. Defaults to float64.')
+    parser.add_argument('--prefetch-workers', type=int, default=0,
+                        help='Threads of each process that read the recordings of an item while its speech is convolved. Defaults to 0.')
+    parser.add_argument('--shards', choices=['flac', 'npy'], default=None,
+                        help='Pack the items into tar shards of FLAC or int16 npy files instead of one folder per item. Defaults to folders.')
+    parser.add_argument('--shard-size', type=int, default=1024, help='Size of the shards in MiB. Defaults to 1024.')
+    parser.add_argument('--profile', default=None,
+                        help='Folder of the profiles of the Car stages of every process (JSON and Chrome trace). Defaults to no profiling.')
+    args = parser.parse_args(argv)
+
+    items = read_manifest(args.manifest)
+    generate(items, args.dataset, args.out, fs=args.fs, workers=args.workers, seed=args.seed,
+             cache_size=args.cache_size * 2**20, subtype=args.subtype, resampler=args.resampler, profile=args.profile, dtype=args.dtype,
+             shards=args.shards, shard_size=args.shard_size * 2**20, prefetch_workers=args.prefetch_workers)
+
+
+if __name__ == '__main__':
+    main()
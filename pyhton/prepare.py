@@ -0,0 +1,194 @@
+"""
+Preprocessing commands for a downloaded CAVEMOVE dataset.
+
+Usage:
+    python prepare.py resample path/to/cavemove/dataset --fs 8000
+    python prepare.py noise-bank path/to/cavemove/dataset --fs 16000 --dtype int16
+    python prepare.py manifest path/to/cavemove/dataset
+    python prepare.py stats path/to/cavemove/dataset --fs 16000 --n-fft 512
+    python prepare.py compact-irs path/to/cavemove/dataset --fs 16000 --threshold-db -60 --report compaction.json
+
+The path may point either to the dataset folder (all cars are processed) or to the folder of a single car, except for the
+manifest, which is built for the whole dataset folder.
+
+compact-irs writes the IR store read by cars with compact_irs=True and compares every compacted IR to the full IR: the time of
+get_calibrated_speech (or get_calibrated_radio) on a test signal, white noise or the --speech file, and the difference of the
+calibrated levels in dB. The summary of every car is printed and the comparison of every IR is written to --report.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import soundfile as sf
+
+from Car import Car
+
+
+def find_cars(path):
+    """
+    Returns the folders of the cars found in `path`.
+
+    Args:
+        path (str): The path to the dataset folder or to the folder of a single car.
+
+    Returns:
+        list: A list of car folders, i.e. folders that contain an info.json file.
+    """
+    if os.path.exists(os.path.join(path, 'info.json')):
+        return [path]
+    return sorted(os.path.join(path, f) for f in os.listdir(path) if os.path.exists(os.path.join(path, f, 'info.json')))
+
+
+def resample(args):
+    """Materializes resampled copies of the recordings of every car at the requested sampling frequency."""
+    for car_path in find_cars(args.path):
+        car = Car(path=car_path, fs=args.fs, resampler=args.resampler)
+        written = car.materialize(overwrite=args.overwrite)
+        print(f'{car}: {written} recordings resampled to {args.fs} Hz.')
+
+
+def noise_bank(args):
+    """Writes the memory-mappable noise bank of every car at the requested sampling frequency."""
+    for car_path in find_cars(args.path):
+        car = Car(path=car_path, fs=args.fs, resampler=args.resampler)
+        written = car.build_noise_bank(dtype=args.dtype, overwrite=args.overwrite)
+        print(f'{car}: {written} noise and ventilation recordings written to the {args.dtype} noise bank at {args.fs} Hz.')
+
+
+def stats(args):
+    """Computes the noise and ventilation statistics of every car at the requested sampling frequency and FFT size."""
+    for car_path in find_cars(args.path):
+        car = Car(path=car_path, fs=args.fs, resampler=args.resampler)
+        written = car.build_noise_statistics(n_fft=args.n_fft, overwrite=args.overwrite)
+        print(f'{car}: statistics of {written} noise and ventilation recordings computed at {args.fs} Hz with n_fft={args.n_fft}.')
+
+
+def compare_irs(car, x, repeat=3):
+    """
+    Compares the compacted IRs of the IR store of a car to the full IRs.
+
+    Args:
+        car (Car): The car, with a recordings cache so that the timed calls do not decode the IRs.
+        x (numpy.ndarray): The test signal at Car.fs.
+        repeat (int, optional): The number of timed calls of each IR, of which the fastest is kept. Defaults to 3.
+
+    Returns:
+        list: A dictionary per IR with its microphone setup, folder, condition, full and compacted lengths in samples, the times in seconds of the calls
+            with the full and the compacted IR, and the difference in dB of their calibrated levels.
+    """
+    compact_irs = car.compact_irs
+    rows = []
+    for mic_setup in car.mic_setups:
+        calls = [('IRs', condition, lambda condition=condition: car.get_calibrated_speech(
+                      mic_setup, condition.rsplit('_w', 1)[0], int(condition.rsplit('_w', 1)[1]), x)) for condition in car.irs[mic_setup]]
+        calls += [('radio_IRs', condition, lambda condition=condition: car.get_calibrated_radio(mic_setup, int(condition[1:]), x))
+                  for condition in car.radio_irs[mic_setup] or []]
+        for folder, condition, call in calls:
+            loader = car.load_ir if folder == 'IRs' else car.load_radio_ir
+            row = {'mic_setup': mic_setup, 'folder': folder, 'condition': condition}
+            for mode in (False, True):
+                car.compact_irs = mode
+                row['compact_length' if mode else 'length'] = len(loader(mic_setup, condition)[0])
+                component = call()
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    call()
+                    times.append(time.perf_counter() - start)
+                row['compact_time' if mode else 'time'] = min(times)
+                row['compact_offset' if mode else 'offset'] = component.offset
+            row['level_error_db'] = row['compact_offset'] - row['offset']
+            rows.append(row)
+    car.compact_irs = compact_irs
+    return rows
+
+
+def compact_irs(args):
+    """Writes the compacted IRs of every car and reports the speedup of the convolutions and the error of the calibrated levels."""
+    report = []
+    for car_path in find_cars(args.path):
+        car = Car(path=car_path, fs=args.fs, resampler=args.resampler, cache_size=1024 * 2**20)
+        written = car.build_ir_store(threshold_db=args.threshold_db, overwrite=args.overwrite)
+        if args.speech:
+            x, fs_x = sf.read(args.speech)
+            x = Car.resample(x if x.ndim == 1 else np.mean(x, axis=1), fs_x, car.fs, car.resampler)
+        else:
+            x = 0.1 * np.random.default_rng(0).standard_normal(int(args.seconds * car.fs))
+        rows = compare_irs(car, x, args.repeat)
+        for row in rows:
+            row['car'] = os.path.basename(os.path.normpath(car_path))
+        report += rows
+        if rows:
+            length = np.mean([row['length'] for row in rows]) / car.fs
+            compact_length = np.mean([row['compact_length'] for row in rows]) / car.fs
+            speedup = sum(row['time'] for row in rows) / sum(row['compact_time'] for row in rows)
+            error = max(abs(row['level_error_db']) for row in rows)
+            print(f'{car}: {written} IRs compacted at {args.fs} Hz with a threshold of {args.threshold_db} dB; mean length {length:.3f} s -> '
+                  f'{compact_length:.3f} s, convolution speedup {speedup:.2f}x, maximum level error {error:.2e} dB.')
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=1)
+
+
+def manifest(args):
+    """Writes the manifest of the dataset folder, read by Car at construction instead of scanning the car folders."""
+    cars = Car.build_manifest(args.path)
+    print(f'Manifest of {cars} cars written to {args.path}.')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Preprocessing commands for the CAVEMOVE dataset.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    resample_parser = subparsers.add_parser('resample', help='Write resampled copies of the recordings used automatically by Car.')
+    resample_parser.add_argument('path', help='Path to the dataset folder or to the folder of a single car.')
+    resample_parser.add_argument('--fs', type=int, required=True, help='Target sampling frequency in Hz.')
+    resample_parser.add_argument('--overwrite', action='store_true', help='Rewrite copies that are already up to date.')
+    resample_parser.add_argument('--resampler', choices=['librosa', 'soxr', 'polyphase'], default='librosa',
+                                 help='Resampling backend. Defaults to librosa.')
+    resample_parser.set_defaults(func=resample)
+
+    bank_parser = subparsers.add_parser('noise-bank', help='Write the memory-mappable noise bank used automatically by Car.')
+    bank_parser.add_argument('path', help='Path to the dataset folder or to the folder of a single car.')
+    bank_parser.add_argument('--fs', type=int, default=16000, help='Sampling frequency of the bank in Hz. Defaults to 16000.')
+    bank_parser.add_argument('--dtype', choices=['float32', 'int16'], default='float32', help='Sample format of the bank. Defaults to float32.')
+    bank_parser.add_argument('--overwrite', action='store_true', help='Rewrite entries that are already up to date.')
+    bank_parser.add_argument('--resampler', choices=['librosa', 'soxr', 'polyphase'], default='librosa',
+                             help='Resampling backend of the recordings that are not at --fs. Defaults to librosa.')
+    bank_parser.set_defaults(func=noise_bank)
+
+    stats_parser = subparsers.add_parser('stats', help='Compute the noise statistics returned by Car.get_noise_statistics.')
+    stats_parser.add_argument('path', help='Path to the dataset folder or to the folder of a single car.')
+    stats_parser.add_argument('--fs', type=int, default=16000, help='Sampling frequency of the statistics in Hz. Defaults to 16000.')
+    stats_parser.add_argument('--n-fft', type=int, default=512, help='FFT size of the STFT. Defaults to 512.')
+    stats_parser.add_argument('--overwrite', action='store_true', help='Recompute statistics that are already up to date.')
+    stats_parser.add_argument('--resampler', choices=['librosa', 'soxr', 'polyphase'], default='librosa',
+                              help='Resampling backend of the recordings that are not at --fs. Defaults to librosa.')
+    stats_parser.set_defaults(func=stats)
+
+    compact_parser = subparsers.add_parser('compact-irs', help='Write the compacted IRs used by cars with compact_irs=True and compare them to the full IRs.')
+    compact_parser.add_argument('path', help='Path to the dataset folder or to the folder of a single car.')
+    compact_parser.add_argument('--fs', type=int, default=16000, help='Sampling frequency of the IRs in Hz. Defaults to 16000.')
+    compact_parser.add_argument('--threshold-db', type=float, default=-60.0,
+                                help='Energy in dB, relative to the IR, of the leading and of the trailing samples that are dropped. Defaults to -60.')
+    compact_parser.add_argument('--overwrite', action='store_true', help='Rewrite entries that are already up to date.')
+    compact_parser.add_argument('--resampler', choices=['librosa', 'soxr', 'polyphase'], default='librosa',
+                                help='Resampling backend of the IRs that are not at --fs. Defaults to librosa.')
+    compact_parser.add_argument('--speech', default=None, help='Dry speech file of the comparison. Defaults to white noise.')
+    compact_parser.add_argument('--seconds', type=float, default=4.0, help='Duration of the white noise of the comparison in seconds. Defaults to 4.')
+    compact_parser.add_argument('--repeat', type=int, default=3, help='Number of timed calls per IR. Defaults to 3.')
+    compact_parser.add_argument('--report', default=None, help='JSON file of the comparison of every IR.')
+    compact_parser.set_defaults(func=compact_irs)
+
+    manifest_parser = subparsers.add_parser('manifest', help='Write the manifest of the dataset used automatically by Car.')
+    manifest_parser.add_argument('path', help='Path to the dataset folder.')
+    manifest_parser.set_defaults(func=manifest)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
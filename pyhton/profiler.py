@@ -0,0 +1,118 @@
+"""
+The profiler of the stages and counters of Car, enabled with Car.enable_profiler.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class Profiler:
+    """
+    Records the wall time of the stages of the pipelines of Car and counters of the work they do, e.g. the bytes decoded, the samples
+    convolved and the cache hits, for all cars of the process.
+
+    A profiler is enabled with Car.enable_profiler and disabled with Car.disable_profiler; while no profiler is enabled, Car records
+    nothing. Stages are nested as they run (e.g. 'convolve' inside 'get_speech' inside 'get_components'), so the time of a stage
+    includes the time of the stages it contains. Recording is thread-safe.
+
+    Args:
+    trace (bool): A boolean indicating whether to keep every stage as an event for chrome_trace. Defaults to False, which keeps only the totals.
+    max_events (int): The maximum number of events kept when trace is True. Later events are dropped and counted. Defaults to 1000000.
+    """
+    def __init__(self, trace=False, max_events=1000000):
+        self.__trace = trace
+        self.__max_events = max_events
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears the stages, counters and events."""
+        with self.__lock:
+            self.__stages = {}
+            self.__counters = {}
+            self.__events = []
+            self.__dropped_events = 0
+            self.__origin = time.perf_counter_ns()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Returns a context manager that records the wall time of the code it wraps as a call of the stage `name`."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            stop = time.perf_counter_ns()
+            with self.__lock:
+                stage = self.__stages.get(name)
+                if stage is None:
+                    stage = self.__stages[name] = [0, 0, None, 0]
+                duration = stop - start
+                stage[0] += 1
+                stage[1] += duration
+                stage[2] = duration if stage[2] is None else min(stage[2], duration)
+                stage[3] = max(stage[3], duration)
+                if self.__trace:
+                    if len(self.__events) < self.__max_events:
+                        self.__events.append((name, start, duration, threading.get_ident()))
+                    else:
+                        self.__dropped_events += 1
+
+    def count(self, **counters):
+        """Adds the given values to the counters with the same names."""
+        with self.__lock:
+            for name, value in counters.items():
+                self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def snapshot(self):
+        """
+        Returns the totals recorded since the profiler was created or reset.
+
+        Returns:
+            dict: 'stages' maps every stage to its number of calls and its total, mean, minimum and maximum wall time in seconds,
+                'counters' maps every counter to its value, and 'events' and 'dropped_events' are the numbers of kept and dropped trace events.
+        """
+        with self.__lock:
+            stages = {name: {'calls': calls, 'seconds': total / 1e9, 'mean': total / calls / 1e9, 'min': shortest / 1e9, 'max': longest / 1e9}
+                      for name, (calls, total, shortest, longest) in self.__stages.items()}
+            return {'stages': stages, 'counters': dict(self.__counters), 'events': len(self.__events), 'dropped_events': self.__dropped_events}
+
+    def to_json(self, path=None):
+        """
+        Returns the snapshot of the profiler as a JSON string, and writes it to `path` if given.
+
+        Args:
+            path (str, optional): The path of the JSON file. Defaults to None.
+
+        Returns:
+            str: The JSON snapshot.
+        """
+        text = json.dumps(self.snapshot(), indent=1)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def chrome_trace(self, path=None):
+        """
+        Returns the recorded events in the Chrome trace event format, which can be opened in chrome://tracing or Perfetto, and writes them
+        to `path` if given. Events are only kept by profilers created with trace=True; the counters are added as a final counter event.
+
+        Args:
+            path (str, optional): The path of the JSON trace file. Defaults to None.
+
+        Returns:
+            dict: The trace, with its events in 'traceEvents'.
+        """
+        pid = os.getpid()
+        with self.__lock:
+            events = [{'name': name, 'cat': 'Car', 'ph': 'X', 'ts': (start - self.__origin) / 1e3, 'dur': duration / 1e3, 'pid': pid, 'tid': tid}
+                      for name, start, duration, tid in self.__events]
+            end = max([event['ts'] + event['dur'] for event in events], default=0)
+            events.append({'name': 'counters', 'cat': 'Car', 'ph': 'C', 'ts': end, 'pid': pid, 'args': dict(self.__counters)})
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w') as f:
+                json.dump(trace, f)
+        return trace
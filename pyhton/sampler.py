@@ -0,0 +1,252 @@
+"""
+Randomized mixtures of CAVEMOVE for training, drawn on the fly from one or more cars.
+
+Each mixture draws a car, a noise condition and a segment of its recording, a speaker location in the same window condition, a
+dry speech signal, and optionally radio audio and a ventilation recording, with their levels, and is rendered at a fixed duration.
+Only what the mixture needs is read and convolved: the noise and ventilation segments are decoded (or sliced from the noise bank)
+with get_noise and get_ventilation, and a segment of the duration of the mixture is cut from the dry speech and radio audio before
+convolution, so that its level is calibrated on what is heard in the mixture. Components shorter than the mixture are looped with
+the crossfading of Car.match_duration.
+
+Mixture `index` is drawn from a generator seeded by the base seed and the index, so that it does not depend on the worker that
+renders it: iterating the sampler in several processes of a data loader yields disjoint, reproducible streams.
+
+Usage:
+    from Car import Car
+    from sampler import MixtureSampler
+
+    cars = [Car(path=f'path/to/cavemove/dataset/{name}') for name in ['Honda_CR-V', 'Hyundai_i30']]
+    sampler = MixtureSampler(cars, speech=dry_voices, duration=4.0, mics=[0, 1, 2, 3], ls=(60, 75),
+                             noise_conditions={'speed': lambda speed: speed >= 50}, radio=songs, radio_probability=0.3)
+    mixture, stems, condition = sampler[0]
+    for mixture, stems, condition in sampler:  # an endless stream, split across the workers of a torch DataLoader
+        ...
+"""
+import itertools
+import sys
+
+import numpy as np
+
+from Car import Car
+from signals import PreparedSignal
+
+# stems of the mixtures, in the order of Car.get_components
+STEMS = ('noise', 'speech', 'radio', 'ventilation')
+
+
+def _draw(rng, distribution):
+    """
+    Draws a value: a (low, high) tuple is sampled uniformly, a list or range by choice, a function is called with the generator,
+    and any other value is returned as is.
+    """
+    if callable(distribution):
+        return distribution(rng)
+    if isinstance(distribution, tuple):
+        low, high = distribution
+        return float(rng.uniform(low, high))
+    if isinstance(distribution, (list, range)):
+        return distribution[int(rng.integers(len(distribution)))]
+    return distribution
+
+
+def _fit(components, length, fs):
+    """Truncates the components to `length` samples or loops them with crossfading as Car.match_duration."""
+    # only the length and the columns of the reference are used
+    reference = np.empty((length,) + components[0].shape[1:])
+    return Car.match_duration([reference] + components, fs)[1:]
+
+
+class MixtureSampler:
+    """
+    Draws fixed-length multichannel mixtures and their stems from one or more cars.
+
+    Conditions are drawn uniformly among those of `Car.query_conditions` that pass the filters, and speech, radio and ventilation
+    share the window condition of the noise. Signals are drawn uniformly from the lists, and a segment of `duration` seconds is cut
+    from those that are longer at a uniformly drawn offset.
+
+    Args:
+    cars (Car or list): The cars, with the same sampling frequency. Cars are drawn uniformly.
+    speech (list or callable): The dry speech signals (numpy.ndarray or PreparedSignal at Car.fs), or a function that returns one from a
+        numpy.random.Generator. None or an empty list disables speech.
+    duration (float): The duration of the mixtures in seconds.
+    mic_setup (str, optional): The microphone setup. Defaults to 'array'.
+    mics (int or list of int, optional): The microphones of the mixtures. Defaults to None, in which case all microphones of the setup are used;
+        give them explicitly to batch cars whose setups have different numbers of channels.
+    ls (optional): The distribution of the speech effort level in dB: a number, a (low, high) tuple drawn uniformly, a list drawn by choice or a
+        function of the generator. Defaults to (60, 75).
+    radio (list or callable, optional): The radio audio signals, as speech. Defaults to None, in which case the mixtures have no radio.
+    la (optional): The distribution of the radio audio level in dB, as ls. Defaults to (50, 70).
+    radio_probability (float, optional): The probability that a mixture has radio, when radio is given. Defaults to 0.5.
+    ventilation_probability (float, optional): The probability that a mixture has ventilation noise. Defaults to 0.
+    speech_conditions (dict, optional): Filters of query_conditions('speech'), e.g. {'location': ['d55', 'fp']}. Defaults to None (all).
+    noise_conditions (dict, optional): Filters of query_conditions('noise'), e.g. {'speed': range(50, 130)}. Defaults to None (all).
+    ventilation_conditions (dict, optional): Filters of query_conditions('ventilation'), e.g. {'level': [1, 2]}. Defaults to None (all).
+    use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+    calibration (str, optional): The method that computes the levels of speech and radio, 'time' or 'spectral' (see Car.get_speech). Defaults to 'time'.
+    seed (int, optional): The base seed of the mixtures. Defaults to 0.
+
+    Raises:
+    ValueError: If no car is given, if the cars have different sampling frequencies, or if the duration is not positive.
+    ValueError: If no car has a noise condition, with a speech condition in the same window when speech is given, that passes the filters.
+    """
+    def __init__(self, cars, speech, duration, mic_setup='array', mics=None, ls=(60, 75), radio=None, la=(50, 70), radio_probability=0.5,
+                 ventilation_probability=0.0, speech_conditions=None, noise_conditions=None, ventilation_conditions=None,
+                 use_correction_gains=True, calibration='time', seed=0):
+        cars = [cars] if isinstance(cars, Car) else list(cars)
+        if not cars:
+            raise ValueError(f"At least one car must be given.")
+        if len({car.fs for car in cars}) > 1:
+            raise ValueError(f"All cars must have the same sampling frequency.")
+        if duration <= 0:
+            raise ValueError(f"duration must be positive.")
+        self.__fs = cars[0].fs
+        self.__length = int(round(duration * self.__fs))
+        self.__mic_setup = mic_setup
+        self.__mics = mics
+        self.__speech = speech or None
+        self.__radio = radio or None
+        self.__ls = ls
+        self.__la = la
+        self.__radio_probability = radio_probability if self.__radio is not None else 0.0
+        self.__ventilation_probability = ventilation_probability
+        self.__use_correction_gains = use_correction_gains
+        self.__calibration = calibration
+        self.__seed = seed
+
+        # conditions per car, and the noise conditions that can be drawn with them
+        self.__cars = []
+        for car in cars:
+            if mic_setup not in car.mic_setups:
+                continue
+            by_window = {}
+            for kind, filters in (('speech', speech_conditions), ('ventilation', ventilation_conditions)):
+                for condition in car.query_conditions(kind, mic_setup, **(filters or {})):
+                    by_window.setdefault((kind, condition['window']), []).append(condition)
+            noise = [condition for condition in car.query_conditions('noise', mic_setup, **(noise_conditions or {}))
+                     if self.__speech is None or ('speech', condition['window']) in by_window]
+            if noise:
+                has_radio = car.radio_irs[mic_setup] is not None
+                self.__cars.append((car, noise, by_window, has_radio))
+        if not self.__cars:
+            raise ValueError(f"No car has noise and speech conditions of {mic_setup} that pass the filters.")
+
+    @property
+    def fs(self):
+        """Returns the sampling frequency of the mixtures."""
+        return self.__fs
+
+    @fs.setter
+    def fs(self, value):
+        raise AttributeError('Cannot set fs.')
+
+    @property
+    def length(self):
+        """Returns the number of samples of the mixtures."""
+        return self.__length
+
+    @length.setter
+    def length(self, value):
+        raise AttributeError('Cannot set length.')
+
+    def __segment(self, rng, signals):
+        """Draws a signal and a segment of the length of the mixtures, and returns the segment, the index of the signal (None if drawn by a function) and the offset."""
+        if callable(signals):
+            x, index = signals(rng), None
+        else:
+            index = int(rng.integers(len(signals)))
+            x = signals[index]
+        length = x.shape[0]
+        if length <= self.__length:
+            return x, index, 0
+        offset = int(rng.integers(length - self.__length + 1))
+        if isinstance(x, PreparedSignal):
+            x = x.signal
+        return x[offset:offset + self.__length], index, offset
+
+    def __recording(self, rng, car, kind, condition):
+        """Draws the offset of a segment of the length of the mixtures in a noise or ventilation recording, and returns the segment and the offset."""
+        getter = car.get_noise if kind == 'noise' else car.get_ventilation
+        available = int(round(car.recording_duration(kind, **condition) * self.__fs))
+        offset = int(rng.integers(available - self.__length + 1)) if available > self.__length else 0
+        x = getter(**condition, mics=self.__mics, use_correction_gains=self.__use_correction_gains,
+                   offset=offset / self.__fs, duration=min(self.__length, available) / self.__fs)
+        return x, offset
+
+    def sample(self, index):
+        """
+        Draws and renders mixture `index`.
+
+        Args:
+            index (int): The index of the mixture, which seeds its draws together with the base seed.
+
+        Returns:
+            tuple: The mixture (N_samples x M_mics), a dictionary of its stems by name ('noise', 'speech', 'radio' and 'ventilation',
+                zeros for those that are absent) and a dictionary of its condition: the keys of the manifests of generate.py ('car',
+                'mic_setup', 'location', 'speed', 'window', 'version', 'ls', 'la', 'vent_level', 'noise_offset'), the indices of the
+                speech and radio signals and their offsets, and the offset of the ventilation segment, in samples.
+        """
+        rng = np.random.default_rng(np.random.SeedSequence([self.__seed, index]))
+        car, noise_conditions, by_window, has_radio = self.__cars[int(rng.integers(len(self.__cars)))]
+        noise_condition = noise_conditions[int(rng.integers(len(noise_conditions)))]
+        window = noise_condition['window']
+        condition = {'car': f'{car.make}_{car.model}', **noise_condition, 'location': None, 'ls': None, 'la': None, 'vent_level': None}
+
+        stems = {}
+        stems['noise'], condition['noise_offset'] = self.__recording(rng, car, 'noise', noise_condition)
+        if self.__speech is not None:
+            speech_conditions = by_window[('speech', window)]
+            condition['location'] = speech_conditions[int(rng.integers(len(speech_conditions)))]['location']
+            condition['ls'] = _draw(rng, self.__ls)
+            x, condition['speech_index'], condition['speech_offset'] = self.__segment(rng, self.__speech)
+            stems['speech'] = car.get_speech(self.__mic_setup, condition['location'], window, condition['ls'], x, mics=self.__mics,
+                                             use_correction_gains=self.__use_correction_gains, calibration=self.__calibration)
+        if has_radio and rng.random() < self.__radio_probability:
+            condition['la'] = _draw(rng, self.__la)
+            x, condition['radio_index'], condition['radio_offset'] = self.__segment(rng, self.__radio)
+            stems['radio'] = car.get_radio(self.__mic_setup, window, condition['la'], x, mics=self.__mics,
+                                           use_correction_gains=self.__use_correction_gains, calibration=self.__calibration)
+        ventilation_conditions = by_window.get(('ventilation', window))
+        if ventilation_conditions and rng.random() < self.__ventilation_probability:
+            ventilation_condition = ventilation_conditions[int(rng.integers(len(ventilation_conditions)))]
+            condition['vent_level'] = ventilation_condition['level']
+            stems['ventilation'], condition['ventilation_offset'] = self.__recording(rng, car, 'ventilation', ventilation_condition)
+
+        names = list(stems)
+        stems = dict(zip(names, _fit([stems[name] for name in names], self.__length, self.__fs)))
+        mixture = np.sum(list(stems.values()), axis=0)
+        zeros = np.zeros_like(mixture)
+        return mixture, {name: stems.get(name, zeros) for name in STEMS}, condition
+
+    def __getitem__(self, index):
+        return self.sample(index)
+
+    def __iter__(self):
+        """
+        Yields the mixtures endlessly. In a worker of a torch DataLoader, worker k of K yields the mixtures k, k + K, k + 2K, ...;
+        otherwise all mixtures are yielded in order.
+        """
+        worker, workers = 0, 1
+        # torch is only asked for the worker when it is already loaded, e.g. by a DataLoader
+        torch = sys.modules.get('torch')
+        if torch is not None:
+            info = torch.utils.data.get_worker_info()
+            if info is not None:
+                worker, workers = info.id, info.num_workers
+        return self.iterate(worker, workers)
+
+    def iterate(self, worker=0, workers=1, start=0, stop=None):
+        """
+        Yields the mixtures of a worker: the indices from `start` to `stop` (endless if None) whose remainder modulo `workers` is `worker`.
+
+        Args:
+            worker (int, optional): The index of the worker. Defaults to 0.
+            workers (int, optional): The number of workers. Defaults to 1.
+            start (int, optional): The first index. Defaults to 0.
+            stop (int, optional): The index after the last index. Defaults to None.
+
+        Yields:
+            tuple: The mixture, its stems and its condition, as returned by sample.
+        """
+        indices = itertools.count(start + worker, workers) if stop is None else range(start + worker, stop, workers)
+        for index in indices:
+            yield self.sample(index)
@@ -0,0 +1,477 @@
+"""
+Sharded storage of CAVEMOVE mixtures: large sequential tar files of compressed audio with an index for random access.
+
+Writing one wav file per mixture and component leaves millions of small files for a large corpus. A ShardWriter packs the items
+instead, each a mixture, its stems (e.g. the components of Car.get_components) and its condition, into tar shards of about
+`shard_size` bytes, that are written sequentially by a background thread so that encoding and disk writes overlap the synthesis.
+A ShardReader reads the items back by index or key, or streams the shards sequentially, split across the workers of a data loader.
+
+Layout of a folder, per writer prefix:
+    <prefix>-00000.tar, <prefix>-00001.tar, ...  shards with the members <key>.json, <key>.mix.<ext> and <key>.<stem>.<ext> per item
+    <prefix>.index.jsonl                         a header line, then one line per item with its shard, member offsets and condition
+
+The audio of an item is quantized to integers with a common scale, so that the stems still add up to the mixture within the
+quantization error, and is stored as FLAC (format 'flac', lossless compression of the integers, up to 8 channels) or as int16
+numpy arrays (format 'npy'). The scale is the value of one integer unit as the reader reads it (int32 for FLAC, int16 for npy);
+the samples are restored as integer * scale. The <key>.json member repeats the scale, the shapes and the condition of the item, so
+that the tar files can be streamed without the index. Items are only listed in the index once their shard is complete, so an
+interrupted writer leaves a readable folder.
+
+Usage:
+    from shards import ShardWriter, ShardReader
+
+    with ShardWriter('path/to/shards', fs=car.fs, format='flac') as writer:
+        for i in range(n):
+            noise, speech = car.get_components(mic_setup, location, speed=speed, window=window, ls=ls, dry_speech=dry_voice)
+            writer.write(f'{i:08d}', {'noise': noise, 'speech': speech}, meta={'speed': speed, 'window': window, 'ls': ls})
+
+    reader = ShardReader('path/to/shards')
+    mixture, stems, meta = reader[0]
+    for mixture, stems, meta in reader:  # sequential, split across the workers of a torch DataLoader
+        ...
+"""
+import glob
+import io
+import json
+import os
+import queue
+import sys
+import tarfile
+import threading
+
+import numpy as np
+import soundfile as sf
+
+FORMATS = ('flac', 'npy')
+# integer full scale of the quantization, and the ratio of the unit read back (int32 for FLAC) to the unit written
+_SUBTYPES = {'PCM_16': (32767, 2**16), 'PCM_24': (2**23 - 1, 2**8)}
+_EXTENSIONS = {'flac': 'flac', 'npy': 'npy'}
+_MIX = 'mix'
+
+
+class ShardWriter:
+    """
+    Writes items (a mixture, its stems and its condition) into tar shards of a folder, on a background thread.
+
+    Items are queued by `write` and encoded and appended to the current shard by the thread; a new shard is started once the
+    current one exceeds `shard_size` bytes. An error of the thread is raised by the next call to `write` or `close`. The arrays
+    given to `write` are not copied and must not be modified afterwards.
+
+    Args:
+    path (str): The folder of the shards, created if needed.
+    fs (int): The sampling frequency of the items.
+    format (str, optional): The format of the audio, 'flac' or 'npy' (int16). Defaults to 'flac'.
+    shard_size (int, optional): The size in bytes above which a shard is closed. Defaults to 1 GiB.
+    prefix (str, optional): The prefix of the file names of the shards and of the index. Defaults to 'shard'.
+    subtype (str, optional): The FLAC subtype, 'PCM_16' or 'PCM_24'. Defaults to 'PCM_16'.
+    queue_size (int, optional): The number of items that can wait for the thread before `write` blocks. Defaults to 16.
+
+    Raises:
+    ValueError: If the format or the subtype is unknown, or if the folder already has an index with the prefix.
+    """
+    def __init__(self, path, fs, format='flac', shard_size=2**30, prefix='shard', subtype='PCM_16', queue_size=16):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format}. Available formats are {FORMATS}.")
+        if subtype not in _SUBTYPES:
+            raise ValueError(f"Unknown subtype {subtype}. Available subtypes are {list(_SUBTYPES)}.")
+        os.makedirs(path, exist_ok=True)
+        self.__index_path = os.path.join(path, f'{prefix}.index.jsonl')
+        if os.path.exists(self.__index_path):
+            raise ValueError(f"{self.__index_path} already exists.")
+        self.__path = path
+        self.__fs = fs
+        self.__format = format
+        self.__shard_size = shard_size
+        self.__prefix = prefix
+        self.__subtype = subtype
+        self.__keys = set()
+        self.__count = 0
+        self.__error = None
+        self.__closed = False
+
+        # state of the thread: the open shard and the index lines of its items
+        self.__shard = -1
+        self.__tar = None
+        self.__pending = []
+        self.__index = open(self.__index_path, 'w')
+        self.__index.write(json.dumps({'format': format, 'fs': fs, 'subtype': subtype, 'prefix': prefix}) + '\n')
+        self.__index.flush()
+
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__thread = threading.Thread(target=self.__run, name=f'ShardWriter-{prefix}', daemon=True)
+        self.__thread.start()
+
+    @property
+    def path(self):
+        return self.__path
+
+    @path.setter
+    def path(self, value):
+        raise AttributeError('Cannot set path.')
+
+    @property
+    def fs(self):
+        return self.__fs
+
+    @fs.setter
+    def fs(self, value):
+        raise AttributeError('Cannot set fs.')
+
+    @property
+    def count(self):
+        """The number of items given to `write`."""
+        return self.__count
+
+    @count.setter
+    def count(self, value):
+        raise AttributeError('Cannot set count.')
+
+    def write(self, key, stems, meta=None, mixture=None):
+        """
+        Queues an item for writing.
+
+        Args:
+            key (str): The key of the item, unique in the writer, without '.' or '/'.
+            stems (dict): The stems (numpy.ndarray) of the item by name, all with the same shape (samples or samples x channels).
+            meta (dict, optional): The condition of the item; it must be serializable to JSON. Defaults to None.
+            mixture (numpy.ndarray, optional): The mixture. Defaults to None, in which case the sum of the stems is written.
+
+        Raises:
+            ValueError: If the writer is closed, if the key is invalid or already written, if a stem is named 'mix', if the stems
+                and mixture have different shapes, or if a FLAC item has more than 8 channels.
+        """
+        self.__raise()
+        if self.__closed:
+            raise ValueError(f"Cannot write to a closed writer.")
+        key = str(key)
+        if not key or '.' in key or '/' in key:
+            raise ValueError(f"Invalid key {key}. Keys must be non-empty and cannot contain '.' or '/'.")
+        if key in self.__keys:
+            raise ValueError(f"Key {key} is already written.")
+        if not stems and mixture is None:
+            raise ValueError(f"Item {key} has no stems and no mixture.")
+        if _MIX in stems:
+            raise ValueError(f"Stems cannot be named {_MIX}.")
+        shapes = {np.shape(x) for x in stems.values()} | ({np.shape(mixture)} if mixture is not None else set())
+        if len(shapes) > 1:
+            raise ValueError(f"Stems and mixture of item {key} have different shapes {sorted(shapes)}.")
+        shape = shapes.pop()
+        if len(shape) not in (1, 2):
+            raise ValueError(f"Item {key} must have 1 or 2 dimensions, got {len(shape)}.")
+        if self.__format == 'flac' and len(shape) == 2 and shape[1] > 8:
+            raise ValueError(f"FLAC supports up to 8 channels, item {key} has {shape[1]}. Use the 'npy' format.")
+        # a condition that cannot be serialized fails here rather than on the thread
+        json.dumps(meta)
+        self.__keys.add(key)
+        self.__count += 1
+        self.__queue.put((key, dict(stems), meta, mixture))
+
+    def close(self):
+        """Waits for the queued items to be written, closes the last shard and the index, and raises an error of the thread if any."""
+        if not self.__closed:
+            self.__closed = True
+            self.__queue.put(None)
+            self.__thread.join()
+        self.__raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __raise(self):
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self):
+        """Writes the queued items until the end of the queue; after an error, the remaining items are discarded."""
+        try:
+            while True:
+                item = self.__queue.get()
+                if item is None:
+                    break
+                if self.__error is None:
+                    try:
+                        self.__write_item(*item)
+                    except BaseException as error:
+                        self.__error = error
+            if self.__error is None:
+                self.__close_shard()
+        except BaseException as error:
+            self.__error = error
+        finally:
+            self.__index.close()
+
+    def __encode(self, q):
+        """Returns the bytes of the quantized signal `q` in the format of the writer."""
+        buffer = io.BytesIO()
+        if self.__format == 'flac':
+            sf.write(buffer, q, self.__fs, format='FLAC', subtype=self.__subtype)
+        else:
+            np.save(buffer, q, allow_pickle=False)
+        return buffer.getvalue()
+
+    def __add(self, name, data):
+        """Appends a member to the open shard and returns the offset and size of its data."""
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = 0o644
+        start = self.__tar.offset
+        self.__tar.addfile(info, io.BytesIO(data))
+        blocks = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        # the data follows the header, whose size depends on the name
+        return [self.__tar.offset - blocks, len(data)]
+
+    def __write_item(self, key, stems, meta, mixture):
+        if self.__tar is None:
+            self.__shard += 1
+            self.__tar = tarfile.open(os.path.join(self.__path, f'{self.__prefix}-{self.__shard:05d}.tar'), 'w', format=tarfile.PAX_FORMAT)
+
+        signals = {_MIX: np.sum(list(stems.values()), axis=0) if mixture is None else mixture, **stems}
+        peak = max(float(np.max(np.abs(x))) if np.size(x) else 0.0 for x in signals.values())
+        if self.__format == 'flac':
+            full_scale, unit = _SUBTYPES[self.__subtype]
+        else:
+            full_scale, unit = _SUBTYPES['PCM_16'][0], 1
+        gain = full_scale / peak if peak > 0 else 1.0
+        # one integer as read back (int32 for FLAC, int16 for npy) is worth `scale`
+        scale = 1.0 / (gain * unit)
+        shapes = {name: list(np.shape(x)) for name, x in signals.items()}
+
+        record = {'key': key, 'scale': scale, 'shapes': shapes, 'meta': meta}
+        members = {'json': self.__add(f'{key}.json', json.dumps(record).encode())}
+        extension = _EXTENSIONS[self.__format]
+        for name, x in signals.items():
+            q = np.rint(np.asarray(x, dtype=np.float64) * gain)
+            if self.__format == 'flac' and self.__subtype == 'PCM_24':
+                # libsndfile writes the 24 most significant bits of int32 samples
+                q = q.astype(np.int32) * unit
+            else:
+                q = q.astype(np.int16)
+            members[name] = self.__add(f'{key}.{name}.{extension}', self.__encode(q))
+        self.__pending.append({'key': key, 'shard': self.__shard, 'members': members, 'scale': scale, 'shapes': shapes, 'meta': meta})
+
+        if self.__tar.offset >= self.__shard_size:
+            self.__close_shard()
+
+    def __close_shard(self):
+        """Closes the open shard and lists its items in the index."""
+        if self.__tar is None:
+            return
+        self.__tar.close()
+        self.__tar = None
+        for line in self.__pending:
+            self.__index.write(json.dumps(line) + '\n')
+        self.__index.flush()
+        self.__pending = []
+
+
+class ShardReader:
+    """
+    Reads the items of the shards of a folder, written by one or more ShardWriter (with different prefixes).
+
+    Args:
+    path (str): The folder of the shards.
+    dtype (str, optional): The sample format of the returned signals. Defaults to 'float32'.
+
+    Raises:
+    ValueError: If the folder has no index, if the indexes have different sampling frequencies, or if a key is in several indexes.
+    """
+    def __init__(self, path, dtype='float32'):
+        indexes = sorted(glob.glob(os.path.join(glob.escape(path), '*.index.jsonl')))
+        if not indexes:
+            raise ValueError(f"No shard index in {path}.")
+        self.__path = path
+        self.__dtype = np.dtype(dtype)
+        self.__fs = None
+        self.__items = []
+        self.__positions = {}
+        self.__shards = []
+        self.__formats = {}
+        shard_positions = {}
+        for index in indexes:
+            with open(index, 'r') as f:
+                header = json.loads(f.readline())
+                if self.__fs is not None and header['fs'] != self.__fs:
+                    raise ValueError(f"{index} has a sampling frequency of {header['fs']} Hz instead of {self.__fs} Hz.")
+                self.__fs = header['fs']
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    if item['key'] in self.__positions:
+                        raise ValueError(f"Key {item['key']} is in several indexes.")
+                    shard = os.path.join(path, f"{header['prefix']}-{item['shard']:05d}.tar")
+                    if shard not in shard_positions:
+                        shard_positions[shard] = len(self.__shards)
+                        self.__shards.append(shard)
+                        self.__formats[shard] = header['format']
+                    item['shard'] = shard_positions[shard]
+                    self.__positions[item['key']] = len(self.__items)
+                    self.__items.append(item)
+
+        # open shards of the process, reopened after a fork so that processes do not share file positions
+        self.__files = {}
+        self.__pid = os.getpid()
+        self.__lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self.__path
+
+    @path.setter
+    def path(self, value):
+        raise AttributeError('Cannot set path.')
+
+    @property
+    def fs(self):
+        return self.__fs
+
+    @fs.setter
+    def fs(self, value):
+        raise AttributeError('Cannot set fs.')
+
+    @property
+    def keys(self):
+        """The keys of the items, in the order of the indexes."""
+        return [item['key'] for item in self.__items]
+
+    @keys.setter
+    def keys(self, value):
+        raise AttributeError('Cannot set keys.')
+
+    @property
+    def shards(self):
+        """The paths of the shards."""
+        return list(self.__shards)
+
+    @shards.setter
+    def shards(self, value):
+        raise AttributeError('Cannot set shards.')
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, key):
+        return key in self.__positions
+
+    def __position(self, index):
+        if isinstance(index, str):
+            if index not in self.__positions:
+                raise KeyError(f"Unknown key {index}.")
+            return self.__positions[index]
+        return range(len(self.__items))[index]
+
+    def meta(self, index):
+        """
+        Returns the condition of an item from the index, without reading its shard.
+
+        Args:
+            index (int or str): The position or the key of the item.
+
+        Returns:
+            dict: The condition given to ShardWriter.write.
+        """
+        return self.__items[self.__position(index)]['meta']
+
+    def __decode(self, data, format, scale, shape):
+        if format == 'flac':
+            q, _ = sf.read(io.BytesIO(data), dtype='int32')
+        else:
+            q = np.load(io.BytesIO(data), allow_pickle=False)
+        return (q * scale).astype(self.__dtype, copy=False).reshape(shape)
+
+    def __read_member(self, shard, offset, size):
+        with self.__lock:
+            if self.__pid != os.getpid():
+                self.__files = {}
+                self.__pid = os.getpid()
+            if shard not in self.__files:
+                self.__files[shard] = open(self.__shards[shard], 'rb')
+            f = self.__files[shard]
+            f.seek(offset)
+            return f.read(size)
+
+    def read(self, index, streams=None):
+        """
+        Reads an item from its shard.
+
+        Args:
+            index (int or str): The position or the key of the item.
+            streams (list, optional): The names of the signals to read, among 'mix' and the stems. Defaults to None, in which case all are read.
+
+        Returns:
+            tuple: The mixture (None if 'mix' is not read), the stems by name, and the condition of the item.
+
+        Raises:
+            KeyError: If the key or a stream is unknown.
+        """
+        item = self.__items[self.__position(index)]
+        names = [name for name in item['members'] if name != 'json'] if streams is None else list(streams)
+        unknown = [name for name in names if name not in item['members'] or name == 'json']
+        if unknown:
+            raise KeyError(f"Unknown streams {unknown} of item {item['key']}.")
+        format = self.__formats[self.__shards[item['shard']]]
+        signals = {name: self.__decode(self.__read_member(item['shard'], *item['members'][name]), format, item['scale'], item['shapes'][name])
+                   for name in names}
+        mixture = signals.pop(_MIX, None)
+        return mixture, signals, item['meta']
+
+    def __getitem__(self, index):
+        return self.read(index)
+
+    def __iter__(self):
+        """
+        Streams the items shard by shard. In a worker of a torch DataLoader, worker k of K streams the shards k, k + K, k + 2K, ...;
+        otherwise all shards are streamed in order.
+        """
+        worker, workers = 0, 1
+        # torch is only asked for the worker when it is already loaded, e.g. by a DataLoader
+        torch = sys.modules.get('torch')
+        if torch is not None:
+            info = torch.utils.data.get_worker_info()
+            if info is not None:
+                worker, workers = info.id, info.num_workers
+        return self.iterate(worker, workers)
+
+    def iterate(self, worker=0, workers=1, streams=None):
+        """
+        Streams the items of the shards of a worker, reading every shard sequentially from start to end.
+
+        Args:
+            worker (int, optional): The index of the worker. Defaults to 0.
+            workers (int, optional): The number of workers; worker k streams the shards whose position modulo `workers` is k. Defaults to 1.
+            streams (list, optional): The names of the signals to decode, as read. Defaults to None, in which case all are decoded.
+
+        Yields:
+            tuple: The mixture, the stems and the condition of every item, as read.
+        """
+        for shard in self.__shards[worker::workers]:
+            format = self.__formats[shard]
+            with tarfile.open(shard, 'r|') as tar:
+                record, signals = None, {}
+                for member in tar:
+                    name = member.name.split('.', 1)[1]
+                    if name == 'json':
+                        if record is not None:
+                            yield self.__item(record, signals)
+                        record, signals = json.loads(tar.extractfile(member).read()), {}
+                        continue
+                    name = name.rsplit('.', 1)[0]
+                    if record is not None and (streams is None or name in streams):
+                        signals[name] = self.__decode(tar.extractfile(member).read(), format, record['scale'], record['shapes'][name])
+                if record is not None:
+                    yield self.__item(record, signals)
+
+    @staticmethod
+    def __item(record, signals):
+        mixture = signals.pop(_MIX, None)
+        return mixture, signals, record['meta']
+
+    def close(self):
+        """Closes the shards opened for random access."""
+        with self.__lock:
+            for f in self.__files.values():
+                f.close()
+            self.__files = {}
@@ -0,0 +1,198 @@
+"""
+Signals that Car renders with: dry speech and radio audio prepared once for convolution with many IRs, and convolved components kept
+before their level is applied so that they can be rendered at any level.
+"""
+import hashlib
+
+import numpy as np
+from scipy.fft import rfft, irfft, next_fast_len
+
+
+class CalibratedComponent:
+    """
+    A convolved speech or radio component before its level is applied, as returned by Car.get_calibrated_speech and Car.get_calibrated_radio.
+
+    The level of the component is set with `at_level`, which costs one multiplication, so that the same convolved signal can be rendered
+    at any number of speech effort or audio levels.
+
+    Args:
+    signal (numpy.ndarray): The unscaled convolved signal (N_samples x M_channels). It is made read-only.
+    offset (float): The gain in dB that brings the signal to a level of 0, i.e. the gain for a level `l` is `l + offset` dB.
+    mics (list of int): The microphone indices of the channels of the signal.
+    correction_gains (numpy.ndarray): The correction gains of the microphones, in the order of `mics`.
+    """
+    def __init__(self, signal, offset, mics, correction_gains):
+        signal.flags.writeable = False
+        self.__signal = signal
+        self.__offset = offset
+        self.__mics = list(mics)
+        self.__correction_gains = correction_gains
+
+    def __repr__(self):
+        return f'CalibratedComponent(samples={self.__signal.shape[0]}, mics={self.__mics}, offset={self.__offset:.2f})'
+
+    @property
+    def signal(self):
+        """Returns the read-only unscaled convolved signal."""
+        return self.__signal
+
+    @property
+    def offset(self):
+        """Returns the gain in dB that brings the signal to a level of 0."""
+        return self.__offset
+
+    @property
+    def mics(self):
+        """Returns the microphone indices of the channels of the signal."""
+        return list(self.__mics)
+
+    @property
+    def nbytes(self):
+        """Returns the number of bytes of the signal."""
+        return self.__signal.nbytes
+
+    def gain(self, level):
+        """Returns the linear gain that brings the signal to `level` (speech effort level for speech, audio level for radio)."""
+        return 10 ** ((level + self.__offset) / 20)
+
+    def at_level(self, level, use_correction_gains=True):
+        """
+        Returns the component at the given level.
+
+        Args:
+            level (float): The speech effort level for speech or the audio level for radio.
+            use_correction_gains (bool, optional): A boolean indicating whether to use the correction gains. Defaults to True.
+
+        Returns:
+            numpy.ndarray: The scaled signal (N_samples x M_channels), as returned by Car.get_speech or Car.get_radio.
+
+        Raises:
+            ValueError: If the level is negative.
+        """
+        if level < 0:
+            raise ValueError(f"Level must be positive.")
+        if use_correction_gains:
+            return self.__signal * (self.gain(level) * self.__correction_gains).astype(self.__signal.dtype)
+        return self.__signal * self.__signal.dtype.type(self.gain(level))
+
+
+class PreparedSignal:
+    """
+    A dry speech or radio audio signal prepared once for convolution with many impulse responses, on any Car with the same sampling frequency.
+
+    A PreparedSignal can be passed instead of an array as `dry_speech` or `radio_audio` to the methods of Car. It keeps the spectra of the
+    signal that the convolutions and the spectral calibration need, computed on first use: the zero-padded FFT of the whole signal for
+    IRs of comparable length, or the FFTs of its partitions for overlap-add convolution with IRs much shorter than the signal. Since the
+    IRs of a car (and usually of a dataset) have the same length, rendering an utterance with any number of IRs transforms it once, and
+    each IR costs one product of spectra and one inverse FFT.
+
+    Args:
+    signal (numpy.ndarray): The signal vector, or a matrix (N_samples x channels) that is averaged to mono as by Car.get_speech and Car.get_radio.
+    fs (int, optional): The sampling frequency of the signal. If given, cars with a different sampling frequency reject the signal. Defaults to None.
+    """
+    # length ratio above which the signal is partitioned for overlap-add convolution, as in Car
+    __OA_RATIO = 8
+    # FFT size of the partitions relative to the length of the IR
+    __PARTITION_RATIO = 8
+
+    def __init__(self, signal, fs=None):
+        if len(signal.shape) > 1:
+            signal = np.mean(signal, axis=1)
+        else:
+            signal = np.array(signal, dtype=float)
+        signal.flags.writeable = False
+        self.__signal = signal
+        self.__fs = fs
+        self.__digest = None
+        self.__spectra = {}
+        self.__autocorrelations = {}
+
+    def __len__(self):
+        return len(self.__signal)
+
+    def __repr__(self):
+        return f'PreparedSignal(samples={len(self.__signal)}, fs={self.__fs}, spectra={len(self.__spectra)})'
+
+    @property
+    def signal(self):
+        """Returns the read-only mono signal."""
+        return self.__signal
+
+    @property
+    def shape(self):
+        """Returns the shape of the mono signal."""
+        return self.__signal.shape
+
+    @property
+    def fs(self):
+        """Returns the sampling frequency of the signal, or None if it was not given."""
+        return self.__fs
+
+    @property
+    def digest(self):
+        """Returns a digest of the samples of the signal, computed once."""
+        if self.__digest is None:
+            digest = hashlib.blake2b(f'{self.__signal.dtype}{self.__signal.shape}'.encode(), digest_size=16)
+            digest.update(self.__signal.view(np.uint8))
+            self.__digest = digest.hexdigest()
+        return self.__digest
+
+    @property
+    def nbytes(self):
+        """Returns the number of bytes of the signal and of its cached spectra."""
+        return self.__signal.nbytes + sum(spectrum.nbytes for spectrum in self.__spectra.values()) \
+            + sum(r.nbytes for r in self.__autocorrelations.values())
+
+    def clear(self):
+        """Removes the cached spectra and autocorrelations."""
+        self.__spectra.clear()
+        self.__autocorrelations.clear()
+
+    def __spectrum(self, n, block=None):
+        """Returns the FFT of size `n` of the signal, or of each of its partitions of `block` samples (N_partitions x n/2+1), cached."""
+        key = (n, block)
+        if key not in self.__spectra:
+            if block is None:
+                self.__spectra[key] = rfft(self.__signal, n)
+            else:
+                partitions = -(-len(self.__signal) // block)
+                padded = np.zeros(partitions * block)
+                padded[:len(self.__signal)] = self.__signal
+                self.__spectra[key] = rfft(padded.reshape(partitions, block), n, axis=1)
+        return self.__spectra[key]
+
+    def convolve(self, h):
+        """
+        Convolves the signal with every channel of an impulse response.
+
+        Args:
+            h (numpy.ndarray): The impulse response (K_samples x M_channels).
+
+        Returns:
+            numpy.ndarray: The full convolution of the signal with each channel of `h` ((N_samples + K_samples - 1) x M_channels).
+        """
+        length = len(self.__signal) + len(h) - 1
+        if len(h) * PreparedSignal.__OA_RATIO >= len(self.__signal):
+            n = next_fast_len(length, real=True)
+            return irfft(self.__spectrum(n)[:, np.newaxis] * rfft(h, n, axis=0), n, axis=0)[:length]
+        # overlap-add of the partitions, each one convolved with the IR in one FFT of size n
+        n = next_fast_len(PreparedSignal.__PARTITION_RATIO * len(h), real=True)
+        block = n - len(h) + 1
+        spectra = self.__spectrum(n, block)
+        y = irfft(spectra[:, :, np.newaxis] * rfft(h, n, axis=0)[np.newaxis], n, axis=1)
+        partitions = len(spectra)
+        out = np.zeros(((partitions + 1) * block, h.shape[1]))
+        out[:partitions * block] = y[:, :block].reshape(-1, h.shape[1])
+        # the tail of each partition (shorter than a partition) overlaps the start of the next one
+        tails = np.zeros((partitions, block, h.shape[1]))
+        tails[:, :len(h) - 1] = y[:, block:block + len(h) - 1]
+        out[block:] += tails.reshape(-1, h.shape[1])
+        return out[:length]
+
+    def autocorrelation(self, lags):
+        """Returns the first `lags` lags of the (unnormalized) autocorrelation of the signal, computed from its power spectrum and cached."""
+        if lags not in self.__autocorrelations:
+            n = next_fast_len(len(self.__signal) + lags - 1, real=True)
+            spectrum = self.__spectrum(n)
+            self.__autocorrelations[lags] = irfft(spectrum.real ** 2 + spectrum.imag ** 2, n)[:lags]
+        return self.__autocorrelations[lags]
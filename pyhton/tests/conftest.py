@@ -0,0 +1,32 @@
+"""
+Fixtures of the tests: synthetic CAVEMOVE datasets (see benchmarks/synthetic.py) written once per session.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+import synthetic
+
+# car and microphone setup of the tests; Honda_CR-V has separate 'array' and 'distributed' setups with all recording folders
+CAR = 'Honda_CR-V'
+MIC_SETUP = 'array'
+# cars with references
+CARS = list(synthetic.shipped_cars())
+
+
+@pytest.fixture(scope='session')
+def car_path(tmp_path_factory):
+    """Returns the folder of a synthetic car recorded at 48 kHz."""
+    path = tmp_path_factory.mktemp('dataset')
+    return synthetic.write_dataset(str(path), cars=[CAR], fs=48000, noise_seconds=6.0, ventilation_seconds=6.0)[0]
+
+
+@pytest.fixture(scope='session')
+def dataset(tmp_path_factory):
+    """Returns a synthetic dataset of every car with references, recorded at 16 kHz with short noise and ventilation recordings."""
+    path = str(tmp_path_factory.mktemp('references'))
+    synthetic.write_dataset(path, fs=16000, noise_seconds=0.5, ventilation_seconds=0.5, speeds=(0,), versioned_speeds=())
+    return path
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from scipy.signal import lfilter
+
+from Car import Car
+from conftest import CARS
+
+# the bound on the difference of the 'time' and 'spectral' calibrations in the docs of get_speech and get_radio
+TOLERANCE_DB = 0.01
+
+
+def level_difference(x, y):
+    """Returns the difference in dB of the levels of two signals."""
+    return 20 * np.log10(np.linalg.norm(x) / np.linalg.norm(y))
+
+
+@pytest.fixture(scope='module')
+def signal():
+    """Returns 3 seconds of coloured noise at 16 kHz with a syllabic envelope and pauses, as a stand-in for speech."""
+    rng = np.random.default_rng(0)
+    t = np.arange(3 * 16000) / 16000
+    envelope = np.maximum(np.sin(2 * np.pi * 4 * t), 0) * (np.sin(2 * np.pi * 0.5 * t) > -0.5)
+    return 0.1 * envelope * lfilter([1.0], [1.0, -0.9], rng.standard_normal(len(t)))
+
+
+@pytest.mark.parametrize('car_name', CARS)
+def test_calibrations_agree_on_every_reference(dataset, signal, car_name):
+    car = Car(f'{dataset}/{car_name}', fs=16000)
+    for mic_setup in car.mic_setups:
+        for condition in car.irs[mic_setup]:
+            location, window = condition.rsplit('_w', 1)
+            x, y = (car.get_speech(mic_setup, location, int(window), 70, signal, calibration=calibration) for calibration in ('time', 'spectral'))
+            assert abs(level_difference(x, y)) < TOLERANCE_DB, (mic_setup, condition)
+        for condition in car.radio_irs[mic_setup] or []:
+            x, y = (car.get_radio(mic_setup, int(condition[1:]), 60, signal, calibration=calibration) for calibration in ('time', 'spectral'))
+            assert abs(level_difference(x, y)) < TOLERANCE_DB, (mic_setup, condition)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from Car import Car
+from conftest import MIC_SETUP
+
+
+def test_component_cache_follows_fs_and_resampler(car_path):
+    car = Car(car_path, fs=48000, component_cache_size=10**8)
+    location, window = car.irs[MIC_SETUP][0].rsplit('_w', 1)
+    x = 0.1 * np.random.default_rng(0).standard_normal(16000)
+    car.get_speech(MIC_SETUP, location, int(window), 70, x)
+    for fs, resampler in ((16000, 'librosa'), (16000, 'polyphase')):
+        car.fs, car.resampler = fs, resampler
+        expected = Car(car_path, fs=fs, resampler=resampler).get_speech(MIC_SETUP, location, int(window), 70, x)
+        np.testing.assert_array_equal(car.get_speech(MIC_SETUP, location, int(window), 70, x), expected)
+
+
+def test_spectral_calibration_follows_resampler(car_path):
+    car = Car(car_path, fs=16000)
+    location, window = car.irs[MIC_SETUP][0].rsplit('_w', 1)
+    x = 0.1 * np.random.default_rng(0).standard_normal(16000)
+    car.get_speech(MIC_SETUP, location, int(window), 70, x, calibration='spectral')
+    car.resampler = 'polyphase'
+    expected = Car(car_path, fs=16000, resampler='polyphase').get_speech(MIC_SETUP, location, int(window), 70, x, calibration='spectral')
+    np.testing.assert_array_equal(car.get_speech(MIC_SETUP, location, int(window), 70, x, calibration='spectral'), expected)
+
+
+def test_cached_components_leave_no_prefetched_recordings(car_path):
+    car = Car(car_path, prefetch_workers=2, component_cache_size=10**8)
+    location, window = car.irs[MIC_SETUP][0].rsplit('_w', 1)
+    x = 0.1 * np.random.default_rng(0).standard_normal(16000)
+    for _ in range(2):
+        car.get_components(MIC_SETUP, location, 0, int(window), ls=70, dry_speech=x)
+        assert not car._Car__prefetched
+    specs = [dict(mic_setup=MIC_SETUP, location=location, speed=0, window=int(window), ls=70, dry_speech=x)]
+    car.get_components_batch(specs)
+    assert not car._Car__prefetched
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from scipy.signal import correlate
+
+from Car import Car
+from signals import PreparedSignal
+import synthetic
+from conftest import CAR, MIC_SETUP
+
+
+def reference(x, h, mics):
+    """Returns the convolution of `x` with the channels `mics` of `h` by np.convolve, as before the FFT convolution."""
+    return np.array([np.convolve(x, h[:, mic], mode='full') for mic in mics]).T
+
+
+def assert_scaled(y, expected, gains):
+    """Asserts that `y` is `expected` scaled by `gains` per microphone and by a gain common to all microphones."""
+    expected = expected * gains
+    gain = np.sum(y * expected) / np.sum(expected * expected)
+    assert y.shape == expected.shape
+    assert np.linalg.norm(y - gain * expected) / np.linalg.norm(y) < 1e-10
+
+
+@pytest.fixture(scope='module')
+def car(car_path):
+    return Car(car_path, fs=16000)
+
+
+# a signal of the length of the IRs (single FFT convolution) and a longer one (overlap-add)
+@pytest.mark.parametrize('seconds', [0.5, 4.0])
+@pytest.mark.parametrize('prepared', [False, True])
+@pytest.mark.parametrize('use_correction_gains', [False, True])
+def test_speech_matches_np_convolve(car, seconds, prepared, use_correction_gains):
+    x = 0.1 * np.random.default_rng(0).standard_normal(int(seconds * car.fs))
+    condition = car.irs[MIC_SETUP][0]
+    location, window = condition.rsplit('_w', 1)
+    mics = [0, 2, 5]
+    h, _ = car.load_ir(MIC_SETUP, condition)
+    y = car.get_speech(MIC_SETUP, location, int(window), 70, PreparedSignal(x, car.fs) if prepared else x, mics=mics,
+                       use_correction_gains=use_correction_gains)
+    gains = np.array([car.correction_gains[str(mic)] for mic in mics]) if use_correction_gains else 1.0
+    assert_scaled(y, reference(x, h, mics), gains)
+
+
+@pytest.mark.parametrize('seconds', [0.5, 4.0])
+def test_radio_matches_np_convolve(car, seconds):
+    x = 0.1 * np.random.default_rng(1).standard_normal(int(seconds * car.fs))
+    mics = [1, 3]
+    h, _ = car.load_radio_ir(MIC_SETUP, 'w2')
+    y = car.get_radio(MIC_SETUP, 2, 60, x, mics=mics, use_correction_gains=False)
+    assert_scaled(y, reference(x, h, mics), 1.0)
+
+
+def shifts(y, y_compact):
+    """Returns the lag of the peak of the cross-correlation of every channel of `y` with the same channel of `y_compact`."""
+    return {int(np.argmax(correlate(y[:, mic], y_compact[:, mic], method='fft'))) - len(y_compact) + 1 for mic in range(y.shape[1])}
+
+
+def test_compact_irs_keep_levels_and_lags(tmp_path):
+    path = synthetic.write_dataset(str(tmp_path), cars=[CAR], fs=48000, noise_seconds=1.0, ventilation_seconds=1.0)[0]
+    full = Car(path, fs=16000)
+    assert full.build_ir_store() > 0
+    compact = Car(path, fs=16000, compact_irs=True)
+    x = 0.1 * np.random.default_rng(2).standard_normal(16000)
+    pairs = [(full.get_radio(MIC_SETUP, 0, 60, x), compact.get_radio(MIC_SETUP, 0, 60, x))]
+    for condition in full.irs[MIC_SETUP]:
+        location, window = condition.rsplit('_w', 1)
+        pairs.append((full.get_speech(MIC_SETUP, location, int(window), 70, x), compact.get_speech(MIC_SETUP, location, int(window), 70, x)))
+    for y, y_compact in pairs:
+        assert len(y_compact) < len(y)
+        np.testing.assert_allclose(10 * np.log10(np.sum(y_compact ** 2, axis=0)), 10 * np.log10(np.sum(y ** 2, axis=0)), atol=1e-3)
+        # the compacted IRs drop the same leading samples from every channel, so that the inter-channel lags are kept
+        assert len(shifts(y, y_compact)) == 1
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from Car import Car
+from conftest import MIC_SETUP
+
+
+@pytest.mark.parametrize('calibration', ['time', 'spectral'])
+def test_float32_matches_float64(car_path, calibration):
+    cars = {dtype: Car(car_path, fs=16000, dtype=dtype) for dtype in ('float64', 'float32')}
+    location = cars['float64'].irs[MIC_SETUP][0].rsplit('_w', 1)[0]
+    rng = np.random.default_rng(0)
+    kwargs = dict(mic_setup=MIC_SETUP, location=location, speed=100, window=0, ls=70, dry_speech=0.1 * rng.standard_normal(40000),
+                  la=60, radio_audio=0.1 * rng.standard_normal((60000, 2)), vent_level=2, calibration=calibration)
+    expected = cars['float64'].get_components(**kwargs)
+    components = cars['float32'].get_components(**kwargs)
+    for x, y in zip(components, expected):
+        assert x.dtype == np.float32
+        assert x.shape == y.shape
+        assert np.linalg.norm(x - y) / np.linalg.norm(y) < 1e-6
+        assert abs(20 * np.log10(np.linalg.norm(x) / np.linalg.norm(y))) < 1e-5
+
+    speech = {dtype: car.get_calibrated_speech(MIC_SETUP, location, 0, kwargs['dry_speech'], calibration=calibration) for dtype, car in cars.items()}
+    assert abs(speech['float32'].offset - speech['float64'].offset) < 1e-5
+
+
+def test_batch_and_stream_take_dtype(car_path):
+    car = Car(car_path, fs=16000)
+    location = car.irs[MIC_SETUP][0].rsplit('_w', 1)[0]
+    rng = np.random.default_rng(1)
+    spec = dict(mic_setup=MIC_SETUP, location=location, speed=50, window=1, mics=[0, 3], ls=70, dry_speech=0.1 * rng.standard_normal(20000),
+                la=60, radio_audio=0.1 * rng.standard_normal(30000), vent_level=1)
+    specs = [{**spec, 'dtype': 'float32'}, {**spec, 'dtype': 'float64'}]
+    car.prefetch(specs)
+    for spec, components in zip(specs, car.get_components_batch(specs)):
+        expected = car.get_components(**spec)
+        for x, y in zip(components, expected):
+            assert x.dtype == np.dtype(spec['dtype'])
+            assert np.linalg.norm(x - y) / np.linalg.norm(y) < 1e-6
+
+    expected = car.get_components(**specs[0])
+    streamed = [np.concatenate(blocks) for blocks in zip(*car.stream_components(block_size=7777, **specs[0]))]
+    for x, y in zip(streamed, expected):
+        assert x.dtype == np.float32
+        assert np.linalg.norm(x - y) / np.linalg.norm(y) < 1e-6
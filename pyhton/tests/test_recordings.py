@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+import pytest
+
+from Car import Car
+import synthetic
+from conftest import CAR, MIC_SETUP
+
+
+@pytest.mark.parametrize('fs', [16000, 22050, 44100])
+def test_windowed_reads_match_the_full_recording(car_path, fs):
+    car = Car(car_path, fs=fs)
+    condition = car.noise_recordings[MIC_SETUP][0]
+    x, _ = car.load_noise(MIC_SETUP, condition)
+    for start, length in [(1, 100), (12345, 7777), (fs // 3 + 1, fs), (4 * fs + 17, None)]:
+        window, _ = car.load_noise(MIC_SETUP, condition, offset=start / fs, duration=None if length is None else length / fs)
+        expected = x[start:None if length is None else start + length]
+        assert window.shape == expected.shape
+        assert np.linalg.norm(window - expected) / np.linalg.norm(expected) < 1e-5
+
+
+def test_windowed_read_beyond_the_end(car_path):
+    car = Car(car_path, fs=44100)
+    condition = car.noise_recordings[MIC_SETUP][0]
+    with pytest.raises(ValueError):
+        car.load_noise(MIC_SETUP, condition, offset=7.0)
+
+
+def test_stale_manifest_warns(tmp_path):
+    path = synthetic.write_dataset(str(tmp_path), cars=[CAR], fs=16000, noise_seconds=0.5, ventilation_seconds=0.5)[0]
+    Car.build_manifest(str(tmp_path))
+    conditions = Car(path).noise_recordings
+    open(os.path.join(path, 'notes.txt'), 'w').close()
+    with pytest.warns(UserWarning, match='out of date'):
+        car = Car(path)
+    assert car.noise_recordings == conditions
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from Car import Car
+from conftest import MIC_SETUP
+from sampler import MixtureSampler
+
+
+@pytest.mark.parametrize('fs', [16000, 44100])
+def test_crops_are_slices_of_the_recordings(car_path, fs):
+    car = Car(car_path, fs=fs)
+    mics = [0, 3]
+    sampler = MixtureSampler(car, None, duration=1.0, mic_setup=MIC_SETUP, mics=mics, ventilation_probability=1.0, seed=1)
+    for index in range(4):
+        _, stems, condition = sampler.sample(index)
+        noise = car.get_noise(MIC_SETUP, condition['speed'], condition['window'], condition['version'], mics=mics)
+        ventilation = car.get_ventilation(MIC_SETUP, condition['vent_level'], condition['window'], mics=mics)
+        for x, y, offset in ((stems['noise'], noise, condition['noise_offset']), (stems['ventilation'], ventilation, condition['ventilation_offset'])):
+            expected = y[offset:offset + sampler.length]
+            assert x.shape == expected.shape
+            assert np.linalg.norm(x - expected) / np.linalg.norm(expected) < 1e-5
@@ -0,0 +1,22 @@
+import pytest
+
+from Car import Car
+from conftest import MIC_SETUP
+
+
+def test_statistics_follow_fs(car_path):
+    car = Car(car_path, fs=48000)
+    assert car.get_noise_statistics(MIC_SETUP, 50, 1)['frequencies'][-1] == 24000
+    car.fs = 16000
+    assert car.get_noise_statistics(MIC_SETUP, 50, 1)['frequencies'][-1] == 8000
+
+
+def test_unwritable_store_warns(car_path, monkeypatch):
+    def write_statistics(self, *args):
+        raise PermissionError('read-only file system')
+
+    monkeypatch.setattr(Car, '_Car__write_statistics', write_statistics)
+    car = Car(car_path, fs=16000)
+    with pytest.warns(UserWarning, match='recomputed'):
+        statistics = car.get_noise_statistics(MIC_SETUP, 0, 2, n_fft=128)
+    assert statistics['frequencies'][-1] == 8000
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from Car import Car
+from conftest import MIC_SETUP
+
+
+@pytest.mark.parametrize('fs', [16000, 44100])
+@pytest.mark.parametrize('calibration', ['time', 'spectral'])
+@pytest.mark.parametrize('block_size', [1000, 7777])
+def test_stream_matches_get_components(car_path, fs, calibration, block_size):
+    car = Car(car_path, fs=fs)
+    location = car.irs[MIC_SETUP][0].rsplit('_w', 1)[0]
+    rng = np.random.default_rng(0)
+    kwargs = dict(mic_setup=MIC_SETUP, location=location, speed=50, window=1, mics=[0, 3], ls=70, dry_speech=0.1 * rng.standard_normal(2 * fs),
+                  la=60, radio_audio=0.1 * rng.standard_normal(3 * fs), vent_level=2, calibration=calibration)
+    expected = car.get_components(**kwargs)
+    streamed = [np.concatenate(blocks) for blocks in zip(*car.stream_components(block_size=block_size, **kwargs))]
+    for x, y in zip(streamed, expected):
+        assert x.shape == y.shape
+        assert np.linalg.norm(x - y) / np.linalg.norm(y) < 1e-5